@@ -1,43 +1,75 @@
 # === Standard Library ===
 import time
 import sys
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
 
 # === Core Domains ===
-from src.core.evaluators.california_evaluator import CaliforniaEvaluator
-from src.core.evaluators.standard_evaluator import StandardEvaluator
+from src.core.evaluators.evaluator_registry import create_evaluator
 from src.core.game_engine import GameEngine
-from src.core.game_controller import GameController
+from src.core.round_state_machine import RoundStateMachine
 
 # === Views ===
 from src.views.cli_view import CliView
 
 # === Models ===
 from src.models.participants import Player, Dealer
+from src.models.deck import Deck
+from src.models.shoe import Shoe
+from src.models.six_card_bonus import SixCardBonus
+from src.models.session_state import SessionState
+from src.models.round_events import (
+    ShowMessage,
+    ShowText,
+    RequestInput,
+    ScheduleTimer,
+    RequestHostAction,
+    RoundBoundary,
+    UserInput,
+    TimerFired,
+    TextLines,
+    RoundOutputEvent,
+)
 
 # === Services ===
 from src.services.config_service import ConfigService
 from src.services.locale_service import LocaleService
+from src.services.config_watcher import ConfigWatcher
+from src.services.session_checkpointer import SessionCheckpointer
+from src.services.hand_history_store import HandHistoryStore
+from src.services.jackpot_pool import JackpotPool
+from src.services.ledger_store import LedgerStore
+from src.services.wallet import Wallet
 
 # === Enums ===
 from src.enums.action_result import ActionResult
+from src.enums.ledger_entry_type import LedgerEntryType
+from src.enums.host_action import HostAction
 from src.enums.ui_keys import UIKeys
 
+# === Errors ===
+from src.errors.config_validation_error import ConfigValidationError
+
 # I call this "Juarez Cartel Architecture", only El Jefe knows everything
 
 class AppController:  # << El Jefe 🚬😎🥃
     """
     The main application controller that orchestrates the game flow.
     Holds long-lifecycle objects and manages the game loop.
-    see: src/core/game_controller.py
+    see: src/core/round_state_machine.py
     
     Attributes:
         view (CliView): The command-line interface view for user interaction.
             can be swapped out for other view implementations.
             
         conf_svc (ConfigService): Service for loading configuration files.
+        config_overrides (Mapping[str, Mapping[str, Any]]): Applied on top of the configs,
+            see load_configs.
         loc_svc (LocaleService): Service for loading localization files.
         player (Player): The player model. lifetime matches AppController.
         dealer (Dealer): The dealer model. lifetime matches AppController.
+        deck (Deck): The deck, or a Shoe if configured. lifetime matches AppController.
         
         evaluator (GameEvaluator): The game evaluator for hand evaluations,
             lifetime may change on-the-fly.
@@ -47,22 +79,52 @@ class AppController:  # << El Jefe 🚬😎🥃
         game_engine (GameEngine): The core game engine managing game logic.
             it handles deck lifecycle.
 
-        game_ctrl (GameController): The game controller managing game flow.
+        round_machine (RoundStateMachine): The round flow, AppController carries out
+            its events against the view.
+        
+        config_watcher (ConfigWatcher | None): Publishes config changes in the background,
+            None if hot reload is disabled in app_controller_config.json.
+            
+        checkpointer (SessionCheckpointer | None): Saves the session at every round boundary,
+            None if checkpoints are disabled in app_controller_config.json.
+            
+        ledger_store (LedgerStore | None): Persists the wallet's ledger,
+            None if the ledger is disabled in app_controller_config.json.
+            
+        hand_history (HandHistoryStore | None): Records every round for later queries,
+            None if the hand history is disabled in app_controller_config.json.
+            
+        jackpot_pool (JackpotPool | None): The progressive jackpot shared with the other tables,
+            None if the progressive bet is disabled in game_engine_config.json.
     """
     
-    def __init__(self):
+    # The CLI runs a single table
+    SESSION_ID = 'default'
+    
+    def __init__(
+        self,
+        view: CliView | None = None,
+        config_overrides: Mapping[str, Mapping[str, Any]] | None = None
+        ):
+        """
+        Args:
+            view (CliView | None): Defaults to a CliView on stdin/stdout,
+                e.g. a ScriptedView for load tests.
+            config_overrides (Mapping[str, Mapping[str, Any]] | None): Keys replacing the
+                configured ones, by config: 'app_controller', 'game_engine', 'game_controller'.
+                They survive hot reloads, e.g. zero delays for load tests.
+        """
         # Bootstrap
-        self.view = CliView()
+        self.view = view if view is not None else CliView()
+        self.config_overrides = config_overrides if config_overrides is not None else {}
         try:
             self.conf_svc = ConfigService()
             self.loc_svc = LocaleService()
-            self.app_config = self.conf_svc.get_app_controller_config()
-            self.ge_config = self.conf_svc.get_game_engine_config()
-            self.gc_config = self.conf_svc.get_game_controller_config()
+            self.load_configs()
 
             self.view.set_message_config(self.loc_svc.get_messages_config())
             
-        except FileNotFoundError as e:
+        except (FileNotFoundError, ConfigValidationError) as e:
             self.view.show_text(f"[FATAL ERROR] Startup Failed:\n{str(e)}")
             self.view.wait(5)
             sys.exit(1)
@@ -72,8 +134,27 @@ class AppController:  # << El Jefe 🚬😎🥃
         self.dealer = Dealer()
         
         # Short lifecycle objects
-        self.evaluator = StandardEvaluator()
         self.current_game_rule = 'standard'
+        self.evaluator = create_evaluator(self.current_game_rule, self.ge_config['common']['evaluator_backend'])
+        # A single deck reshuffled every round unless a shoe is configured
+        shoe_config = self.ge_config['common']['shoe']
+        if shoe_config['deck_count'] > 1 or shoe_config['is_continuous_shuffler']:
+            self.deck = Shoe(
+                shoe_config['deck_count'],
+                shoe_config['penetration'],
+                shoe_config['is_continuous_shuffler']
+            )
+        else:
+            self.deck = Deck()
+        
+        self.ledger_store: LedgerStore | None = None
+        wallet: Wallet | None = None
+        if self.app_config['is_ledger_enabled']:
+            self.ledger_store = LedgerStore()
+            wallet = Wallet(self.SESSION_ID, self.ledger_store)
+        
+        self.jackpot_pool = self.create_jackpot_pool()
+        
         # Long lifecycle objects that hold some short lifecycle objects
         self.game_engine = GameEngine(
             self.player,
@@ -82,14 +163,128 @@ class AppController:  # << El Jefe 🚬😎🥃
             self.ge_config[self.current_game_rule]['ante_bonus'],
             self.ge_config[self.current_game_rule]['pair_plus'],
             self.ge_config['common']['is_table_limit_enabled'],
-            self.ge_config['common']['limits']
+            self.ge_config['common']['limits'],
+            self.deck,
+            wallet,
+            self.jackpot_pool,
+            SixCardBonus.from_config(self.ge_config)
         )
 
-        self.game_ctrl = GameController(self.game_engine, self.view, self.gc_config)
+        self.hand_history: HandHistoryStore | None = None
+        if self.app_config['is_hand_history_enabled']:
+            try:
+                self.hand_history = HandHistoryStore()
+            except RuntimeError as e: # another table of the host records the history
+                self.view.show_text(f"[WARNING] Hand history disabled: {str(e)}")
+        
+        self.round_machine = RoundStateMachine(self.game_engine, self.gc_config, self.hand_history)
+        
+        self.config_watcher: ConfigWatcher | None = None
+        if self.app_config['is_config_hot_reload_enabled']:
+            self.config_watcher = ConfigWatcher(self.app_config['config_poll_interval_seconds'])
+            self.config_watcher.start()
+        
+        self.checkpointer: SessionCheckpointer | None = None
+        if self.app_config['is_session_checkpoint_enabled']:
+            self.checkpointer = SessionCheckpointer()
+            self.restore_session()
+        
+    def create_jackpot_pool(self) -> JackpotPool | None:
+        """
+        Returns:
+            JackpotPool | None: A handle on the host's jackpot pool with the configured rules,
+                None if the progressive bet is disabled.
+        """
+        progressive_config = self.ge_config['common']['progressive']
+        if not progressive_config['is_enabled']:
+            return None
+        return JackpotPool(
+            progressive_config['bet'],
+            progressive_config['contribution_percent'],
+            progressive_config['seed_amount'],
+            progressive_config['jackpot_percent_table']
+        )
+        
+    def restore_session(self) -> None:
+        """
+        Bring back the balance, game rule, language and deck of the last session, if any.
+        The deck is only restored if the shoe size did not change in the meantime.
+        """
+        state = self.checkpointer.load(self.SESSION_ID)
+        if state is None:
+            return
+        
+        # Start from the balance the ledger knows, the initial balance if it has no rounds yet,
+        # then move the difference to the checkpoint through the wallet, so the ledger explains it
+        if self.ledger_store is not None:
+            ledger_balance = self.ledger_store.get_last_balance(self.SESSION_ID)
+            if ledger_balance is not None:
+                self.player.balance = ledger_balance
+        difference = state.balance - self.player.balance
+        if difference > 0:
+            self.game_engine.add_player_balance(difference, LedgerEntryType.ADJUSTMENT)
+        elif difference < 0:
+            self.game_engine.deduct_player_balance(-difference, LedgerEntryType.ADJUSTMENT)
+        if self.ledger_store is not None:
+            self.game_engine.wallet.commit_round(self.player.balance)
+        
+        if state.game_rule != self.current_game_rule:
+            self.current_game_rule = state.game_rule
+            self.evaluator = create_evaluator(self.current_game_rule, self.ge_config['common']['evaluator_backend'])
+            target_config = self.ge_config[self.current_game_rule]
+            self.game_engine.reload_game_rules(
+                new_evaluator=self.evaluator,
+                new_ante_table=target_config['ante_bonus'],
+                new_pair_plus_table=target_config['pair_plus']
+            )
+        
+        self.loc_svc.switch_language(state.lang_code)
+        self.view.set_message_config(self.loc_svc.get_messages_config())
+        
+        state.restore_deck(self.deck)
+    
+    def save_session(self) -> None:
+        """
+        Hand a snapshot of the session to the checkpointer, called at round boundaries only,
+        when every bet is settled. Returns right away, the file is written in the background.
+        """
+        if self.checkpointer is None:
+            return
+        self.checkpointer.submit(
+            self.SESSION_ID,
+            SessionState.capture(
+                self.player.balance,
+                self.current_game_rule,
+                self.loc_svc.current_lang_code,
+                self.deck
+            )
+        )
+    
+    def close_session(self) -> None:
+        """
+        Write the last snapshot and ledger entries before the process goes away.
+        A round left in the middle is dropped from both: the session resumes
+        from the round boundary before it, bets not placed.
+        """
+        if not self.game_engine.is_round_in_progress:
+            # Picks up movements outside of a round, e.g. the cheat code
+            self.save_session()
+            if self.ledger_store is not None:
+                self.game_engine.wallet.commit_round(self.player.balance)
+        
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+        if self.ledger_store is not None:
+            self.ledger_store.close()
+        if self.hand_history is not None:
+            self.hand_history.close()
+        if self.jackpot_pool is not None:
+            self.jackpot_pool.close()
         
     def exit_game(self) -> None:
         self.view.show_message(UIKeys.EXIT_PROMPT)
         self.view.get_input(UIKeys.PRESS_ENTER_TO_EXIT)
+        self.close_session()
         sys.exit(0)
     
     def get_valid_input(self, prompt_key: UIKeys, valid_options: list[str]) -> str:
@@ -110,70 +305,17 @@ class AppController:  # << El Jefe 🚬😎🥃
             else:
                 self.view.show_message(UIKeys.USER_CHOICE_NOT_IN_OPTIONS_PROMPT)
                 
-    def interactor(self, key: UIKeys, options: dict[str, callable]) -> None:
+    def read_rules(self) -> list[RoundOutputEvent]:
         """
-        A generic interactor method that handles user choices-
-        based on a prompt and a dispatch table of options.
-        ActionResult(Enums) from the called functions are handled here.
-        
-        Args:
-            key (UIKeys): The key for the input prompt message.
-            options (dict[str, callable]): A dispatch table mapping user choices to functions.
+        Answer the round machine's READ_RULES with the preloaded rules of the current locale,
+        the machine rolls them out line by line on its own timers.
+        Returns:
+            list[RoundOutputEvent]: The first line and the timer of the next one.
         """
-        while True:
-            user_choice = self.get_valid_input(key, list(options.keys()))
-    
-            action_func: callable = options[user_choice]
-            ret_value: None | ActionResult = action_func()
-            
-            match ret_value:
-                
-                #job done!😄
-                case None:
-                    break
-                
-                #not done yet🥲
-                case ActionResult.CONTINUE:
-                    continue
-                
-                case ActionResult.INSUFFICIENT_BALANCE:
-                    #TODO: Add a refill feature when player balance is insufficient
-                    self.exit_game() # temporary solution
-                    
-                #expected errors:
-                case ActionResult.TOO_MANY_ANTE_TRIES:
-                    self.view.show_message(UIKeys.TOO_MANY_ANTE_TRIES_PROMPT)
-                    continue
-                    
-                case ActionResult.TOO_MANY_PAIR_PLUS_TRIES:
-                    self.view.show_message(UIKeys.TOO_MANY_PAIR_PLUS_TRIES_PROMPT)
-                    break
-     
-        # other case enums:
-            
-    def read_rules(self) -> ActionResult:
-        try:
-            with open(self.loc_svc.get_rules_file_path(), mode='r', encoding='UTF-8') as rules:
-                while content := rules.readline(): 
-                # while(*s++ = *t++); old K&R trick but useful
-
-                    self.view.show_text(content, str_end='')
-                    
-                    start_time = time.time()
-                    self.view.wait(self.app_config['text_rolling_delay_seconds'])
-                    waited_time = time.time() - start_time
-                    
-                    # User suspended the program by Ctrl+Z, 
-                    # for better UX (reading experience),
-                    # we directly break and return to main menu
-                    if waited_time > self.app_config['max_waited_seconds']:
-                        break
-                    
-        except FileNotFoundError:
+        lines = self.loc_svc.get_rules_lines()
+        if not lines:
             self.view.show_message(UIKeys.FILE_NOT_FOUND_ERROR_PROMPT)
-            return ActionResult.CONTINUE
-        
-        return ActionResult.CONTINUE
+        return self.round_machine.handle(TextLines(lines, self.app_config['text_rolling_delay_seconds']))
     
     def switch_rules(self) -> None:
         """
@@ -195,14 +337,9 @@ class AppController:  # << El Jefe 🚬😎🥃
             list(game_rule_options.keys())
         )
         
-        match user_choice:
-            case '1':
-                self.evaluator = CaliforniaEvaluator()
-            case '2':
-                self.evaluator = StandardEvaluator()
-
-        # Update current game rule
+        # Update current game rule and evaluator
         self.current_game_rule = game_rule_options[user_choice]
+        self.evaluator = create_evaluator(self.current_game_rule, self.ge_config['common']['evaluator_backend'])
         
         # Get corresponding settings
         target_config = self.ge_config[self.current_game_rule]
@@ -225,6 +362,62 @@ class AppController:  # << El Jefe 🚬😎🥃
             game_rule=self.view.get_text(game_rule_key_map[self.current_game_rule])
         )
         
+    def load_configs(self) -> None:
+        """
+        Take the configs of the config service, with the overrides on top.
+        """
+        self.app_config = self._override('app_controller', self.conf_svc.get_app_controller_config())
+        self.ge_config = self._override('game_engine', self.conf_svc.get_game_engine_config())
+        self.gc_config = self._override('game_controller', self.conf_svc.get_game_controller_config())
+
+    def _override(self, config_name: str, config: Mapping[str, Any]) -> Mapping[str, Any]:
+        overrides = self.config_overrides.get(config_name)
+        if not overrides:
+            return config
+        return {**config, **overrides}
+
+    def apply_reloaded_config(self) -> None:
+        """
+        Pick up the configs published by the config watcher, if any changed.
+        Called at the round boundary, the game engine keeps the current game rule
+        and is not reset, only its tables, limits, evaluator backend and side bets are swapped.
+        """
+        if not self.conf_svc.refresh():
+            return
+        self.loc_svc.refresh()
+        
+        old_common = self.ge_config['common']
+        self.load_configs()
+        common = self.ge_config['common']
+        
+        new_evaluator = None
+        if common['evaluator_backend'] != old_common['evaluator_backend']:
+            self.evaluator = create_evaluator(self.current_game_rule, common['evaluator_backend'])
+            new_evaluator = self.evaluator
+        
+        old_jackpot_pool = self.jackpot_pool
+        is_progressive_changed = common['progressive'] != old_common['progressive']
+        new_side_bets = None
+        if is_progressive_changed or common['six_card_bonus'] != old_common['six_card_bonus']:
+            if is_progressive_changed:
+                self.jackpot_pool = self.create_jackpot_pool()
+            new_side_bets = (self.jackpot_pool, SixCardBonus.from_config(self.ge_config))
+        
+        target_config = self.ge_config[self.current_game_rule]
+        self.game_engine.stage_game_rules(
+            new_ante_table=target_config['ante_bonus'],
+            new_pair_plus_table=target_config['pair_plus'],
+            new_is_table_limit_enabled=common['is_table_limit_enabled'],
+            new_limits_table=common['limits'],
+            new_evaluator=new_evaluator,
+            new_side_bets=new_side_bets
+        )
+        # At the round boundary the new rules are in effect right away, nothing holds the old pool
+        if old_jackpot_pool is not None and old_jackpot_pool is not self.jackpot_pool:
+            old_jackpot_pool.close()
+        self.round_machine.reload_config(self.gc_config)
+        self.view.set_message_config(self.loc_svc.get_messages_config())
+        
     def switch_language(self) -> ActionResult:
         """
         A hot swap of language locale
@@ -256,63 +449,60 @@ class AppController:  # << El Jefe 🚬😎🥃
         
         return ActionResult.CONTINUE
         
-    def run(self) -> None:
-        
-        # creating dispatch tables 
-        first_round_options: dict[str, callable] = {
-            '1':self.game_ctrl.first_round,
-            '2':self.read_rules,
-            '3':self.exit_game,
-            '4':self.switch_language,
-            '1337':self.game_ctrl._cheat
-        }
+    def carry_out(self, event: RoundOutputEvent) -> list[RoundOutputEvent]:
+        """
+        Carry out one event of the round machine against the view, blocking on input and timers.
+        Returns:
+            list[RoundOutputEvent]: The events that follow from the answer, if any.
+        """
+        match event:
+            case ShowMessage(key=key, kwargs=kwargs):
+                self.view.show_message(key, **kwargs)
 
-        pair_plus_round_options = {
-            '1':self.game_ctrl.pair_plus_round,
-            '2':self.game_ctrl.no_pair_plus,
-            '3':self.exit_game
-        }
+            case ShowText(text=text):
+                self.view.show_text(text, str_end='')
 
-        second_round_options = {
-            '1':self.game_ctrl.compare_hand_and_settle,
-            '2':self.game_ctrl.fold,
-            '3':self.exit_game
-        }
+            case RequestInput(key=key, kwargs=kwargs):
+                return self.round_machine.handle(UserInput(self.view.get_input(key, **kwargs)))
 
-        another_game_options = {
-            '1':self.game_ctrl.another_game,
-            '2':self.switch_rules,
-            '3':self.exit_game
-        }
+            case ScheduleTimer(timer_id=timer_id, seconds=seconds):
+                started_at = time.monotonic()
+                self.view.wait(seconds)
+                # Much later than due: the user suspended the program (Ctrl+Z)
+                is_late = time.monotonic() - started_at - seconds > self.app_config['max_waited_seconds']
+                return self.round_machine.handle(TimerFired(timer_id, is_late))
 
-        # Main game loop
-        self.view.show_message(UIKeys.WELCOMING)
-        
-        while True:
-            try:
-                # Game start, place ante bet
-                self.interactor(UIKeys.FIRST_ROUND_PROMPT, first_round_options)
-                
-                # Pair Plus betting round
-                if self.game_ctrl.skip_pair_plus: # Insufficient balance for minimum Pair Plus bet, so we skip it
-                    self.view.show_message(UIKeys.SKIP_PAIR_PLUS_PROMPT)
-                else:
-                    self.interactor(UIKeys.PAIR_PLUS_ROUND_PROMPT, pair_plus_round_options) 
+            case RoundBoundary():
+                # Configs changed on disk are applied here
+                self.apply_reloaded_config()
+                self.save_session()
 
-                # Second round start, place play bet
-                self.game_ctrl.second_round()
+            case RequestHostAction(action=HostAction.READ_RULES):
+                return self.read_rules()
 
-                # Whether to compare hands
-                self.interactor(UIKeys.SECOND_ROUND_PROMPT, second_round_options)
+            case RequestHostAction(action=action):
+                self.host_actions[action]()
 
-                # Reset state
-                # This method will never raise any error, call 100 times if you are paranoid
-                self.game_ctrl.reset_game() 
+        return []
 
-                # Whether to play another game
-                self.interactor(UIKeys.ANOTHER_ROUND_PROMPT, another_game_options)
+    def run(self) -> None:
+        
+        # creating dispatch table
+        self.host_actions: dict[HostAction, callable] = {
+            HostAction.SWITCH_LANGUAGE: self.switch_language,
+            HostAction.SWITCH_RULES: self.switch_rules,
+            HostAction.EXIT: self.exit_game,
+        }
+
+        # Main game loop
+        self.view.show_message(UIKeys.WELCOMING)
+        
+        try:
+            events: deque[RoundOutputEvent] = deque(self.round_machine.start())
+            while events:
+                events.extend(self.carry_out(events.popleft()))
                 
-            # Outside interrupts like Ctrl+C or EOF 
-            except (EOFError, KeyboardInterrupt):
-                self.view.show_message(UIKeys.EXIT_PROMPT)
-                break
\ No newline at end of file
+        # Outside interrupts like Ctrl+C or EOF 
+        except (EOFError, KeyboardInterrupt):
+            self.view.show_message(UIKeys.EXIT_PROMPT)
+            self.close_session()
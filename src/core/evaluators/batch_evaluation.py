@@ -0,0 +1,132 @@
+"""
+Batch evaluation of many hands per call, shared by the evaluators.
+
+A batch of hands is a contiguous buffer of card indices (see card_index.py), three per hand,
+in any order within a hand: bytes, bytearray, memoryview, array('B') or a NumPy uint8 array.
+A deal stream (see deal_stream.py) splits into a player batch and a dealer batch with split_deals.
+
+NumPy is optional: with NumPy installed, the batch methods are vectorized and return NumPy arrays,
+without it they loop over the scalar methods and return array.array.
+The vectorized methods gather from tables of every hand, filled by the scalar methods of the
+evaluator itself (see numpy_lookup_tables), so both always follow the same rules.
+"""
+import threading
+from itertools import combinations_with_replacement
+from typing import Any, Iterator
+
+from src.models.card import Card
+from src.models.card_index import DECK_CARDS
+from src.models.cardspec import VALUES
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - depends on the install
+    np = None
+
+# Contiguous card indices, 3 per hand
+HandBatch = Any
+
+# Outcomes of compare_hands, from the player's point of view
+PLAYER_WINS, PUSH, PLAYER_LOSES = 1, 0, -1
+
+HAS_NUMPY: bool = np is not None
+
+# Table keys, see numpy_table_keys: 4 bits per card value and 1 flush bit
+TABLE_KEY_COUNT = 1 << 13
+
+# (ranks, dealer qualification flags, strengths) by evaluator class
+_numpy_tables: dict[type, tuple[Any, Any, Any]] = {}
+_numpy_tables_lock = threading.Lock()
+
+
+def split_deals(deals: HandBatch) -> tuple[HandBatch, HandBatch]:
+    """
+    Split a deal stream (player, dealer, player, dealer, player, dealer per round)
+    into the batch of player hands and the batch of dealer hands.
+    """
+    if HAS_NUMPY and isinstance(deals, np.ndarray):
+        flat = deals.reshape(-1)
+        return flat[0::2], flat[1::2]
+    deals = memoryview(deals).cast('B')
+    return bytes(deals[0::2]), bytes(deals[1::2])
+
+
+def iter_sorted_hands(hands: HandBatch):
+    """
+    Yield every hand of a batch as Card objects sorted by descending value,
+    the form the scalar evaluator methods expect.
+    """
+    flat = hands.reshape(-1).tolist() if HAS_NUMPY and isinstance(hands, np.ndarray) else memoryview(hands).cast('B')
+    for offset in range(0, len(flat), 3):
+        cards: list[Card] = [DECK_CARDS[flat[offset]], DECK_CARDS[flat[offset + 1]], DECK_CARDS[flat[offset + 2]]]
+        cards.sort(key=lambda card: card.value, reverse=True)
+        yield cards
+
+
+def as_index_matrix(hands: HandBatch) -> 'np.ndarray':
+    """
+    View a batch as an (n, 3) NumPy array of card indices, without copying when possible.
+    """
+    if isinstance(hands, np.ndarray):
+        return hands.astype(np.int16, copy=False).reshape(-1, 3)
+    return np.frombuffer(memoryview(hands).cast('B'), dtype=np.uint8).astype(np.int16).reshape(-1, 3)
+
+
+def numpy_table_keys(hands: HandBatch) -> 'np.ndarray':
+    """
+    The vectorized hand_lookup_tables.table_key: physical values sorted descending, flush bit.
+    """
+    indices = as_index_matrix(hands)
+    suits = indices & 3
+    values = -np.sort(-(indices // 4 + 2), axis=1)
+    is_flush = (suits[:, 0] == suits[:, 1]) & (suits[:, 1] == suits[:, 2])
+    return (values[:, 0] << 9) | (values[:, 1] << 5) | (values[:, 2] << 1) | is_flush
+
+
+def iter_table_hands() -> Iterator[tuple[int, list[Card]]]:
+    """
+    Yield every distinct hand as far as the evaluators can tell: every value triple,
+    unsuited and suited, with its table key (see numpy_table_keys).
+    Yields:
+        tuple[int, list[Card]]: The table key, the cards sorted by descending value.
+    """
+    for v0, v1, v2 in combinations_with_replacement(sorted(VALUES, reverse=True), 3):
+        # The evaluators only read values and suits
+        unsuited = [Card('♠', '', v0), Card('♣', '', v1), Card('♥', '', v2)]
+        suited = [Card('♠', '', v0), Card('♠', '', v1), Card('♠', '', v2)]
+        for cards, is_flush in ((unsuited, False), (suited, True)):
+            yield (v0 << 9) | (v1 << 5) | (v2 << 1) | is_flush, cards
+
+
+def numpy_lookup_tables(evaluator) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    The rank, dealer qualification and strength of every hand under the rules of an evaluator,
+    indexed by numpy_table_keys. Built once per evaluator class, from its scalar methods.
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: HandRank values (int8), qualification flags (bool),
+            hand strengths (int32).
+    """
+    tables = _numpy_tables.get(type(evaluator))
+    if tables is not None:
+        return tables
+
+    with _numpy_tables_lock:
+        tables = _numpy_tables.get(type(evaluator))
+        if tables is None:
+            ranks = np.zeros(TABLE_KEY_COUNT, dtype=np.int8)
+            qualified = np.zeros(TABLE_KEY_COUNT, dtype=np.bool_)
+            strengths = np.zeros(TABLE_KEY_COUNT, dtype=np.int32)
+            for key, cards in iter_table_hands():
+                hand_values, flush = evaluator.get_virtual_hand(cards)
+                rank = evaluator.evaluate_hand_rank(hand_values, flush)
+                ranks[key] = rank
+                qualified[key] = evaluator.is_dealer_qualified(rank, hand_values[0])
+                strengths[key] = evaluator.hand_strength(rank, hand_values)
+            tables = _numpy_tables[type(evaluator)] = (ranks, qualified, strengths)
+        return tables
+
+
+def outcome_code(did_player_win: bool | None) -> int:
+    if did_player_win is None:
+        return PUSH
+    return PLAYER_WINS if did_player_win else PLAYER_LOSES
@@ -20,7 +20,10 @@ class CaliforniaEvaluator(StandardEvaluator):
         is_pair: bool = (v0 == v1) or (v1 == v2)
         if is_pair:
             is_three_of_a_kind: bool = (v0 == v2)
-            return HandRank.THREE_OF_A_KIND if is_three_of_a_kind else HandRank.PAIR
+            # Multi-deck suited pairs and sets, as in StandardEvaluator.evaluate_hand_rank
+            if is_three_of_a_kind:
+                return HandRank.THREE_OF_A_KIND
+            return HandRank.FLUSH if flush else HandRank.PAIR
 
         #Pattern 2: Flush || Straight Flush || Mini Royal Flush
         
@@ -0,0 +1,40 @@
+"""
+Evaluators by game rule and backend, for places where the evaluator is chosen by config.
+    reference:    StandardEvaluator / CaliforniaEvaluator, the readable implementation
+    perfect_hash: one table lookup per hand, same results, several times faster
+    mapped_table: lookups in precomputed tables memory-mapped from a file,
+                  shared by every worker process of the host
+"""
+from typing import Callable
+
+from src.core.evaluators.california_evaluator import CaliforniaEvaluator
+from src.core.evaluators.mapped_table_california_evaluator import MappedTableCaliforniaEvaluator
+from src.core.evaluators.mapped_table_evaluator import MappedTableEvaluator
+from src.core.evaluators.perfect_hash_california_evaluator import PerfectHashCaliforniaEvaluator
+from src.core.evaluators.perfect_hash_evaluator import PerfectHashEvaluator
+from src.core.evaluators.standard_evaluator import StandardEvaluator
+from src.core.interfaces.evaluator_protocols import GameEvaluator
+
+GAME_RULES: tuple[str, ...] = ('standard', 'california')
+
+EVALUATOR_BACKENDS: dict[str, dict[str, Callable[[], GameEvaluator]]] = {
+    'reference': {
+        'standard': StandardEvaluator,
+        'california': CaliforniaEvaluator,
+    },
+    'perfect_hash': {
+        'standard': PerfectHashEvaluator,
+        'california': PerfectHashCaliforniaEvaluator,
+    },
+    'mapped_table': {
+        'standard': MappedTableEvaluator,
+        'california': MappedTableCaliforniaEvaluator,
+    },
+}
+
+def create_evaluator(game_rule: str, backend: str = 'reference') -> GameEvaluator:
+    if backend not in EVALUATOR_BACKENDS:
+        raise ValueError(f"Unknown evaluator backend '{backend}', choose from {', '.join(EVALUATOR_BACKENDS)}.")
+    if game_rule not in GAME_RULES:
+        raise ValueError(f"Unknown game rule '{game_rule}', choose from {', '.join(GAME_RULES)}.")
+    return EVALUATOR_BACKENDS[backend][game_rule]()
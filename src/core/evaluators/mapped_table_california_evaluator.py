@@ -0,0 +1,7 @@
+from src.core.evaluators.mapped_table_evaluator import MappedTableEvaluator
+
+class MappedTableCaliforniaEvaluator(MappedTableEvaluator):
+    """
+    MappedTableEvaluator reading the California tables (Mini Royal Flush).
+    """
+    GAME_RULE: str = 'california'
@@ -0,0 +1,86 @@
+from src.core.evaluators import batch_evaluation
+from src.core.evaluators.batch_evaluation import HandBatch
+from src.core.evaluators.standard_evaluator import StandardEvaluator
+from src.core.evaluators.standard_evaluator import IsFlush
+from src.core.hand_lookup_tables import TABLE_KEY_COUNT, get_hand_lookup_tables
+from src.models.card import Card
+from src.enums.hand_rank import HandRank
+
+# HandRank members by value, the tables store plain bytes
+HAND_RANKS: tuple[HandRank, ...] = tuple(HandRank)
+
+# The virtual hand of every table key, built once so get_virtual_hand never allocates
+TABLE_KEYS: tuple[tuple[int], ...] = tuple((key,) for key in range(TABLE_KEY_COUNT))
+
+TableHandValues = tuple[int]
+
+
+class MappedTableEvaluator(StandardEvaluator):
+    """
+    Standard rules evaluator answering from the memory-mapped hand tables
+    (see hand_lookup_tables.py), whose pages every worker process of the host shares.
+
+    Its virtual hand is opaque: a 1-tuple holding the table key of the hand,
+    so hand_values[0], what callers hand over to is_dealer_qualified, is the key too.
+    Hands may come in any order, from any number of decks.
+    """
+    GAME_RULE: str = 'standard'
+
+    def __init__(self):
+        tables = get_hand_lookup_tables().for_rule(self.GAME_RULE)
+        self.__ranks = tables.ranks
+        self.__qualified = tables.qualified
+        self.__strengths = tables.strengths
+
+    def get_virtual_hand(self, physical_hand: list[Card]) -> tuple[TableHandValues, IsFlush]:
+        c0, c1, c2 = physical_hand
+        v0, v1, v2 = c0.value, c1.value, c2.value
+        # Three compare-and-swaps instead of sorted()
+        if v0 < v1:
+            v0, v1 = v1, v0
+        if v1 < v2:
+            v1, v2 = v2, v1
+        if v0 < v1:
+            v0, v1 = v1, v0
+        flush = c0.suit == c1.suit == c2.suit
+        # table_key, inlined
+        return TABLE_KEYS[(v0 << 9) | (v1 << 5) | (v2 << 1) | flush], flush
+
+    def evaluate_hand_rank(self, hand_values: TableHandValues, flush: IsFlush) -> HandRank:
+        # The key already holds the flush bit
+        return HAND_RANKS[self.__ranks[hand_values[0]]]
+
+    def is_dealer_qualified(self, dealer_hand_rank_value: HandRank, dealer_hand_key: int) -> bool:
+        return self.__qualified[dealer_hand_key] == 1
+
+    def hand_strength(self, hand_rank_value: HandRank, hand_values: TableHandValues) -> int:
+        return self.__strengths[hand_values[0]]
+
+    # Batch methods: one gather per table, on NumPy views of the mapped pages
+
+    def evaluate_hand_ranks(self, hands: HandBatch):
+        if not batch_evaluation.HAS_NUMPY:
+            return super().evaluate_hand_ranks(hands)
+        np = batch_evaluation.np
+        ranks = np.frombuffer(self.__ranks, dtype=np.int8)
+        return ranks[batch_evaluation.numpy_table_keys(hands)]
+
+    def are_dealers_qualified(self, hands: HandBatch):
+        if not batch_evaluation.HAS_NUMPY:
+            return super().are_dealers_qualified(hands)
+        np = batch_evaluation.np
+        qualified = np.frombuffer(self.__qualified, dtype=np.bool_)
+        return qualified[batch_evaluation.numpy_table_keys(hands)]
+
+    def compare_hands(self, player_hands: HandBatch, dealer_hands: HandBatch):
+        if not batch_evaluation.HAS_NUMPY:
+            return super().compare_hands(player_hands, dealer_hands)
+        np = batch_evaluation.np
+        strengths = np.frombuffer(self.__strengths, dtype=np.uint16).astype(np.int32, copy=False)
+        qualified = np.frombuffer(self.__qualified, dtype=np.bool_)
+        player_keys = batch_evaluation.numpy_table_keys(player_hands)
+        dealer_keys = batch_evaluation.numpy_table_keys(dealer_hands)
+
+        outcomes = np.sign(strengths[player_keys] - strengths[dealer_keys]).astype(np.int8)
+        outcomes[~qualified[dealer_keys]] = batch_evaluation.PLAYER_WINS
+        return outcomes
@@ -0,0 +1,11 @@
+from src.core.evaluators.california_evaluator import CaliforniaEvaluator
+from src.core.evaluators.perfect_hash_evaluator import PerfectHashEvaluator, RankedHandValues
+from src.core.evaluators.perfect_hash_evaluator import build_perfect_hash_table
+from src.core.evaluators.standard_evaluator import IsFlush
+
+class PerfectHashCaliforniaEvaluator(PerfectHashEvaluator):
+    """
+    PerfectHashEvaluator with the California ranks (Mini Royal Flush),
+    its table is built at import by CaliforniaEvaluator.
+    """
+    TABLE: list[tuple[RankedHandValues, IsFlush] | None] = build_perfect_hash_table(CaliforniaEvaluator())
@@ -0,0 +1,94 @@
+from itertools import combinations_with_replacement
+
+from src.core.evaluators.standard_evaluator import StandardEvaluator
+from src.core.evaluators.standard_evaluator import IsFlush
+from src.models.card import Card
+from src.models.cardspec import VALUES
+from src.enums.hand_rank import HandRank
+
+# One prime per card value: the product of the primes of a hand is the same for every
+# order of its cards and different for every multiset of values (unique factorization)
+# indexed by card value, a list index is cheaper than a dict lookup
+VALUE_PRIMES: tuple[int, ...] = (0, 0) + (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Largest key: three aces, suited
+TABLE_SIZE: int = (VALUE_PRIMES[14] ** 3 << 1) + 2
+
+
+class RankedHandValues(tuple):
+    """
+    Virtual hand values (a plain 3-tuple for every caller) that also carry their
+    precomputed evaluation, so the evaluator never recomputes anything per call.
+
+    Attributes:
+        ranks (tuple[HandRank, HandRank]): Rank of the values, unsuited and suited.
+        tiebreaks (tuple[int, int]): The low 12 bits of StandardEvaluator.hand_strength:
+            the values from the highest, then pair value first (for pairs).
+    """
+    ranks: tuple[HandRank, HandRank]
+    tiebreaks: tuple[int, int]
+
+
+def hash_key(c0: Card, c1: Card, c2: Card) -> int:
+    """
+    The perfect hash of a hand: prime product of the values, then the flush bit.
+    """
+    return (
+        (VALUE_PRIMES[c0.value] * VALUE_PRIMES[c1.value] * VALUE_PRIMES[c2.value]) << 1
+        | (c0.suit == c1.suit == c2.suit)
+    )
+
+
+def build_perfect_hash_table(reference: StandardEvaluator) -> list[tuple[RankedHandValues, IsFlush] | None]:
+    """
+    Evaluate every multiset of card values, unsuited and suited, with a reference evaluator
+    and store the resulting virtual hands by their hash key.
+    Returns:
+        list: TABLE_SIZE slots, the virtual hand of every key, None for products that are no hand.
+    """
+    table: list[tuple[RankedHandValues, IsFlush] | None] = [None] * TABLE_SIZE
+
+    for values in combinations_with_replacement(sorted(VALUES, reverse=True), 3):
+        # The reference evaluator only reads values and suits
+        unsuited = [Card('♠', '', values[0]), Card('♣', '', values[1]), Card('♥', '', values[2])]
+        suited = [Card('♠', '', value) for value in values]
+
+        virtual_values, _ = reference.get_virtual_hand(unsuited)
+        ranked = RankedHandValues(virtual_values)
+        ranked.ranks = (
+            reference.evaluate_hand_rank(virtual_values, False),
+            reference.evaluate_hand_rank(virtual_values, True),
+        )
+        v0, v1, v2 = virtual_values
+        # The two kicker layouts of StandardEvaluator.hand_strength: unpaired, paired
+        ranked.tiebreaks = ((v0 << 8) | (v1 << 4) | v2, (v1 << 8) | ((v0 + v2 - v1) << 4))
+
+        table[hash_key(*unsuited)] = (ranked, False)
+        table[hash_key(*suited)] = (ranked, True)
+
+    return table
+
+
+class PerfectHashEvaluator(StandardEvaluator):
+    """
+    Standard rules evaluator resolving every hand with one table lookup.
+    get_virtual_hand hashes the hand (see hash_key) into a table built at import by
+    StandardEvaluator, and returns a precomputed virtual hand whose values carry their
+    rank and tiebreaks. The other methods only read those, without branching on
+    A-2-3 or card order. Hands may come in any order.
+    """
+    TABLE: list[tuple[RankedHandValues, IsFlush] | None] = build_perfect_hash_table(StandardEvaluator())
+
+    def get_virtual_hand(self, physical_hand: list[Card]) -> tuple[RankedHandValues, IsFlush]:
+        # hash_key, inlined
+        c0, c1, c2 = physical_hand
+        return self.TABLE[
+            (VALUE_PRIMES[c0.value] * VALUE_PRIMES[c1.value] * VALUE_PRIMES[c2.value]) << 1
+            | (c0.suit == c1.suit == c2.suit)
+        ]
+
+    def evaluate_hand_rank(self, hand_values: RankedHandValues, flush: IsFlush) -> HandRank:
+        return hand_values.ranks[flush]
+
+    def hand_strength(self, hand_rank_value: HandRank, hand_values: RankedHandValues) -> int:
+        return (hand_rank_value << 12) | hand_values.tiebreaks[hand_rank_value == HandRank.PAIR]
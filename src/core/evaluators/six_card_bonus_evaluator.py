@@ -0,0 +1,189 @@
+"""
+The Six Card Bonus side bet: the best five-card poker hand out of the player's and
+the dealer's three cards each.
+
+Instead of ranking the C(6, 5) = 6 five-card hands of a round one by one, the best rank of
+every multiset of five or six card values is precomputed once, keyed by the product
+of the primes of the values (see perfect_hash_evaluator.VALUE_PRIMES): one table for the
+ranks without a flush, one for the cards of a suit holding five or six of them.
+A round is then one multiplication per card, a suit count and at most two lookups.
+
+Batches of rounds (a deal stream, see deal_stream.py, is one six-card hand per round) are
+ranked with NumPy when it is installed, by sorted-key search in the same tables.
+"""
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from functools import cache
+from itertools import combinations_with_replacement
+
+from src.core.evaluators.batch_evaluation import HAS_NUMPY, HandBatch
+from src.core.evaluators.perfect_hash_evaluator import VALUE_PRIMES
+from src.enums.five_card_hand_rank import FiveCardHandRank
+from src.models.card import Card
+from src.models.card_index import DECK_CARDS
+from src.models.cardspec import VALUES
+
+if HAS_NUMPY:
+    import numpy as np
+
+# Cards of a Six Card Bonus hand: the player's three and the dealer's three
+SIX_CARDS = 6
+
+# Values of the wheel (A-2-3-4-5), the lowest straight
+WHEEL: tuple[int, ...] = (14, 5, 4, 3, 2)
+
+
+def rank_five_cards(values: Sequence[int], is_flush: bool) -> FiveCardHandRank:
+    """
+    The reference ranking of a five-card hand, readable and slow, the tables are built from it.
+    Args:
+        values (Sequence[int]): The five card values, sorted descending.
+        is_flush (bool): Whether the five cards share a suit.
+    """
+    counts = sorted(Counter(values).values(), reverse=True)
+    is_straight = len(counts) == 5 and (values[0] - values[4] == 4 or tuple(values) == WHEEL)
+
+    if is_flush and is_straight:
+        return FiveCardHandRank.ROYAL_FLUSH if values[4] == 10 else FiveCardHandRank.STRAIGHT_FLUSH
+    # Five of a kind (multi-deck shoes) is no poker hand, it counts as four of a kind
+    if counts[0] >= 4:
+        return FiveCardHandRank.FOUR_OF_A_KIND
+    if counts[0] == 3 and counts[1] == 2:
+        return FiveCardHandRank.FULL_HOUSE
+    # Before the sets and pairs a multi-deck flush can hold, see StandardEvaluator.evaluate_hand_rank
+    if is_flush:
+        return FiveCardHandRank.FLUSH
+    if is_straight:
+        return FiveCardHandRank.STRAIGHT
+    if counts[0] == 3:
+        return FiveCardHandRank.THREE_OF_A_KIND
+    if counts[0] == 2:
+        return FiveCardHandRank.TWO_PAIR if counts[1] == 2 else FiveCardHandRank.PAIR
+    return FiveCardHandRank.HIGH_CARD
+
+
+@cache
+def get_best_five_tables() -> tuple[dict[int, FiveCardHandRank], dict[int, FiveCardHandRank]]:
+    """
+    Rank every multiset of five card values, unsuited and suited, with rank_five_cards,
+    then every multiset of six values as the best of its five-value multisets.
+    Built on first use (about 0.1s), then shared by the whole process.
+    Returns:
+        tuple[dict[int, FiveCardHandRank], dict[int, FiveCardHandRank]]: The best rank
+            by prime product of the values, without a flush and with every card suited.
+    """
+    unsuited: dict[int, FiveCardHandRank] = {}
+    suited: dict[int, FiveCardHandRank] = {}
+    descending = sorted(VALUES, reverse=True)
+
+    for values in combinations_with_replacement(descending, 5):
+        key = 1
+        for value in values:
+            key *= VALUE_PRIMES[value]
+        unsuited[key] = rank_five_cards(values, False)
+        suited[key] = rank_five_cards(values, True)
+
+    for values in combinations_with_replacement(descending, SIX_CARDS):
+        key = 1
+        for value in values:
+            key *= VALUE_PRIMES[value]
+        # Leaving out one card of each value gives every five-value multiset of the six
+        fives = [key // VALUE_PRIMES[value] for value in set(values)]
+        unsuited[key] = max(unsuited[five] for five in fives)
+        suited[key] = max(suited[five] for five in fives)
+
+    return unsuited, suited
+
+
+class SixCardBonusEvaluator:
+    """
+    Ranks the best five-card hand of five or six cards, with table lookups only.
+    Stateless, every instance reads the same tables (see get_best_five_tables).
+    """
+    def __init__(self):
+        self.__unsuited_best, self.__suited_best = get_best_five_tables()
+
+    def evaluate_best_five(self, cards: Sequence[Card]) -> FiveCardHandRank:
+        """
+        Args:
+            cards (Sequence[Card]): Five or six cards, in any order.
+        Returns:
+            FiveCardHandRank: The rank of the best five-card hand among them.
+        """
+        key = 1
+        for card in cards:
+            key *= VALUE_PRIMES[card.value]
+        # A flush needs five cards of a suit, so at most two suits: most rounds stop here
+        suits = {card.suit for card in cards}
+        if len(suits) > 2:
+            return self.__unsuited_best[key]
+
+        best = self.__unsuited_best[key]
+        for suit in suits:
+            suited_key = 1
+            suited_count = 0
+            for card in cards:
+                if card.suit == suit:
+                    suited_key *= VALUE_PRIMES[card.value]
+                    suited_count += 1
+            if suited_count >= 5:
+                return max(best, self.__suited_best[suited_key])
+        return best
+
+    def evaluate_batch(self, hands: HandBatch) -> 'np.ndarray | array':
+        """
+        Rank a batch of six-card hands, e.g. a deal stream.
+        Args:
+            hands (HandBatch): Card indices, six per hand, in any order within a hand.
+        Returns:
+            np.ndarray | array: The FiveCardHandRank value of every hand, uint8.
+        """
+        if HAS_NUMPY:
+            return _numpy_evaluate_batch(hands)
+
+        flat = memoryview(hands).cast('B')
+        ranks = array('B', bytes(len(flat) // SIX_CARDS))
+        evaluate_best_five = self.evaluate_best_five
+        for hand, offset in enumerate(range(0, len(flat), SIX_CARDS)):
+            ranks[hand] = evaluate_best_five([DECK_CARDS[index] for index in flat[offset:offset + SIX_CARDS]])
+        return ranks
+
+
+def _sorted_table(table: dict[int, FiveCardHandRank]) -> tuple['np.ndarray', 'np.ndarray']:
+    keys = np.fromiter(sorted(table), dtype=np.int64, count=len(table))
+    ranks = np.fromiter((table[key] for key in keys.tolist()), dtype=np.uint8, count=len(table))
+    return keys, ranks
+
+
+@cache
+def _get_numpy_tables() -> tuple['np.ndarray', ...]:
+    """
+    The vectorized lookups search sorted keys instead of hashing them.
+    Returns:
+        tuple[np.ndarray, ...]: Prime of every card index, then keys and ranks of both tables.
+    """
+    unsuited_best, suited_best = get_best_five_tables()
+    index_primes = np.array([VALUE_PRIMES[card.value] for card in DECK_CARDS], dtype=np.int64)
+    return (index_primes, *_sorted_table(unsuited_best), *_sorted_table(suited_best))
+
+
+def _numpy_evaluate_batch(hands: HandBatch) -> 'np.ndarray':
+    index_primes, unsuited_keys, unsuited_ranks, suited_keys, suited_ranks = _get_numpy_tables()
+
+    if isinstance(hands, np.ndarray):
+        indices = hands.reshape(-1, SIX_CARDS)
+    else:
+        indices = np.frombuffer(memoryview(hands).cast('B'), dtype=np.uint8).reshape(-1, SIX_CARDS)
+    primes = index_primes[indices]
+    ranks = unsuited_ranks[np.searchsorted(unsuited_keys, primes.prod(axis=1))]
+
+    suits = indices & 3
+    suit_counts = np.stack([(suits == suit).sum(axis=1) for suit in range(4)], axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    if has_flush.any():
+        flush_suits = suit_counts[has_flush].argmax(axis=1)
+        suited_primes = np.where(suits[has_flush] == flush_suits[:, None], primes[has_flush], 1)
+        flush_ranks = suited_ranks[np.searchsorted(suited_keys, suited_primes.prod(axis=1))]
+        ranks[has_flush] = np.maximum(ranks[has_flush], flush_ranks)
+    return ranks
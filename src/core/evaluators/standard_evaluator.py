@@ -1,3 +1,7 @@
+from array import array
+
+from src.core.evaluators import batch_evaluation
+from src.core.evaluators.batch_evaluation import HandBatch, iter_sorted_hands, outcome_code
 from src.core.interfaces.evaluator_protocols import GameEvaluator
 
 from src.models.card import Card
@@ -81,7 +85,11 @@ class StandardEvaluator(GameEvaluator):
         is_pair: bool = (v0 == v1) or (v1 == v2)
         if is_pair:
             is_three_of_a_kind: bool = (v0 == v2)
-            return HandRank.THREE_OF_A_KIND if is_three_of_a_kind else HandRank.PAIR
+            if is_three_of_a_kind:
+                # Beats a flush, so a suited three of a kind (multi-deck shoes) stays here
+                return HandRank.THREE_OF_A_KIND
+            # A suited pair only exists in multi-deck shoes, the flush is the better rank
+            return HandRank.FLUSH if flush else HandRank.PAIR
 
         #Pattern 2: Flush || Straight Flush
 
@@ -110,13 +118,30 @@ class StandardEvaluator(GameEvaluator):
         return dealer_hand_rank_value > HandRank.HIGH_CARD or dealer_first_card >= 12
 
 
+    def hand_strength(self, hand_rank_value: HandRank, hand_values: VirtualHandValues) -> int:
+        """
+        A single integer that orders hands exactly like the showdown does:
+        the rank, then the values in the order they are compared, 4 bits each.
+        Pairs compare the pair value first, then the kicker (e.g. 9,9,2 beats K,8,8),
+        every other rank compares from the highest value, A-2-3 counts as 3-2-1.
+        Args:
+            hand_rank_value (HandRank): The rank value of the hand.
+            hand_values (VirtualHandValues): The sorted virtual hand values.
+        Returns:
+            int: The strength, higher beats lower, equal ties.
+        """
+        v0, v1, v2 = hand_values
+        if hand_rank_value == HandRank.PAIR:
+            # The middle card always belongs to the pair, the kicker is what remains of the sum
+            return (hand_rank_value << 12) | (v1 << 8) | ((v0 + v2 - v1) << 4)
+        return (hand_rank_value << 12) | (v0 << 8) | (v1 << 4) | v2
+
+
     def can_player_win(
             self,
             is_dealer_qualified: bool,
-            player_hand_rank_value: HandRank,
-            dealer_hand_rank_value: HandRank,
-            player_hand_values: VirtualHandValues,
-            dealer_hand_values: VirtualHandValues
+            player_hand_strength: int,
+            dealer_hand_strength: int
         ) -> bool | None:
 
         """
@@ -124,46 +149,80 @@ class StandardEvaluator(GameEvaluator):
         Returns True if the player wins, False if the player loses, and None if it's a tie.
         Args:
             is_dealer_qualified (bool): Indicates if the dealer qualifies.
-            player_hand_rank_value (HandRank): The rank value of the player's hand.
-            dealer_hand_rank_value (HandRank): The rank value of the dealer's hand.
-            player_hand_values (VirtualHandValues): The sorted virtual hand values of the player.
-            dealer_hand_values (VirtualHandValues): The sorted virtual hand values of the dealer.
+            player_hand_strength (int): The hand_strength of the player's hand.
+            dealer_hand_strength (int): The hand_strength of the dealer's hand.
         Returns:
             bool | None: True if the player wins, False if the player loses, None if it's a tie.
         """
         
-        assert isinstance(is_dealer_qualified, bool), "is_dealer_qualified must be a boolean!"
-        assert len(player_hand_values) == 3, "Player hand does not have exactly 3 cards!"
-        assert len(dealer_hand_values) == 3, "Dealer hand does not have exactly 3 cards!"
-        
-        
         if not is_dealer_qualified:
             return True
+        if player_hand_strength == dealer_hand_strength:
+            return None
+        return player_hand_strength > dealer_hand_strength
+
+
+    # Batch methods, see batch_evaluation.py
 
-        # Different hand ranks:
-        if player_hand_rank_value != dealer_hand_rank_value:
-            return player_hand_rank_value > dealer_hand_rank_value
+    def evaluate_hand_ranks(self, hands: HandBatch):
+        """
+        Evaluates the rank value of every hand of a batch.
+        Args:
+            hands (HandBatch): Contiguous card indices, 3 per hand.
+        Returns:
+            np.ndarray | array: HandRank values, int8.
+        """
+        if batch_evaluation.HAS_NUMPY:
+            ranks, _, _ = batch_evaluation.numpy_lookup_tables(self)
+            return ranks[batch_evaluation.numpy_table_keys(hands)]
         
-        # Same hand rank, special handling for pairs:
-        both_are_pair: bool = player_hand_rank_value == HandRank.PAIR
+        return array('b', (
+            self.evaluate_hand_rank(*self.get_virtual_hand(cards)) for cards in iter_sorted_hands(hands)
+        ))
+    
+    def are_dealers_qualified(self, hands: HandBatch):
+        """
+        Checks whether every dealer hand of a batch qualifies.
+        Returns:
+            np.ndarray | array: Qualification flags, bool or 0/1.
+        """
+        if batch_evaluation.HAS_NUMPY:
+            _, qualified, _ = batch_evaluation.numpy_lookup_tables(self)
+            return qualified[batch_evaluation.numpy_table_keys(hands)]
+        
+        flags = array('B')
+        for cards in iter_sorted_hands(hands):
+            hand_values, flush = self.get_virtual_hand(cards)
+            flags.append(self.is_dealer_qualified(self.evaluate_hand_rank(hand_values, flush), hand_values[0]))
+        return flags
+    
+    def compare_hands(self, player_hands: HandBatch, dealer_hands: HandBatch):
+        """
+        Determines the outcome of every (player hand, dealer hand) pair of two batches,
+        dealer qualification included, like can_player_win.
+        Returns:
+            np.ndarray | array: batch_evaluation.PLAYER_WINS, PUSH or PLAYER_LOSES per pair, int8.
+        """
+        if batch_evaluation.HAS_NUMPY:
+            np = batch_evaluation.np
+            _, qualified, strengths = batch_evaluation.numpy_lookup_tables(self)
+            player_keys = batch_evaluation.numpy_table_keys(player_hands)
+            dealer_keys = batch_evaluation.numpy_table_keys(dealer_hands)
+            
+            outcomes = np.sign(strengths[player_keys] - strengths[dealer_keys]).astype(np.int8)
+            outcomes[~qualified[dealer_keys]] = batch_evaluation.PLAYER_WINS
+            return outcomes
         
-        if both_are_pair:
-            if player_hand_values[1] != dealer_hand_values[1]:
-                # Since the hand values are sorted, only compare the middle card 
-                # (e.g., 9,9,2 vs K,8,8)
-                return player_hand_values[1] > dealer_hand_values[1]
-
-            # If we reach here, it means the pairs are the same (e.g., 8,8,2 vs K,8,8)
-            # The sum trick is used here: 2A + B compare to 2A + C <=> B compare to C
-            player_sum :int = sum(player_hand_values)
-            dealer_sum :int = sum(dealer_hand_values)
-            return None if player_sum == dealer_sum else player_sum > dealer_sum
-
-        # Same hand rank, but not pairs.
-        # Compare from the first card, if all three are the same then it's a tie and return None
-        for player_card, dealer_card in zip(player_hand_values, dealer_hand_values):
-            if player_card > dealer_card:
-                return True
-            elif player_card < dealer_card:
-                return False
-        return None
\ No newline at end of file
+        outcomes = array('b')
+        for player_cards, dealer_cards in zip(iter_sorted_hands(player_hands), iter_sorted_hands(dealer_hands)):
+            player_values, player_flush = self.get_virtual_hand(player_cards)
+            dealer_values, dealer_flush = self.get_virtual_hand(dealer_cards)
+            player_rank = self.evaluate_hand_rank(player_values, player_flush)
+            dealer_rank = self.evaluate_hand_rank(dealer_values, dealer_flush)
+            is_qualified = self.is_dealer_qualified(dealer_rank, dealer_values[0])
+            outcomes.append(outcome_code(self.can_player_win(
+                is_qualified,
+                self.hand_strength(player_rank, player_values),
+                self.hand_strength(dealer_rank, dealer_values)
+            )))
+        return outcomes
\ No newline at end of file
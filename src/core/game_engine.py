@@ -1,10 +1,17 @@
 from src.models.deck import Deck
+from src.core.win_probability_table import get_win_probability_table
 
 # == for type hints ==
 from src.enums.hand_rank import HandRank
 from src.models.card import Card
 from src.models.participants import Participants
 from src.core.interfaces.evaluator_protocols import GameEvaluator
+from src.core.interfaces.settle_sink_protocols import SettleSink
+from src.enums.ledger_entry_type import LedgerEntryType
+from src.services.wallet import Wallet
+from src.services.jackpot_pool import JackpotPool
+from src.models.six_card_bonus import SixCardBonus
+from src.enums.five_card_hand_rank import FiveCardHandRank
 
 
 class GameEngine:
@@ -25,7 +32,13 @@ class GameEngine:
         LIMITS_TABLE (dict[str, int]): 
             Constraints and table limits for various bets and conditions.
             
-        deck (Deck): The deck of cards used in the game.
+        deck (Deck): The deck of cards used in the game, a Shoe for multi-deck tables.
+        wallet (Wallet | None): Records every balance change as a ledger entry,
+            and commits them once per round in reset_game_state.
+        jackpot_pool (JackpotPool | None): The progressive jackpot shared with the other tables,
+            None if the table offers no progressive bet.
+        six_card_bonus (SixCardBonus | None): The rules of the Six Card Bonus side bet,
+            None if the table does not offer it.
     """
 
     def __init__(
@@ -36,7 +49,11 @@ class GameEngine:
         ANTE_BONUS_PAYOUT_RATE_TABLE: dict[int, int],
         PAIR_PLUS_PAYOUT_RATE_TABLE: dict[int, int],
         IS_TABLE_LIMIT_ENABLED: bool,
-        LIMITS_TABLE: dict[str, int]
+        LIMITS_TABLE: dict[str, int],
+        deck: Deck | None = None,
+        wallet: Wallet | None = None,
+        jackpot_pool: JackpotPool | None = None,
+        six_card_bonus: SixCardBonus | None = None
         ):
         
         self.__player = player
@@ -46,7 +63,12 @@ class GameEngine:
         self.PAIR_PLUS_PAYOUT_RATE_TABLE = PAIR_PLUS_PAYOUT_RATE_TABLE
         self.LIMITS_TABLE = LIMITS_TABLE
         self.IS_TABLE_LIMIT_ENABLED = IS_TABLE_LIMIT_ENABLED 
-        self.__deck = Deck()
+        self.__deck = deck if deck is not None else Deck()
+        self.wallet = wallet
+        self.jackpot_pool = jackpot_pool
+        self.six_card_bonus = six_card_bonus
+        # Rule set waiting for the next round boundary, see stage_game_rules
+        self.__staged_rules: tuple | None = None
     
     def reload_game_rules(
         self,
@@ -86,9 +108,71 @@ class GameEngine:
         self.reset_game_state()
         self.IS_TABLE_LIMIT_ENABLED = new_is_table_limit_enabled
         self.LIMITS_TABLE = new_limits_table
+    
+    def stage_game_rules(
+        self,
+        new_ante_table: dict[int, int],
+        new_pair_plus_table: dict[int, int],
+        new_is_table_limit_enabled: bool,
+        new_limits_table: dict[str, int],
+        new_evaluator: GameEvaluator | None = None,
+        new_side_bets: tuple[JackpotPool | None, SixCardBonus | None] | None = None
+        ) -> None:
+        """
+        A interface for config hot reload: unlike reload_game_rules and reload_table_limit,
+        this never resets the game state. The new tables and limits take effect right away
+        if no round is in progress, otherwise at the next round boundary (reset_game_state),
+        so an in-flight round is always settled with the rules it started with.
+        The evaluator and the side bets are left untouched unless new ones are given.
         
+        Args:
+            new_ante_table (dict[int, int]): _new ante bonus payout rate table_
+            new_pair_plus_table (dict[int, int]): _new pair plus payout rate table_
+            new_is_table_limit_enabled (bool): 
+                _new flag to enable or disable table limit enforcement_
+            new_limits_table (dict[str, int]): 
+                _new constraints and table limits for various bets and conditions_
+            new_evaluator (GameEvaluator | None): _new evaluator instance, e.g. of another game rule_
+            new_side_bets (tuple[JackpotPool | None, SixCardBonus | None] | None):
+                _new jackpot pool and Six Card Bonus rules, None in either to stop offering it_
+        """
         
-    # Interfaces for game_controller to access player and dealer:
+        self.__staged_rules = (
+            new_evaluator,
+            new_side_bets,
+            new_ante_table,
+            new_pair_plus_table,
+            new_is_table_limit_enabled,
+            new_limits_table
+        )
+        if not self.is_round_in_progress:
+            self._apply_staged_rules()
+    
+    def _apply_staged_rules(self) -> None:
+        
+        if self.__staged_rules is None:
+            return
+        (
+            new_evaluator,
+            new_side_bets,
+            self.ANTE_BONUS_PAYOUT_RATE_TABLE,
+            self.PAIR_PLUS_PAYOUT_RATE_TABLE,
+            self.IS_TABLE_LIMIT_ENABLED,
+            self.LIMITS_TABLE
+        ) = self.__staged_rules
+        if new_evaluator is not None:
+            self.evaluator = new_evaluator
+        if new_side_bets is not None:
+            self.jackpot_pool, self.six_card_bonus = new_side_bets
+        self.__staged_rules = None
+        
+        
+    # Interfaces for the round state machine to access player and dealer:
+    @property
+    def is_round_in_progress(self) -> bool:
+        # A round starts with the ante bet and ends with reset_game_state
+        return self.__player.ante_bet > 0 or self.__player.top > 0
+    
     @property
     def player_balance(self) -> int:
         return self.__player.balance
@@ -101,6 +185,14 @@ class GameEngine:
     def pair_plus_bet(self) -> int:
         return self.__player.pair_plus_bet
     
+    @property
+    def progressive_bet(self) -> int:
+        return self.__player.progressive_bet
+    
+    @property
+    def six_card_bonus_bet(self) -> int:
+        return self.__player.six_card_bonus_bet
+    
     @property
     def play_bet(self) -> int:
         # In any Three Card Poker rules, play bet equals ante bet
@@ -155,34 +247,83 @@ class GameEngine:
         
         return pair_plus_upper_bound
     
+    @property
+    def is_progressive_available(self) -> bool:
+        # Placed after the pair plus bet, the balance must still cover the play bet
+        if self.jackpot_pool is None:
+            return False
+        return self.__player.balance - self.__player.ante_bet >= self.jackpot_pool.bet
+    
+    @property
+    def progressive_jackpot(self) -> int:
+        return self.jackpot_pool.jackpot if self.jackpot_pool is not None else 0
+    
+    @property
+    def is_six_card_bonus_available(self) -> bool:
+        # Placed after the other side bets, the balance must still cover the play bet
+        if self.six_card_bonus is None:
+            return False
+        return self.__player.balance - self.__player.ante_bet >= self.six_card_bonus.bet
+    
     @property
     def player_hand(self) -> list[Card]:
         return self.evaluator.get_formatted_hand(self.__player.hand)
     
+    @property
+    def player_sorted_hand(self) -> list[Card]:
+        # Sorted by descending card value (after sort_hands), unlike the display order of player_hand
+        return self.__player.hand
+    
+    @property
+    def player_hand_rank(self) -> HandRank:
+        # For callers that need the rank without settling, e.g. statistics of folded hands
+        return self.evaluator.evaluate_hand_rank(*self.evaluator.get_virtual_hand(self.__player.hand))
+    
+    @property
+    def player_win_probabilities(self) -> tuple[float, float, float] | None:
+        """
+        Chances of the player's hand (after sort_hands) to win, tie and lose against
+        a random dealer hand, from the evaluator's precomputed table.
+        None before the deal, or if the hand holds the same card twice (multi-deck shoes).
+        """
+        hand = self.__player.hand
+        if self.__player.top != 3 or len(set(hand)) != 3:
+            return None
+        return get_win_probability_table(self.evaluator).probabilities(hand)
+    
     @property
     def dealer_hand(self) -> list[Card]:
         return self.evaluator.get_formatted_hand(self.__dealer.hand)
     
+    @property
+    def dealer_upcard(self) -> Card | None:
+        # The dealer's first card, whatever sort_hands did to the hand since
+        return self.__dealer.upcard
+    
     
     # setting player balance and bets
-    def add_player_balance(self, amount: int):
+    def add_player_balance(self, amount: int, entry_type: LedgerEntryType = LedgerEntryType.ADJUSTMENT):
         
         if amount < 0:
             raise ValueError("amount can not be negative.")
         self.__player.balance += amount
+        if self.wallet is not None:
+            self.wallet.record(entry_type, amount)
         
-    def deduct_player_balance(self, amount: int):
+    def deduct_player_balance(self, amount: int, entry_type: LedgerEntryType = LedgerEntryType.ADJUSTMENT):
         
         if amount > self.__player.balance:
             raise ValueError("amount exceeds player's balance.")
         self.__player.balance -= amount
+        if self.wallet is not None:
+            self.wallet.record(entry_type, -amount)
 
     def place_ante_bet(self, amount: int):
         if not (self.LIMITS_TABLE['min_ante_bet'] <= amount <= self.max_ante_bet):
             raise ValueError(
                 "amount is less than minimum ante bet or exceeds maximum ante bet."
             )
-        self.deduct_player_balance(amount) # validate first, then change state
+        self.deduct_player_balance(amount, LedgerEntryType.ANTE_BET) # validate first, then change state
         self.__player.ante_bet = amount
         
     def place_pair_plus_bet(self, amount: int): 
@@ -190,21 +331,41 @@ class GameEngine:
             raise ValueError(
                 "amount is less than minimum pair plus bet or exceeds maximum pair plus bet."
             )
-        self.deduct_player_balance(amount)
+        self.deduct_player_balance(amount, LedgerEntryType.PAIR_PLUS_BET)
         self.__player.pair_plus_bet = amount
         
+    def place_progressive_bet(self):
+        if not self.is_progressive_available:
+            raise ValueError("progressive bet is not offered or exceeds player's balance.")
+        self.deduct_player_balance(self.jackpot_pool.bet, LedgerEntryType.PROGRESSIVE_BET)
+        self.__player.progressive_bet = self.jackpot_pool.bet
+        self.jackpot_pool.contribute(self.jackpot_pool.bet)
+        
+    def place_six_card_bonus_bet(self):
+        if not self.is_six_card_bonus_available:
+            raise ValueError("six card bonus bet is not offered or exceeds player's balance.")
+        self.deduct_player_balance(self.six_card_bonus.bet, LedgerEntryType.SIX_CARD_BONUS_BET)
+        self.__player.six_card_bonus_bet = self.six_card_bonus.bet
+        
     def place_play_bet(self):
-        self.deduct_player_balance(self.__player.play_bet) 
+        # In any Three Card Poker rules, play bet equals ante bet
+        self.deduct_player_balance(self.__player.ante_bet, LedgerEntryType.PLAY_BET)
         self.__player.play_bet = self.__player.ante_bet
         
     def return_ante_bet(self):
-        self.add_player_balance(self.__player.ante_bet)
+        self.add_player_balance(self.__player.ante_bet, LedgerEntryType.ANTE_RETURN)
 
     def return_play_bet(self):
-        self.add_player_balance(self.__player.play_bet)
+        self.add_player_balance(self.__player.play_bet, LedgerEntryType.PLAY_RETURN)
 
     def return_pair_plus_bet(self):
-        self.add_player_balance(self.__player.pair_plus_bet)
+        self.add_player_balance(self.__player.pair_plus_bet, LedgerEntryType.PAIR_PLUS_RETURN)
+
+    def return_progressive_bet(self):
+        self.add_player_balance(self.__player.progressive_bet, LedgerEntryType.PROGRESSIVE_RETURN)
+
+    def return_six_card_bonus_bet(self):
+        self.add_player_balance(self.__player.six_card_bonus_bet, LedgerEntryType.SIX_CARD_BONUS_RETURN)
         
     # Dealing and sorting cards
     def shuffle_deck(self):
@@ -243,15 +404,30 @@ class GameEngine:
 
         return pair_plus_payout
     
-    def evaluate(self) -> dict[str, int | bool | None]:
+    def calculate_progressive_payout(self, hand_rank_value: int) -> int:
+        """
+        What the hand would win from the progressive jackpot right now, for display.
+        Only settle claims the payout, the jackpot may have moved by then.
+        """
+        if self.jackpot_pool is None:
+            return 0
+        percent = self.jackpot_pool.payout_percent(hand_rank_value)
+        return self.jackpot_pool.jackpot * percent // 100
+    
+    def calculate_six_card_bonus_payout(self, five_card_hand_rank_value: int) -> int:
+        
+        rate = self.six_card_bonus.payout_rate_table[five_card_hand_rank_value]
+        six_card_bonus_payout = rate * self.__player.six_card_bonus_bet
+        
+        return six_card_bonus_payout
+    
+    def _evaluate(self) -> tuple[bool, HandRank, bool | None]:
         """
         Calls the evaluator to evaluate both player and dealer hands,
         determines if the dealer qualifies, and decides the outcome for the player.
         Returns:
-            dict[str, int | bool | None]: A dictionary containing:
-                - 'is_dealer_qualified' (bool): Whether the dealer qualifies.
-                - 'player_hand_rank_value' (int): The rank value of the player's hand.
-                - 'did_player_win' (bool | None): True if player wins, False if loses, None if tie.
+            tuple[bool, HandRank, bool | None]: is_dealer_qualified, player_hand_rank_value
+                and did_player_win, see self.evaluate
         """
         
         player_hand_values, is_player_flush = self.evaluator.get_virtual_hand(self.__player.hand)
@@ -267,65 +443,77 @@ class GameEngine:
 
         did_player_win = self.evaluator.can_player_win(
             is_dealer_qualified,
-            player_hand_rank_value,
-            dealer_hand_rank_value,
-            player_hand_values,
-            dealer_hand_values
+            self.evaluator.hand_strength(player_hand_rank_value, player_hand_values),
+            self.evaluator.hand_strength(dealer_hand_rank_value, dealer_hand_values)
         )
         
-        # Only return the data needed by self.settle
+        return is_dealer_qualified, player_hand_rank_value, did_player_win
+    
+    def evaluate(self) -> dict[str, int | bool | None]:
+        """
+        Calls the evaluator to evaluate both player and dealer hands,
+        determines if the dealer qualifies, and decides the outcome for the player.
+        Returns:
+            dict[str, int | bool | None]: A dictionary containing:
+                - 'is_dealer_qualified' (bool): Whether the dealer qualifies.
+                - 'player_hand_rank_value' (int): The rank value of the player's hand.
+                - 'did_player_win' (bool | None): True if player wins, False if loses, None if tie.
+        """
+        
+        is_dealer_qualified, player_hand_rank_value, did_player_win = self._evaluate()
+        
         return { 
             'is_dealer_qualified': is_dealer_qualified,
             'player_hand_rank_value': player_hand_rank_value,
             'did_player_win':did_player_win
         }
     
-    def settle(self) -> dict[str, bool | int]:
-        
-        eval_res = self.evaluate()
-        
-        is_dealer_qualified = eval_res['is_dealer_qualified']
-        player_hand_rank_value = eval_res['player_hand_rank_value']
+    def settle(self, sink: SettleSink | None = None) -> dict[str, bool | int] | None:
+        """
+        Evaluates the hands and pays the player out.
+        Args:
+            sink (SettleSink | None): If given, the results are written into the sink
+                and no dict is built, for high-volume simulations.
+        Returns:
+            dict[str, bool | int] | None: The settlement table, None if a sink was given.
+        """
         
+        is_dealer_qualified, player_hand_rank_value, did_player_win = self._evaluate()
         
         # Determine if the player is eligible for an ante bonus payout based on their hand rank
         ante_bonus_payout: int = 0
         if player_hand_rank_value >= HandRank.STRAIGHT:
             ante_bonus_payout = self.calculate_ante_bonus_payout(player_hand_rank_value)
-            self.add_player_balance(ante_bonus_payout)
+            self.add_player_balance(ante_bonus_payout, LedgerEntryType.ANTE_BONUS_PAYOUT)
             
         # Determine if the player is eligible for a pair plus payout based on their hand rank
         had_pair_plus_bet: bool = self.__player.pair_plus_bet >= self.LIMITS_TABLE['min_pair_plus_bet']
         pair_plus_payout: int = 0
+        did_pair_plus_hit: bool = had_pair_plus_bet and player_hand_rank_value >= HandRank.PAIR
         
-        if had_pair_plus_bet and player_hand_rank_value >= HandRank.PAIR:
+        if did_pair_plus_hit:
             self.return_pair_plus_bet()
             pair_plus_payout = self.calculate_pair_plus_payout(player_hand_rank_value)
-            self.add_player_balance(pair_plus_payout)
+            self.add_player_balance(pair_plus_payout, LedgerEntryType.PAIR_PLUS_PAYOUT)
+
+        did_progressive_hit, progressive_payout, six_card_bonus_rank, six_card_bonus_payout = (
+            self._settle_card_side_bets(player_hand_rank_value)
+        )
 
-        # Prepare the settlement table to return
-        settle_table: dict[str, bool | int] = {
-            'is_dealer_qualified':is_dealer_qualified,
-            'ante_bonus_payout':ante_bonus_payout,
-            'had_pair_plus_bet':had_pair_plus_bet,
-            'pair_plus_payout':pair_plus_payout,
-        }
-        
         # Determine the outcome for the player and adjust balances accordingly
-        did_player_win = eval_res['did_player_win']
         winnings: int = 0
         
         match did_player_win:
             
             case False:
-                settle_table.update({'outcome':'lose','winnings':winnings}) 
+                outcome = 'lose'
                 
             case None:
                 
                 self.return_ante_bet()
                 self.return_play_bet()
                 
-                settle_table.update({'outcome':'push','winnings':winnings}) 
+                outcome = 'push'
                 
             case True:
                 
@@ -337,17 +525,121 @@ class GameEngine:
                 else:   # Dealer qualifies, player wins both ante and play bets
                     winnings = self.__player.ante_bet + self.__player.play_bet
                     
-                settle_table.update({'outcome':'win','winnings':winnings}) 
+                outcome = 'win'
                 
-        self.add_player_balance(winnings)
+        self.add_player_balance(winnings, LedgerEntryType.WINNINGS)
+        
+        if sink is not None:
+            # Net win of the round: every payout, minus every bet that was not returned
+            net_win = ante_bonus_payout + winnings
+            net_win += pair_plus_payout if did_pair_plus_hit else -self.__player.pair_plus_bet
+            net_win += progressive_payout if did_progressive_hit else -self.__player.progressive_bet
+            net_win += six_card_bonus_payout if six_card_bonus_payout > 0 else -self.__player.six_card_bonus_bet
+            if outcome == 'lose':
+                net_win -= self.__player.ante_bet + self.__player.play_bet
+            
+            sink.record_settlement(
+                player_hand_rank_value,
+                is_dealer_qualified,
+                outcome,
+                ante_bonus_payout,
+                had_pair_plus_bet,
+                pair_plus_payout,
+                winnings,
+                net_win
+            )
+            return None
+        
+        return {
+            'is_dealer_qualified':is_dealer_qualified,
+            'player_hand_rank_value':player_hand_rank_value,
+            'ante_bonus_payout':ante_bonus_payout,
+            'had_pair_plus_bet':had_pair_plus_bet,
+            'pair_plus_payout':pair_plus_payout,
+            'had_progressive_bet':self.__player.progressive_bet > 0,
+            'progressive_payout':progressive_payout,
+            'had_six_card_bonus_bet':self.__player.six_card_bonus_bet > 0,
+            'six_card_bonus_rank':six_card_bonus_rank,
+            'six_card_bonus_payout':six_card_bonus_payout,
+            'outcome':outcome,
+            'winnings':winnings,
+        }
+    
+    def _settle_card_side_bets(
+        self,
+        player_hand_rank_value: HandRank
+        ) -> tuple[bool, int, FiveCardHandRank | None, int]:
+        """
+        Pays the side bets that only depend on the cards, not on the play decision:
+        the progressive and the Six Card Bonus. Settled by settle and by settle_fold alike.
+        Returns:
+            tuple[bool, int, FiveCardHandRank | None, int]: did_progressive_hit, progressive_payout,
+                six_card_bonus_rank (None without the bet) and six_card_bonus_payout
+        """
+        
+        # The progressive bet wins a share of the shared jackpot, claimed atomically
+        progressive_payout: int = 0
+        did_progressive_hit: bool = (
+            self.__player.progressive_bet > 0
+            and self.jackpot_pool.payout_percent(player_hand_rank_value) > 0
+        )
         
-        return settle_table
+        if did_progressive_hit:
+            self.return_progressive_bet()
+            progressive_payout = self.jackpot_pool.claim(player_hand_rank_value)
+            self.add_player_balance(progressive_payout, LedgerEntryType.PROGRESSIVE_PAYOUT)
+
+        # The Six Card Bonus pays the best five of the player's and the dealer's cards
+        six_card_bonus_rank: FiveCardHandRank | None = None
+        six_card_bonus_payout: int = 0
+        
+        if self.__player.six_card_bonus_bet > 0:
+            six_card_bonus_rank = self.six_card_bonus.evaluator.evaluate_best_five(
+                self.__player.hand + self.__dealer.hand
+            )
+            six_card_bonus_payout = self.calculate_six_card_bonus_payout(six_card_bonus_rank)
+            if six_card_bonus_payout > 0:
+                self.return_six_card_bonus_bet()
+                self.add_player_balance(six_card_bonus_payout, LedgerEntryType.SIX_CARD_BONUS_PAYOUT)
+        
+        return did_progressive_hit, progressive_payout, six_card_bonus_rank, six_card_bonus_payout
+    
+    def settle_fold(self) -> dict[str, bool | int | None]:
+        """
+        Settles a folded round: the ante and pair plus bets are lost, but the progressive
+        and the Six Card Bonus bets pay on the cards alone, folded or not.
+        Returns:
+            dict[str, bool | int | None]: The side bet entries of the settle table:
+                'player_hand_rank_value', 'had_progressive_bet', 'progressive_payout',
+                'had_six_card_bonus_bet', 'six_card_bonus_rank' and 'six_card_bonus_payout'.
+        """
+        
+        player_hand_rank_value = self.player_hand_rank
+        _, progressive_payout, six_card_bonus_rank, six_card_bonus_payout = (
+            self._settle_card_side_bets(player_hand_rank_value)
+        )
+        
+        return {
+            'player_hand_rank_value':player_hand_rank_value,
+            'had_progressive_bet':self.__player.progressive_bet > 0,
+            'progressive_payout':progressive_payout,
+            'had_six_card_bonus_bet':self.__player.six_card_bonus_bet > 0,
+            'six_card_bonus_rank':six_card_bonus_rank,
+            'six_card_bonus_payout':six_card_bonus_payout,
+        }
     
     def reset_game_state(self) -> None:
 
+        # Round boundary: pick up the rules published by a config hot reload
+        self._apply_staged_rules()
+        
         self.__player.clear_hand()
         self.__dealer.clear_hand()
-        self.__deck.janitor() # Reset the deck cursor to the top
+        self.__deck.janitor() # Reset the deck cursor to the top (a Shoe keeps its discards out)
+        
+        # Reset player state, including the ante, play and every side bet amount
+        self.__player.reset_bets()
         
-        # Reset player state, including ante bet, pair plus bet, and play bet amounts
-        self.__player.reset_bets()
\ No newline at end of file
+        # One ledger update per round, whatever the number of balance changes
+        if self.wallet is not None:
+            self.wallet.commit_round(self.__player.balance)
\ No newline at end of file
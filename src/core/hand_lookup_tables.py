@@ -0,0 +1,212 @@
+"""
+Precomputed rank, strength and dealer qualification of every three-card hand,
+for both game rules, shared by every process of the host through a memory-mapped file.
+
+A hand is keyed by its card values sorted descending and its flush flag (see table_key),
+which covers the hands of any number of decks, and any order of the cards.
+The tables are built once from the reference evaluators and written under the cache dir
+as a versioned binary file with a SHA-256 checksum of its contents. Every later start,
+in every worker process, maps the file read-only: the pages are shared by all processes
+instead of being rebuilt or copied into each of them. A file whose checksum does not
+match is rebuilt.
+
+Layout: header (TABLE_HEADER, little endian), then per game rule in REFERENCE_EVALUATORS order
+    ranks (uint8), dealer qualification flags (uint8), strengths (uint16, native order),
+    TABLE_KEY_COUNT entries each, indexed by table_key.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.evaluators.batch_evaluation import TABLE_KEY_COUNT, iter_table_hands
+from src.core.evaluators.california_evaluator import CaliforniaEvaluator
+from src.core.evaluators.standard_evaluator import StandardEvaluator
+from src.core.win_probability_table import evaluator_identity
+from src.services.utils.get_file_path import CACHE_DIR
+
+# The evaluators the tables are built from, in file order
+REFERENCE_EVALUATORS: dict[str, StandardEvaluator] = {
+    'standard': StandardEvaluator(),
+    'california': CaliforniaEvaluator(),
+}
+
+# magic, format version, game rule count, SHA-256 of everything after the header
+TABLE_HEADER = struct.Struct('<4sHH32s')
+TABLE_MAGIC = b'TCHT'
+TABLE_FORMAT_VERSION = 1
+
+# Bytes per game rule: ranks, qualification flags, strengths
+RULE_TABLES_SIZE = TABLE_KEY_COUNT * (1 + 1 + 2)
+
+
+def table_key(v0: int, v1: int, v2: int, is_flush: bool) -> int:
+    """
+    Args:
+        v0, v1, v2 (int): The card values of a hand, sorted descending (A-2-3 is 14, 3, 2).
+        is_flush (bool): Whether the three cards share a suit.
+    """
+    return (v0 << 9) | (v1 << 5) | (v2 << 1) | is_flush
+
+
+@dataclass(frozen=True)
+class RuleTables:
+    """
+    The tables of one game rule, indexed by table_key.
+    Entries of keys that are no hand (values not sorted) are zero.
+
+    Attributes:
+        ranks (memoryview): HandRank values, 'B'.
+        qualified (memoryview): 1 if a dealer holding the hand qualifies, 'B'.
+        strengths (memoryview): StandardEvaluator.hand_strength of the hand, 'H'.
+    """
+    game_rule: str
+    ranks: memoryview
+    qualified: memoryview
+    strengths: memoryview
+
+
+def build_hand_lookup_payload() -> bytes:
+    """
+    Evaluate every sorted value triple, unsuited and suited, with the reference evaluator
+    of every game rule.
+    Returns:
+        bytes: Everything after the header of the table file.
+    """
+    chunks: list[bytes] = []
+    for evaluator in REFERENCE_EVALUATORS.values():
+        ranks = array('B', bytes(TABLE_KEY_COUNT))
+        qualified = array('B', bytes(TABLE_KEY_COUNT))
+        strengths = array('H', bytes(2 * TABLE_KEY_COUNT))
+
+        for key, cards in iter_table_hands():
+            hand_values, flush = evaluator.get_virtual_hand(cards)
+            rank = evaluator.evaluate_hand_rank(hand_values, flush)
+            ranks[key] = rank
+            qualified[key] = evaluator.is_dealer_qualified(rank, hand_values[0])
+            strengths[key] = evaluator.hand_strength(rank, hand_values)
+
+        chunks += (ranks.tobytes(), qualified.tobytes(), strengths.tobytes())
+    return b''.join(chunks)
+
+
+class HandLookupTables:
+    """
+    Read-only tables of every game rule, backed by a memory map of the table file,
+    or by in-memory bytes if the file could not be written.
+    """
+    def __init__(self, payload: memoryview, mapped: mmap.mmap | None = None):
+        self.__payload = payload
+        self.__mapped = mapped
+        self.__rules: dict[str, RuleTables] = {}
+        for position, game_rule in enumerate(REFERENCE_EVALUATORS):
+            offset = position * RULE_TABLES_SIZE
+            self.__rules[game_rule] = RuleTables(
+                game_rule,
+                payload[offset:offset + TABLE_KEY_COUNT],
+                payload[offset + TABLE_KEY_COUNT:offset + 2 * TABLE_KEY_COUNT],
+                payload[offset + 2 * TABLE_KEY_COUNT:offset + RULE_TABLES_SIZE].cast('H'),
+            )
+
+    @property
+    def is_mapped(self) -> bool:
+        return self.__mapped is not None
+
+    def for_rule(self, game_rule: str) -> RuleTables:
+        """
+        Raises:
+            ValueError: If there are no tables for the game rule.
+        """
+        if game_rule not in self.__rules:
+            raise ValueError(f"No hand tables for game rule '{game_rule}'.")
+        return self.__rules[game_rule]
+
+
+def get_tables_path(cache_dir: Path = CACHE_DIR) -> Path:
+    """
+    The file name carries the identity of the reference evaluators,
+    editing one of them makes a new file.
+    """
+    identities = '|'.join(evaluator_identity(evaluator) for evaluator in REFERENCE_EVALUATORS.values())
+    digest = hashlib.sha256(identities.encode('UTF-8')).hexdigest()[:16]
+    return cache_dir / f'hand_tables_{digest}.bin'
+
+
+def _write_tables_file(tables_path: Path, payload: bytes) -> bool:
+    """
+    Atomically write the tables file, returns False if the cache dir is not writable.
+    """
+    tmp_path = tables_path.with_name(f'{tables_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        tables_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, mode='wb') as tables_file:
+            tables_file.write(TABLE_HEADER.pack(
+                TABLE_MAGIC,
+                TABLE_FORMAT_VERSION,
+                len(REFERENCE_EVALUATORS),
+                hashlib.sha256(payload).digest()
+            ))
+            tables_file.write(payload)
+        os.replace(tmp_path, tables_path)
+        return True
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def _map_tables_file(tables_path: Path) -> tuple[mmap.mmap, memoryview] | None:
+    """
+    Map a tables file into memory, None if it is missing, of another format version
+    or its checksum does not match.
+    """
+    expected_size = TABLE_HEADER.size + len(REFERENCE_EVALUATORS) * RULE_TABLES_SIZE
+    try:
+        with open(tables_path, mode='rb') as tables_file:
+            if os.fstat(tables_file.fileno()).st_size != expected_size:
+                return None
+            mapped = mmap.mmap(tables_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    magic, version, rule_count, checksum = TABLE_HEADER.unpack_from(mapped)
+    payload = memoryview(mapped)[TABLE_HEADER.size:]
+    if (
+        (magic, version, rule_count) != (TABLE_MAGIC, TABLE_FORMAT_VERSION, len(REFERENCE_EVALUATORS))
+        or hashlib.sha256(payload).digest() != checksum
+    ):
+        payload.release()
+        mapped.close()
+        return None
+    return mapped, payload
+
+
+def load_hand_lookup_tables(cache_dir: Path = CACHE_DIR) -> HandLookupTables:
+    """
+    Map the tables file, building and writing it first if needed.
+    """
+    tables_path = get_tables_path(cache_dir)
+
+    if (loaded := _map_tables_file(tables_path)) is not None:
+        return HandLookupTables(loaded[1], loaded[0])
+
+    payload = build_hand_lookup_payload()
+    if _write_tables_file(tables_path, payload) and (loaded := _map_tables_file(tables_path)) is not None:
+        return HandLookupTables(loaded[1], loaded[0])
+    # Read-only install, keep the tables in memory for this process
+    return HandLookupTables(memoryview(payload))
+
+
+# Process wide tables
+_tables: HandLookupTables | None = None
+_tables_lock = threading.Lock()
+
+def get_hand_lookup_tables() -> HandLookupTables:
+    global _tables
+    with _tables_lock:
+        if _tables is None:
+            _tables = load_hand_lookup_tables()
+        return _tables
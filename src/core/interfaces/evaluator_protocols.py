@@ -25,11 +25,49 @@ class GameEvaluator(Protocol):
         """
         ...
 
-    def can_player_win(self, *args: Any) -> bool | None:
+    def hand_strength(self, *args: Any) -> int:
+        """
+        A single integer per hand encoding its rank and all kickers,
+        so that hands compare, sort and index like plain integers.
+        Returns:
+            int: The strength, higher beats lower, equal ties.
+        """
+        ...
+
+    def can_player_win(self, is_dealer_qualified: bool, player_hand_strength: int, dealer_hand_strength: int) -> bool | None:
         
         """
-        Determines the outcome of the player in the game.
+        Determines the outcome of the player in the game, from the hand_strength of both hands.
         Returns:
             bool | None: True if the player wins, False if the player loses, None if it's a tie.
         """
-        ...
\ No newline at end of file
+        ...
+
+    # Batch methods: many hands per call, see src/core/evaluators/batch_evaluation.py.
+    # A batch is a contiguous buffer of card indices, 3 per hand.
+    # The results are NumPy arrays when NumPy is installed, array.array otherwise.
+
+    def evaluate_hand_ranks(self, hands: Any) -> Any:
+        """
+        Evaluates the rank value of every hand of a batch.
+        Returns:
+            The HandRank value of every hand.
+        """
+        ...
+
+    def are_dealers_qualified(self, hands: Any) -> Any:
+        """
+        Checks whether every dealer hand of a batch qualifies.
+        Returns:
+            The qualification flag of every hand.
+        """
+        ...
+
+    def compare_hands(self, player_hands: Any, dealer_hands: Any) -> Any:
+        """
+        Determines the outcome of every (player hand, dealer hand) pair of two batches,
+        dealer qualification included.
+        Returns:
+            1 if the player wins, 0 on a tie, -1 if the player loses, for every pair.
+        """
+        ...
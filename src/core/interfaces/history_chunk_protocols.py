@@ -0,0 +1,28 @@
+from array import array
+from typing import Protocol
+
+class HistoryChunk(Protocol):
+    """
+    A protocol for the chunks of src/services/hand_history_store.py: the rows of one chunk,
+    sealed on disk or still buffered, seen through their columns and bitmaps.
+    Attributes:
+        rows (int): Number of rows.
+        first_ms, last_ms (int): Smallest and largest timestamp.
+    """
+    rows: int
+    first_ms: int
+    last_ms: int
+
+    def column(self, name: str) -> array:
+        """
+        Returns:
+            array: Every value of a column of HISTORY_COLUMNS, one per row.
+        """
+        ...
+
+    def bitmap(self, name: str, value: int) -> int:
+        """
+        Returns:
+            int: The rows where an indexed column holds the value, bit n for row n.
+        """
+        ...
@@ -0,0 +1,33 @@
+from typing import Protocol
+from src.enums.hand_rank import HandRank
+
+class SettleSink(Protocol):
+    """
+    A protocol for accumulators that GameEngine.settle writes its results into directly,
+    instead of building a settlement dict per round. Implementations are meant to update
+    preallocated counters in place, so long runs allocate nothing per round.
+    Outcomes use the same strings as the settlement dict: 'win', 'push', 'lose'.
+    """
+
+    def record_settlement(
+        self,
+        player_hand_rank_value: HandRank,
+        is_dealer_qualified: bool,
+        outcome: str,
+        ante_bonus_payout: int,
+        had_pair_plus_bet: bool,
+        pair_plus_payout: int,
+        winnings: int,
+        net_win: int
+        ) -> None:
+        """
+        Called by GameEngine.settle, the arguments are the fields of the settlement dict,
+        plus the net win of the round (every payout minus every lost bet).
+        """
+        ...
+
+    def record_fold(self, player_hand_rank_value: HandRank, net_win: int) -> None:
+        """
+        Called by drivers when the player folds, folded rounds are never settled.
+        """
+        ...
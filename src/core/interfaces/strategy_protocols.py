@@ -0,0 +1,59 @@
+from typing import Protocol
+from src.models.card import Card
+
+class Strategy(Protocol):
+    """
+    A protocol for automated players (bots), driven by src/core/strategy_driver.py.
+    Decisions are taken from plain numbers and cards, never from prompts or strings.
+    Any class that implements this protocol must provide implementations for the following methods.
+    """
+
+    def choose_ante_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        """
+        Returns:
+            int: The ante bet, within [min_bet, max_bet].
+        """
+        ...
+
+    def choose_pair_plus_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        """
+        Only asked if the balance allows a pair plus bet at all.
+        Returns:
+            int: The pair plus bet within [min_bet, max_bet], or 0 to skip it.
+        """
+        ...
+
+    def should_play(self, hand: list[Card]) -> bool:
+        """
+        Args:
+            hand (list[Card]): The player's hand, sorted by descending card value.
+        Returns:
+            bool: True to place the play bet and compare hands, False to fold.
+        """
+        ...
+
+    def observe_result(self, net_win: int) -> None:
+        """
+        Called after every round, e.g. for bet progressions.
+        Args:
+            net_win (int): Balance after the round minus balance before the round.
+        """
+        ...
+
+
+
+class UpcardStrategy(Strategy, Protocol):
+    """
+    A Strategy that also decides when the dealer upcard is revealed before the play/fold decision,
+    see StrategyDriver.is_dealer_upcard_revealed.
+    """
+
+    def should_play_seeing_upcard(self, hand: list[Card], upcard: Card) -> bool:
+        """
+        Args:
+            hand (list[Card]): The player's hand, sorted by descending card value.
+            upcard (Card): The dealer's revealed card.
+        Returns:
+            bool: True to place the play bet and compare hands, False to fold.
+        """
+        ...
@@ -0,0 +1,540 @@
+from typing import Callable, Iterator
+
+from src.core.game_engine import GameEngine
+from src.core.interfaces.settle_sink_protocols import SettleSink
+from src.enums.host_action import HostAction
+from src.enums.round_state import RoundState
+from src.enums.ui_keys import UIKeys
+from src.errors.int_input_not_in_legal_range import IntInputNotInLegalRangeError
+from src.models.round_events import (
+    ShowMessage,
+    ShowText,
+    RequestInput,
+    ScheduleTimer,
+    RequestHostAction,
+    RoundBoundary,
+    UserInput,
+    TimerFired,
+    TextLines,
+    RoundOutputEvent,
+    RoundInputEvent,
+)
+
+class RoundStateMachine:
+    """
+    The round flow of one table as an explicit state machine:
+    main menu → ante → pair plus → deal → play/fold → settle → another game.
+
+    It never blocks. Every call to handle() consumes one input event, advances the game engine
+    and returns the output events the host has to carry out, in order: messages to show,
+    the next input to ask for, timers to schedule, application level actions.
+    The machine then waits for the answer to its last RequestInput, ScheduleTimer or READ_RULES.
+    A single thread can multiplex many tables this way, bots and tests step a table
+    directly and fire timers right away. Long texts such as the rules are rolled out the
+    same way, one line per timer, from the lines the host answers READ_RULES with.
+
+    Attributes:
+        game (GameEngine): The game engine of the table.
+        config (dict[str, int | float]): The game controller config, see game_controller_config.json.
+        history (SettleSink | None): If given, every settled or folded round is recorded into it,
+            e.g. a HandHistoryStore.
+    """
+
+    # This is three card poker, each participant draws 3 cards
+    # DO NOT TOUCH THIS CONST, OR EVERYTHING BREAKS
+    THREE_TIMES = 3
+
+    MENU_PROMPTS: dict[RoundState, UIKeys] = {
+        RoundState.MAIN_MENU: UIKeys.FIRST_ROUND_PROMPT,
+        RoundState.PAIR_PLUS_MENU: UIKeys.PAIR_PLUS_ROUND_PROMPT,
+        RoundState.PROGRESSIVE_MENU: UIKeys.PROGRESSIVE_ROUND_PROMPT,
+        RoundState.SIX_CARD_BONUS_MENU: UIKeys.SIX_CARD_BONUS_ROUND_PROMPT,
+        RoundState.PLAY_MENU: UIKeys.SECOND_ROUND_PROMPT,
+        RoundState.ANOTHER_GAME_MENU: UIKeys.ANOTHER_ROUND_PROMPT,
+    }
+
+    def __init__(self, game: GameEngine, config: dict[str, int | float], history: SettleSink | None = None):
+        self.game = game
+        self.config = config
+        self.history = history
+        self.__balance_before_round = 0
+        self.__state = RoundState.IDLE
+        self.__outbox: list[RoundOutputEvent] = []
+        self.__pending_timer: ScheduleTimer | None = None
+        self.__last_timer_id = 0
+        self.__tries = 0
+        self.__draws = 0
+        self.__has_cheated = False
+        # The text being rolled out, and the menu to go back to once it is done
+        self.__rolling_lines: Iterator[str] = iter(())
+        self.__rolling_seconds = 0.0
+        self.__rolling_return_state = RoundState.MAIN_MENU
+        self.__is_timer_late = False
+
+        # creating dispatch tables
+        self.__menus: dict[RoundState, dict[str, Callable[[], None]]] = {
+            RoundState.MAIN_MENU: {
+                '1': self._first_round,
+                '2': self._read_rules,
+                '3': self._exit,
+                '4': lambda: self._host_action(HostAction.SWITCH_LANGUAGE),
+                '1337': self._cheat,
+            },
+            RoundState.PAIR_PLUS_MENU: {
+                '1': self._pair_plus_round,
+                '2': self._no_pair_plus,
+                '3': self._exit,
+            },
+            RoundState.PROGRESSIVE_MENU: {
+                '1': self._place_progressive,
+                '2': self._no_progressive,
+                '3': self._exit,
+            },
+            RoundState.SIX_CARD_BONUS_MENU: {
+                '1': self._place_six_card_bonus,
+                '2': self._no_six_card_bonus,
+                '3': self._exit,
+            },
+            RoundState.PLAY_MENU: {
+                '1': self._compare_hand_and_settle,
+                '2': self._fold,
+                '3': self._exit,
+            },
+            RoundState.ANOTHER_GAME_MENU: {
+                '1': self._another_game,
+                '2': self._switch_rules,
+                '3': self._exit,
+            },
+        }
+        self.__input_handlers: dict[RoundState, Callable[[str], None]] = {
+            RoundState.ANTE_BET: self._on_ante_bet,
+            RoundState.PAIR_PLUS_BET: self._on_pair_plus_bet,
+            RoundState.DRAW_PROMPT: self._on_draw_prompt,
+        }
+        self.__timers: dict[RoundState, Callable[[], None]] = {
+            RoundState.PLAYER_DRAW: self._on_player_draw,
+            RoundState.DEALER_DRAW: self._on_dealer_draw,
+            RoundState.REVEAL_DEALER_HAND: self._on_reveal_dealer_hand,
+            RoundState.FOLDING: self._on_fold,
+            RoundState.ROLLING_TEXT: self._on_rolling_text,
+        }
+
+    @property
+    def state(self) -> RoundState:
+        return self.__state
+
+    @property
+    def pending_timer(self) -> ScheduleTimer | None:
+        """
+        The timer the machine waits for, None if it waits for user input.
+        """
+        return self.__pending_timer
+
+    @property
+    def skip_pair_plus(self) -> bool:
+        return self.game.MIN_PAIR_PLUS_BET > self.game.max_pair_plus_bet
+
+    def reload_config(self, new_config: dict[str, int | float]) -> None:
+        self.config = new_config
+
+    def start(self) -> list[RoundOutputEvent]:
+        """
+        Open the main menu of the first round.
+        Raises:
+            ValueError: If the machine is already started.
+        """
+        if self.__state is not RoundState.IDLE:
+            raise ValueError(f"already started, in state {self.__state.name}")
+        self._begin_round()
+        return self._drain()
+
+    def handle(self, event: RoundInputEvent) -> list[RoundOutputEvent]:
+        """
+        Consume one input event.
+        Args:
+            event (RoundInputEvent): UserInput answers the last RequestInput,
+                TimerFired the last ScheduleTimer, TextLines the last RequestHostAction(READ_RULES).
+        Returns:
+            list[RoundOutputEvent]: What the host has to do, in order.
+                Empty for a stale timer, e.g. one scheduled before a restart.
+        Raises:
+            ValueError: If the machine does not wait for this kind of event.
+        """
+        match event:
+            case UserInput(text=text) if self.__pending_timer is None and self.__state in self.__menus:
+                self._on_menu_choice(text)
+            case UserInput(text=text) if self.__pending_timer is None and self.__state in self.__input_handlers:
+                self.__input_handlers[self.__state](text)
+            case TimerFired(timer_id=timer_id, is_late=is_late) if self.__pending_timer is not None:
+                if timer_id != self.__pending_timer.timer_id:
+                    return []
+                self.__pending_timer = None
+                self.__is_timer_late = is_late
+                self.__timers[self.__state]()
+            case TimerFired():
+                return []
+            case TextLines(lines=lines, seconds_per_line=seconds) if (
+                self.__pending_timer is None and self.__state is RoundState.ROLLING_TEXT
+            ):
+                self.__rolling_lines = iter(lines)
+                self.__rolling_seconds = seconds
+                self._roll_next_line()
+            case _:
+                raise ValueError(f"unexpected {event!r} in state {self.__state.name}")
+        return self._drain()
+
+    # === Plumbing ===
+
+    def _drain(self) -> list[RoundOutputEvent]:
+        events, self.__outbox = self.__outbox, []
+        return events
+
+    def _show(self, key: UIKeys, **kwargs) -> None:
+        self.__outbox.append(ShowMessage(key, kwargs))
+
+    def _show_balance(self) -> None:
+        self._show(UIKeys.SHOW_PLAYER_BALANCE, balance=self.game.player_balance)
+
+    def _enter(self, state: RoundState, prompt_key: UIKeys, **kwargs) -> None:
+        self.__state = state
+        self.__outbox.append(RequestInput(prompt_key, kwargs))
+
+    def _enter_menu(self, state: RoundState) -> None:
+        self._enter(state, self.MENU_PROMPTS[state])
+
+    def _schedule(self, state: RoundState, seconds: float) -> None:
+        self.__state = state
+        self.__last_timer_id += 1
+        self.__pending_timer = ScheduleTimer(self.__last_timer_id, seconds)
+        self.__outbox.append(self.__pending_timer)
+
+    def _host_action(self, action: HostAction) -> None:
+        """
+        Hand an action over to the host, then ask the same menu again.
+        """
+        self.__outbox.append(RequestHostAction(action))
+        self._enter_menu(self.__state)
+
+    def _read_rules(self) -> None:
+        # The host owns the texts of every locale, it answers with TextLines
+        self.__rolling_return_state = self.__state
+        self.__state = RoundState.ROLLING_TEXT
+        self.__outbox.append(RequestHostAction(HostAction.READ_RULES))
+
+    def _roll_next_line(self) -> None:
+        line = next(self.__rolling_lines, None)
+        if line is None:
+            self._enter_menu(self.__rolling_return_state)
+            return
+        self.__outbox.append(ShowText(line))
+        self._schedule(RoundState.ROLLING_TEXT, self.__rolling_seconds)
+
+    def _on_rolling_text(self) -> None:
+        # The player suspended the program (Ctrl+Z) while reading,
+        # for a better reading experience, the rest is skipped
+        if self.__is_timer_late:
+            self.__rolling_lines = iter(())
+        self._roll_next_line()
+
+    def _exit(self) -> None:
+        self.__state = RoundState.FINISHED
+        self.__outbox.append(RequestHostAction(HostAction.EXIT))
+
+    def _insufficient_balance(self) -> None:
+        self._show(UIKeys.INSUFFICIENT_BALANCE_PROMPT, limit=self.game.GAME_ENDING_CONDITION)
+        #TODO: Add a refill feature when player balance is insufficient
+        self._exit() # temporary solution
+
+    def _on_menu_choice(self, user_choice: str) -> None:
+        options = self.__menus[self.__state]
+        if user_choice not in options:
+            self._show(UIKeys.USER_CHOICE_NOT_IN_OPTIONS_PROMPT)
+            self._enter_menu(self.__state)
+            return
+        options[user_choice]()
+
+    def _parse_bet(self, text: str, min_bet: int, max_bet: int) -> int | None:
+        """
+        Returns:
+            int | None: The bet amount, None if the input is invalid,
+                the error is shown unless the player ran out of tries.
+        """
+        try:
+            bet_amount = int(text)
+            if not (min_bet <= bet_amount <= max_bet):
+                raise IntInputNotInLegalRangeError
+
+        except (ValueError, IntInputNotInLegalRangeError) as e:
+            self.__tries += 1
+            if self.__tries >= self.config['user_max_tries']:
+                return None
+            if isinstance(e, ValueError):
+                self._show(UIKeys.MUST_TYPE_INTEGER_ERROR_PROMPT)
+            else:
+                self._show(UIKeys.INT_INPUT_NOT_IN_LEGAL_RANGE_ERROR_PROMPT, min=min_bet, max=max_bet)
+            return None
+
+        return bet_amount
+
+    @property
+    def _is_out_of_tries(self) -> bool:
+        return self.__tries >= self.config['user_max_tries']
+
+    # === Round flow ===
+
+    def _begin_round(self) -> None:
+        self.__outbox.append(RoundBoundary())
+        self._enter_menu(RoundState.MAIN_MENU)
+
+    def _cheat(self) -> None:
+        """
+        It's a cheat function for testing purpose.
+        1. Check if player already cheated
+        2. If not, set player balance to cheat amount
+        3. Notify user
+        """
+        if self.__has_cheated:
+            self._show(UIKeys.PLAYER_ALREADY_CHEATED)
+        elif self.game.player_balance >= self.config['cheat_amount']:
+            self._show(UIKeys.PLAYER_BALANCE_ALREADY_HIGH_ENOUGH)
+        else:
+            self.game.add_player_balance(self.config['cheat_amount'] - self.game.player_balance)
+            self._show(UIKeys.PLAYER_CHEATED)
+            self._show_balance()
+            self.__has_cheated = True
+        self._enter_menu(RoundState.MAIN_MENU)
+
+    def _first_round(self) -> None:
+        if not self.game.has_sufficient_balance:
+            self._insufficient_balance()
+            return
+
+        self._show_balance()
+        self.__tries = 0
+        self._enter(
+            RoundState.ANTE_BET,
+            UIKeys.PLACE_ANTE_PROMPT,
+            min=self.game.MIN_ANTE_BET,
+            max=self.game.max_ante_bet
+        )
+
+    def _on_ante_bet(self, text: str) -> None:
+        min_bet, max_bet = self.game.MIN_ANTE_BET, self.game.max_ante_bet
+        bet_amount = self._parse_bet(text, min_bet, max_bet)
+
+        if bet_amount is None:
+            if self._is_out_of_tries: # The user input invalid multiple times, return to main menu
+                self._show(UIKeys.TOO_MANY_ANTE_TRIES_PROMPT)
+                self._enter_menu(RoundState.MAIN_MENU)
+            else:
+                self._enter(RoundState.ANTE_BET, UIKeys.PLACE_ANTE_PROMPT, min=min_bet, max=max_bet)
+            return
+
+        self._show(UIKeys.HAS_PLACED_ANTE_PROMPT, amount=bet_amount)
+        self.__balance_before_round = self.game.player_balance
+        self.game.place_ante_bet(bet_amount)
+        self._show_balance()
+
+        # Pair Plus betting round
+        if self.skip_pair_plus: # Insufficient balance for minimum Pair Plus bet, so we skip it
+            self._show(UIKeys.SKIP_PAIR_PLUS_PROMPT)
+            self._progressive_round()
+        else:
+            self._enter_menu(RoundState.PAIR_PLUS_MENU)
+
+    def _pair_plus_round(self) -> None:
+        self.__tries = 0
+        self._enter(
+            RoundState.PAIR_PLUS_BET,
+            UIKeys.PLACE_PAIR_PLUS_PROMPT,
+            min=self.game.MIN_PAIR_PLUS_BET,
+            max=self.game.max_pair_plus_bet
+        )
+
+    def _on_pair_plus_bet(self, text: str) -> None:
+        min_bet, max_bet = self.game.MIN_PAIR_PLUS_BET, self.game.max_pair_plus_bet
+        bet_amount = self._parse_bet(text, min_bet, max_bet)
+
+        if bet_amount is None:
+            if self._is_out_of_tries: # The user input invalid multiple times, skip pair plus betting
+                self._show(UIKeys.TOO_MANY_PAIR_PLUS_TRIES_PROMPT)
+                self._progressive_round()
+            else:
+                self._enter(RoundState.PAIR_PLUS_BET, UIKeys.PLACE_PAIR_PLUS_PROMPT, min=min_bet, max=max_bet)
+            return
+
+        self._show(UIKeys.HAS_PLACED_PAIR_PLUS_PROMPT, amount=bet_amount)
+        self.game.place_pair_plus_bet(bet_amount)
+        self._show_balance()
+        self._progressive_round()
+
+    def _no_pair_plus(self) -> None:
+        self._show(UIKeys.NO_PAIR_PLUS_PROMPT)
+        self._progressive_round()
+
+    def _progressive_round(self) -> None:
+        # Offered only by tables sharing a jackpot pool, and if the play bet stays covered
+        if not self.game.is_progressive_available:
+            self._six_card_bonus_round()
+            return
+        self._show(
+            UIKeys.PROGRESSIVE_JACKPOT_MESSAGE,
+            jackpot=self.game.progressive_jackpot,
+            bet=self.game.jackpot_pool.bet
+        )
+        self._enter_menu(RoundState.PROGRESSIVE_MENU)
+
+    def _place_progressive(self) -> None:
+        self.game.place_progressive_bet()
+        self._show(UIKeys.HAS_PLACED_PROGRESSIVE_PROMPT, amount=self.game.progressive_bet)
+        self._show_balance()
+        self._six_card_bonus_round()
+
+    def _no_progressive(self) -> None:
+        self._show(UIKeys.NO_PROGRESSIVE_PROMPT)
+        self._six_card_bonus_round()
+
+    def _six_card_bonus_round(self) -> None:
+        if not self.game.is_six_card_bonus_available:
+            self._second_round()
+            return
+        self._show(UIKeys.SIX_CARD_BONUS_OFFER_MESSAGE, bet=self.game.six_card_bonus.bet)
+        self._enter_menu(RoundState.SIX_CARD_BONUS_MENU)
+
+    def _place_six_card_bonus(self) -> None:
+        self.game.place_six_card_bonus_bet()
+        self._show(UIKeys.HAS_PLACED_SIX_CARD_BONUS_PROMPT, amount=self.game.six_card_bonus_bet)
+        self._show_balance()
+        self._second_round()
+
+    def _no_six_card_bonus(self) -> None:
+        self._show(UIKeys.NO_SIX_CARD_BONUS_PROMPT)
+        self._second_round()
+
+    def _second_round(self) -> None:
+        self.game.shuffle_deck()
+        self.__draws = 0
+        self._enter(RoundState.DRAW_PROMPT, UIKeys.DRAW_CARD_PROMPT)
+
+    def _on_draw_prompt(self, text: str) -> None:
+        self._schedule(RoundState.PLAYER_DRAW, self.config['draw_card_delay_seconds'])
+
+    def _on_player_draw(self) -> None:
+        drawn_card = self.game.draw_card_for_player()
+        self._show(UIKeys.PLAYER_DREW_CARD_MESSAGE, card=drawn_card)
+        self._schedule(RoundState.DEALER_DRAW, self.config['draw_card_delay_seconds'])
+
+    def _on_dealer_draw(self) -> None:
+        drawn_card = self.game.draw_card_for_dealer()
+
+        # The dealer upcard variant: the first dealer card is shown before the play/fold decision
+        if self.__draws == 0 and self.config['is_dealer_upcard_revealed']:
+            self._show(UIKeys.DEALER_REVEALED_UPCARD_MESSAGE, card=drawn_card)
+        else:
+            self._show(UIKeys.DEALER_DREW_CARD_MESSAGE)
+
+        self.__draws += 1
+        if self.__draws < self.THREE_TIMES:
+            self._enter(RoundState.DRAW_PROMPT, UIKeys.DRAW_CARD_PROMPT)
+            return
+
+        self.game.sort_hands()
+        self._show(UIKeys.SHOW_PLAYER_HAND, hand=self.game.player_hand)
+        self._enter_menu(RoundState.PLAY_MENU)
+
+    def _compare_hand_and_settle(self) -> None:
+        self.game.place_play_bet() # Place play bet
+
+        self._show(UIKeys.PLACE_PLAY_BET_PROMPT, amount=self.game.play_bet)
+        self._show_balance()
+        self._show(UIKeys.SHOW_PLAYER_HAND, hand=self.game.player_hand)
+
+        self._schedule(RoundState.REVEAL_DEALER_HAND, self.config['reveal_dealer_hand_delay_seconds'])
+
+    def _on_reveal_dealer_hand(self) -> None:
+        self._show(UIKeys.SHOW_DEALER_HAND, hand=self.game.dealer_hand)
+
+        settle_res = self.game.settle()
+        if self.history is not None:
+            self.history.record_settlement(
+                settle_res['player_hand_rank_value'],
+                settle_res['is_dealer_qualified'],
+                settle_res['outcome'],
+                settle_res['ante_bonus_payout'],
+                settle_res['had_pair_plus_bet'],
+                settle_res['pair_plus_payout'],
+                settle_res['winnings'],
+                self.game.player_balance - self.__balance_before_round
+            )
+
+        if settle_res['ante_bonus_payout'] > 0:
+            self._show(UIKeys.WIN_ANTE_BONUS_PROMPT, amount=settle_res['ante_bonus_payout'])
+
+        if settle_res['had_pair_plus_bet'] and settle_res['pair_plus_payout'] > 0:
+            self._show(UIKeys.WIN_PAIR_PLUS_PROMPT, amount=settle_res['pair_plus_payout'])
+        elif settle_res['had_pair_plus_bet']:
+            self._show(UIKeys.HAD_PAIR_PLUS_BET_BUT_NO_PAIR_PLUS)
+
+        self._show_card_side_bets(settle_res)
+
+        match settle_res['outcome']:
+
+            case 'lose':
+                self._show(UIKeys.LOSE)
+
+            case 'push':
+                self._show(UIKeys.PUSH)
+
+            case 'win':
+
+                if not settle_res['is_dealer_qualified']:
+                    self._show(UIKeys.DEALER_NOT_QUALIFIED)
+
+                self._show(UIKeys.WIN, amount=settle_res['winnings'])
+
+        self._show_balance()
+        self._end_round()
+
+    def _show_card_side_bets(self, settle_res: dict) -> None:
+        # The side bets settled on the cards alone, shown after a showdown and after a fold
+        if settle_res['progressive_payout'] > 0:
+            self._show(UIKeys.WIN_PROGRESSIVE_PROMPT, amount=settle_res['progressive_payout'])
+
+        if settle_res['six_card_bonus_payout'] > 0:
+            self._show(UIKeys.WIN_SIX_CARD_BONUS_PROMPT, amount=settle_res['six_card_bonus_payout'])
+        elif settle_res['had_six_card_bonus_bet']:
+            self._show(UIKeys.HAD_SIX_CARD_BONUS_BET_BUT_NO_BONUS)
+
+    def _fold(self) -> None:
+        self._schedule(RoundState.FOLDING, self.config['fold_delay_seconds'])
+
+    def _on_fold(self) -> None:
+        # The ante and pair plus are lost, the progressive and Six Card Bonus still pay
+        fold_res = self.game.settle_fold()
+        if self.history is not None:
+            self.history.record_fold(
+                fold_res['player_hand_rank_value'],
+                self.game.player_balance - self.__balance_before_round
+            )
+        self._show(UIKeys.FOLD)
+        if fold_res['had_six_card_bonus_bet']:
+            # The bonus is paid on the dealer's cards too
+            self._show(UIKeys.SHOW_DEALER_HAND, hand=self.game.dealer_hand)
+        self._show_card_side_bets(fold_res)
+        self._show_balance()
+        self._end_round()
+
+    def _end_round(self) -> None:
+        # This method will never raise any error, call 100 times if you are paranoid
+        self.game.reset_game_state()
+        self._enter_menu(RoundState.ANOTHER_GAME_MENU)
+
+    def _another_game(self) -> None:
+        if not self.game.has_sufficient_balance:
+            self._insufficient_balance()
+            return
+        self._begin_round()
+
+    def _switch_rules(self) -> None:
+        self.__outbox.append(RequestHostAction(HostAction.SWITCH_RULES))
+        self._begin_round()
@@ -0,0 +1,6 @@
+from src.core.strategies.flat_bet_strategy import FlatBetStrategy
+
+class AlwaysPlayStrategy(FlatBetStrategy):
+    """
+    Never folds. The baseline every other strategy is measured against.
+    """
@@ -0,0 +1,56 @@
+from src.core.interfaces.strategy_protocols import Strategy
+from src.core.strategies.q64_strategy import Q64Strategy
+from src.models.card import Card
+
+class BetProgressionStrategy(Strategy):
+    """
+    A negative progression (Martingale style) on the ante bet:
+    the ante is multiplied after every losing round, and falls back to the base unit
+    after a winning round or after max_steps losses in a row.
+    Play/fold decisions are delegated to another strategy, Q-6-4 by default.
+    
+    Attributes:
+        base_unit (int | None): Ante bet after a win, None for the table minimum.
+        multiplier (int): Ante multiplier per lost round.
+        max_steps (int): Longest losing streak the progression follows.
+        pair_plus_bet (int): Flat pair plus bet per round, 0 to never bet pair plus.
+        play_strategy (Strategy): Strategy taking the play/fold decisions.
+    """
+    def __init__(
+        self,
+        base_unit: int | None = None,
+        multiplier: int = 2,
+        max_steps: int = 5,
+        pair_plus_bet: int = 0,
+        play_strategy: Strategy | None = None
+        ):
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1.")
+        
+        self.base_unit = base_unit
+        self.multiplier = multiplier
+        self.max_steps = max_steps
+        self.pair_plus_bet = pair_plus_bet
+        self.play_strategy = play_strategy if play_strategy is not None else Q64Strategy()
+        self.losing_streak = 0
+
+    def choose_ante_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        base = min_bet if self.base_unit is None else self.base_unit
+        ante = base * self.multiplier ** self.losing_streak
+        return max(min_bet, min(ante, max_bet))
+
+    def choose_pair_plus_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        if self.pair_plus_bet <= 0:
+            return 0
+        return max(min_bet, min(self.pair_plus_bet, max_bet))
+
+    def should_play(self, hand: list[Card]) -> bool:
+        return self.play_strategy.should_play(hand)
+
+    def observe_result(self, net_win: int) -> None:
+        if net_win < 0 and self.losing_streak < self.max_steps:
+            self.losing_streak += 1
+        elif net_win < 0:
+            self.losing_streak = 0 # Streak too long, cut the losses
+        elif net_win > 0:
+            self.losing_streak = 0
@@ -0,0 +1,31 @@
+from src.core.interfaces.strategy_protocols import Strategy
+from src.models.card import Card
+
+class FlatBetStrategy(Strategy):
+    """
+    Bets the same amounts every round, and always plays.
+    Base class of the strategies that only differ in the play/fold decision.
+    
+    Attributes:
+        ante_bet (int | None): Ante bet per round, None for the table minimum.
+        pair_plus_bet (int): Pair plus bet per round, 0 to never bet pair plus.
+    """
+    def __init__(self, ante_bet: int | None = None, pair_plus_bet: int = 0):
+        self.ante_bet = ante_bet
+        self.pair_plus_bet = pair_plus_bet
+
+    def choose_ante_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        if self.ante_bet is None:
+            return min_bet
+        return max(min_bet, min(self.ante_bet, max_bet))
+
+    def choose_pair_plus_bet(self, min_bet: int, max_bet: int, balance: int) -> int:
+        if self.pair_plus_bet <= 0:
+            return 0
+        return max(min_bet, min(self.pair_plus_bet, max_bet))
+
+    def should_play(self, hand: list[Card]) -> bool:
+        return True
+
+    def observe_result(self, net_win: int) -> None:
+        pass
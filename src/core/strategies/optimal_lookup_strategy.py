@@ -0,0 +1,58 @@
+from src.core.strategies.flat_bet_strategy import FlatBetStrategy
+from src.core.strategies.q64_strategy import Q64Strategy
+from src.models.card import Card
+from src.models.cardspec import VALUES
+
+# 4 bits per card value and 1 flush bit
+DECISION_TABLE_SIZE = 1 << 13
+
+def decision_key(v0: int, v1: int, v2: int, is_flush: bool) -> int:
+    return (v0 << 9) | (v1 << 5) | (v2 << 1) | is_flush
+
+def build_q64_decision_table() -> bytearray:
+    """
+    Decision of Q64Strategy for every sorted hand value triple, suited and unsuited.
+    Q-6-4 is the optimal play/fold rule for the default pay tables.
+    """
+    q64 = Q64Strategy()
+    # Any card with the right value will do, only values and "same suit or not" matter
+    suited = {value: Card('♠', str(value), value) for value in VALUES}
+    offsuit = {value: Card('♥', str(value), value) for value in VALUES}
+    
+    table = bytearray(DECISION_TABLE_SIZE)
+    for v0 in VALUES:
+        for v1 in VALUES[:v0 - 1]:
+            for v2 in VALUES[:v1 - 1]:
+                table[decision_key(v0, v1, v2, True)] = q64.should_play(
+                    [suited[v0], suited[v1], suited[v2]]
+                )
+                table[decision_key(v0, v1, v2, False)] = q64.should_play(
+                    [suited[v0], offsuit[v1], suited[v2]]
+                )
+    return table
+
+class OptimalLookupStrategy(FlatBetStrategy):
+    """
+    Play/fold decisions from a precomputed table indexed by the packed hand values,
+    one bit shift per card and one bytearray lookup per decision.
+    
+    Attributes:
+        decision_table (bytearray): 1 = play, 0 = fold, indexed by decision_key.
+            Defaults to the optimal Q-6-4 rule.
+    """
+    def __init__(
+        self,
+        ante_bet: int | None = None,
+        pair_plus_bet: int = 0,
+        decision_table: bytearray | None = None
+        ):
+        super().__init__(ante_bet, pair_plus_bet)
+        self.decision_table = (
+            decision_table if decision_table is not None else build_q64_decision_table()
+        )
+
+    def should_play(self, hand: list[Card]) -> bool:
+        c0, c1, c2 = hand
+        return self.decision_table[
+            (c0.value << 9) | (c1.value << 5) | (c2.value << 1) | (c0.suit == c1.suit == c2.suit)
+        ] == 1
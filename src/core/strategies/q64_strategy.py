@@ -0,0 +1,21 @@
+from src.core.strategies.flat_bet_strategy import FlatBetStrategy
+from src.models.card import Card
+
+class Q64Strategy(FlatBetStrategy):
+    """
+    The classic "Queen-Six-Four" strategy:
+    play any pair or better, play a high card hand only if it is Q-6-4 or better.
+    """
+    def should_play(self, hand: list[Card]) -> bool:
+        
+        v0, v1, v2 = hand[0].value, hand[1].value, hand[2].value
+        
+        # Q-6-4 or better high card, this also covers every K and A high hand (incl. A-2-3)
+        if (v0, v1, v2) >= (12, 6, 4):
+            return True
+        
+        is_pair: bool = (v0 == v1) or (v1 == v2)
+        is_flush: bool = hand[0].suit == hand[1].suit == hand[2].suit
+        is_straight: bool = (v0 - 2 == v2) and not is_pair
+        
+        return is_pair or is_flush or is_straight
@@ -0,0 +1,23 @@
+"""
+Built-in strategies by name, for places where a strategy is chosen by a string
+(command lines, work units sent to other machines) instead of an object.
+"""
+from typing import Callable
+
+from src.core.interfaces.strategy_protocols import Strategy
+from src.core.strategies.always_play_strategy import AlwaysPlayStrategy
+from src.core.strategies.bet_progression_strategy import BetProgressionStrategy
+from src.core.strategies.optimal_lookup_strategy import OptimalLookupStrategy
+from src.core.strategies.q64_strategy import Q64Strategy
+
+STRATEGY_FACTORIES: dict[str, Callable[[], Strategy]] = {
+    'always_play': AlwaysPlayStrategy,
+    'q64': Q64Strategy,
+    'optimal_lookup': OptimalLookupStrategy,
+    'bet_progression': BetProgressionStrategy,
+}
+
+def create_strategy(name: str) -> Strategy:
+    if name not in STRATEGY_FACTORIES:
+        raise ValueError(f"Unknown strategy '{name}', choose from {', '.join(STRATEGY_FACTORIES)}.")
+    return STRATEGY_FACTORIES[name]()
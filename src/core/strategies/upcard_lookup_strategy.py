@@ -0,0 +1,35 @@
+from collections.abc import Mapping
+
+from src.core.interfaces.evaluator_protocols import GameEvaluator
+from src.core.strategies.q64_strategy import Q64Strategy
+from src.core.upcard_ev_table import get_upcard_ev_table
+from src.models.card import Card
+from src.models.card_index import CARD_INDEX, DECK_SIZE
+from src.models.hand_canonicalization import canonicalize, permute_suits
+
+class UpcardLookupStrategy(Q64Strategy):
+    """
+    The optimal play/fold decision when the dealer upcard is revealed, one table lookup
+    per decision (see upcard_ev_table.py). Plays Q-6-4 when the upcard is not revealed.
+    
+    Attributes:
+        decision_table (bytearray): See UpcardEvTable.decision_table.
+    """
+    def __init__(
+        self,
+        evaluator: GameEvaluator,
+        ante_bonus_table: Mapping[int, int],
+        ante_bet: int | None = None,
+        pair_plus_bet: int = 0
+        ):
+        """
+        Args:
+            evaluator (GameEvaluator): The evaluator of the game rule played.
+            ante_bonus_table (Mapping[int, int]): Ante bonus payout rates of the game rule.
+        """
+        super().__init__(ante_bet, pair_plus_bet)
+        self.decision_table = get_upcard_ev_table(evaluator).decision_table(ante_bonus_table)
+
+    def should_play_seeing_upcard(self, hand: list[Card], upcard: Card) -> bool:
+        class_id, permutation = canonicalize(hand)
+        return self.decision_table[class_id * DECK_SIZE + permute_suits(CARD_INDEX[upcard], permutation)] == 1
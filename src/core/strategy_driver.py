@@ -0,0 +1,117 @@
+from src.core.game_engine import GameEngine
+from src.core.interfaces.settle_sink_protocols import SettleSink
+from src.core.interfaces.strategy_protocols import Strategy, UpcardStrategy
+from src.enums.hand_rank import HandRank
+
+class StrategyDriver:
+    """
+    Plays a Strategy directly against a GameEngine: no view, no prompts, no string parsing.
+    Follows the same round flow as RoundStateMachine:
+    ante -> pair plus -> deal -> play/fold -> settle -> reset.
+    
+    Attributes:
+        game (GameEngine): The engine to play on, the driver owns its round flow.
+        strategy (Strategy): The bot taking the decisions.
+        rounds_played (int): Rounds played so far.
+        total_net_win (int): Sum of the net wins of all rounds played so far.
+        sink (SettleSink | None): If given, every round is recorded into the sink
+            instead of building a settlement dict, last_settlement stays None
+            and last_player_hand_rank is not tracked.
+        last_settlement (dict | None): What GameEngine.settle returned in the last round,
+            None if the strategy folded.
+        last_player_hand_rank (HandRank | None): Rank of the player's hand in the last round.
+        is_dealer_upcard_revealed (bool): The dealer upcard variant: the strategy, then an
+            UpcardStrategy, sees the dealer's first card before the play/fold decision.
+    """
+    def __init__(
+        self,
+        game: GameEngine,
+        strategy: Strategy | UpcardStrategy,
+        sink: SettleSink | None = None,
+        is_dealer_upcard_revealed: bool = False
+        ):
+        self.game = game
+        self.strategy = strategy
+        self.sink = sink
+        self.is_dealer_upcard_revealed = is_dealer_upcard_revealed
+        self.rounds_played = 0
+        self.total_net_win = 0
+        self.last_settlement: dict[str, bool | int] | None = None
+        self.last_player_hand_rank: HandRank | None = None
+
+    def play_round(self) -> int | None:
+        """
+        Play a single round.
+        Returns:
+            int | None: The net win of the round, None if the balance is insufficient to play.
+        """
+        game = self.game
+        strategy = self.strategy
+        
+        if not game.has_sufficient_balance:
+            return None
+        balance_before = game.player_balance
+        
+        game.place_ante_bet(
+            strategy.choose_ante_bet(game.MIN_ANTE_BET, game.max_ante_bet, balance_before)
+        )
+        
+        min_pair_plus_bet = game.MIN_PAIR_PLUS_BET
+        max_pair_plus_bet = game.max_pair_plus_bet
+        if min_pair_plus_bet <= max_pair_plus_bet:
+            pair_plus_bet = strategy.choose_pair_plus_bet(
+                min_pair_plus_bet, max_pair_plus_bet, game.player_balance
+            )
+            if pair_plus_bet > 0:
+                game.place_pair_plus_bet(pair_plus_bet)
+        
+        game.shuffle_deck()
+        # DO NOT TOUCH THIS CONST, see RoundStateMachine.THREE_TIMES
+        for _ in range(3):
+            game.draw_card_for_player()
+            game.draw_card_for_dealer()
+        game.sort_hands()
+        
+        if self.is_dealer_upcard_revealed:
+            is_playing = strategy.should_play_seeing_upcard(game.player_sorted_hand, game.dealer_upcard)
+        else:
+            is_playing = strategy.should_play(game.player_sorted_hand)
+        
+        sink = self.sink
+        if sink is not None:
+            if is_playing:
+                game.place_play_bet()
+                game.settle(sink)
+            else:
+                sink.record_fold(game.player_hand_rank, game.player_balance - balance_before)
+        elif is_playing:
+            game.place_play_bet()
+            settlement = game.settle()
+            self.last_settlement = settlement
+            self.last_player_hand_rank = settlement['player_hand_rank_value']
+        else:
+            # Folding forfeits the ante and pair plus like RoundStateMachine._on_fold,
+            # strategies place no progressive or Six Card Bonus bet that would still pay
+            self.last_settlement = None
+            self.last_player_hand_rank = game.player_hand_rank
+        
+        game.reset_game_state()
+        
+        net_win = game.player_balance - balance_before
+        strategy.observe_result(net_win)
+        
+        self.rounds_played += 1
+        self.total_net_win += net_win
+        return net_win
+
+    def run(self, rounds: int) -> int:
+        """
+        Play up to `rounds` rounds, stops early once the balance is insufficient.
+        Returns:
+            int: The number of rounds actually played.
+        """
+        play_round = self.play_round
+        for played in range(rounds):
+            if play_round() is None:
+                return played
+        return rounds
@@ -0,0 +1,304 @@
+"""
+Exact outcomes of a player hand once one dealer card is revealed (the dealer upcard variant).
+
+For every player hand and every upcard among the 49 remaining cards, the table counts how
+the 1,128 possible completions of the dealer hand (2 cards of the other 48) end: player wins
+against a dealer who does not qualify (the play bet pushes), player wins against a qualified
+dealer, tie, player loses. Like the win probability table, the counts depend only on the
+evaluator: pay tables are applied at lookup, so config changes need no rebuild.
+
+Player hands are stored by suit-isomorphic class (see hand_canonicalization.py), the upcard
+renamed with the suit permutation that maps the hand onto its class representative:
+1,755 classes x 52 upcards x 3 uint16 counts, about half a megabyte. The table is built
+on first use (a few seconds), stored under the cache dir and mapped into memory on every
+later start, in every process.
+
+Per unit of ante, playing is worth ante bonus rate + (win_unqualified + 2 win_qualified
+- 2 lose) / 1,128, folding is worth -1, so play / fold decisions and the house edge
+of the variant are exact integer arithmetic.
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from fractions import Fraction
+from itertools import combinations
+from pathlib import Path
+
+from src.core.interfaces.evaluator_protocols import GameEvaluator
+from src.core.win_probability_table import evaluator_identity
+from src.models.card import Card
+from src.models.card_index import CARD_INDEX, DECK_CARDS, DECK_SIZE
+from src.models.hand_canonicalization import (
+    HAND_COUNT,
+    canonicalize,
+    get_canonical_tables,
+    hand_index,
+    permute_suits,
+)
+from src.services.utils.get_file_path import CACHE_DIR
+
+# Dealer completions once the player holds 3 cards and the upcard is known: C(48, 2)
+COMPLETION_COUNT = 1_128
+
+# magic, format version, class count
+TABLE_HEADER = struct.Struct('<4sII')
+TABLE_MAGIC = b'TCUE'
+TABLE_FORMAT_VERSION = 1
+
+# Counts per (class, upcard), in this order. Ties are the rest of COMPLETION_COUNT
+WIN_UNQUALIFIED, WIN_QUALIFIED, LOSE = 0, 1, 2
+COUNTS_PER_UPCARD = 3
+
+
+def build_upcard_counts(evaluator: GameEvaluator) -> array:
+    """
+    Count the outcomes of every class representative against every dealer completion,
+    upcard by upcard.
+    Returns:
+        array: 'H' array of class_count * DECK_SIZE * 3 counts, see the module docstring.
+            The entries of upcards held by the representative are zero.
+    """
+    # Positions in all lists below are hand indices
+    hands: list[tuple[int, int, int]] = [(0, 0, 0)] * HAND_COUNT
+    for hand in combinations(range(DECK_SIZE), 3):
+        hands[hand_index(*hand)] = hand
+    strength: list[int] = []
+    is_qualified: list[bool] = []
+    for hand in hands:
+        cards = sorted((DECK_CARDS[index] for index in hand), key=lambda card: card.value, reverse=True)
+        hand_values, is_flush = evaluator.get_virtual_hand(cards)
+        rank = evaluator.evaluate_hand_rank(hand_values, is_flush)
+        strength.append(evaluator.hand_strength(rank, hand_values))
+        is_qualified.append(evaluator.is_dealer_qualified(rank, hand_values[0]))
+
+    # For every card, the sorted strengths of the qualified hands holding it,
+    # and how many hands holding it do not qualify
+    qualified_strengths: list[list[int]] = [[] for _ in range(DECK_SIZE)]
+    unqualified_count = [0] * DECK_SIZE
+    hands_with_card: list[list[int]] = [[] for _ in range(DECK_SIZE)]
+    for hand_id, hand in enumerate(hands):
+        for card in hand:
+            hands_with_card[card].append(hand_id)
+            if is_qualified[hand_id]:
+                qualified_strengths[card].append(strength[hand_id])
+            else:
+                unqualified_count[card] += 1
+    for strengths in qualified_strengths:
+        strengths.sort()
+
+    tables = get_canonical_tables()
+    counts = array('H', bytes(2 * tables.class_count * DECK_SIZE * COUNTS_PER_UPCARD))
+    for class_id, representative in enumerate(tables.representatives):
+        player_strength = strength[hand_index(*representative)]
+
+        # Take out the dealer hands holding a player card, from the counts of each other card they hold
+        blocked = set(hands_with_card[representative[0]])
+        blocked.update(hands_with_card[representative[1]])
+        blocked.update(hands_with_card[representative[2]])
+        blocked_unqualified = [0] * DECK_SIZE
+        blocked_lose = [0] * DECK_SIZE
+        blocked_tie = [0] * DECK_SIZE
+        for hand_id in blocked:
+            for card in hands[hand_id]:
+                if card in representative:
+                    continue
+                if not is_qualified[hand_id]:
+                    blocked_unqualified[card] += 1
+                elif strength[hand_id] > player_strength:
+                    blocked_lose[card] += 1
+                elif strength[hand_id] == player_strength:
+                    blocked_tie[card] += 1
+
+        for upcard in range(DECK_SIZE):
+            if upcard in representative:
+                continue
+            strengths = qualified_strengths[upcard]
+            below = bisect_left(strengths, player_strength)
+            at_or_below = bisect_right(strengths, player_strength)
+            lose = len(strengths) - at_or_below - blocked_lose[upcard]
+            tie = at_or_below - below - blocked_tie[upcard]
+            win_unqualified = unqualified_count[upcard] - blocked_unqualified[upcard]
+
+            offset = (class_id * DECK_SIZE + upcard) * COUNTS_PER_UPCARD
+            counts[offset + WIN_UNQUALIFIED] = win_unqualified
+            counts[offset + WIN_QUALIFIED] = COMPLETION_COUNT - win_unqualified - tie - lose
+            counts[offset + LOSE] = lose
+    return counts
+
+
+def _play_units(counts: tuple[int, int, int, int], ante_bonus_rate: int) -> int:
+    # Expected net win of playing, in 1 / COMPLETION_COUNT of the ante
+    win_unqualified, win_qualified, _, lose = counts
+    return ante_bonus_rate * COMPLETION_COUNT + win_unqualified + 2 * win_qualified - 2 * lose
+
+
+class UpcardEvTable:
+    """
+    Read-only outcome counts by (player hand, dealer upcard), backed by a memory map
+    of the table file, or by an in-memory array if the file could not be written.
+
+    Pay tables are ante bonus payout rates by hand rank, like
+    GameEngine.ANTE_BONUS_PAYOUT_RATE_TABLE. Decisions ignore the pair plus bet:
+    it only makes playing better, folding forfeits it.
+
+    Attributes:
+        evaluator (GameEvaluator): The evaluator the table was built from, ranks the player hands.
+        evaluator_id (str): evaluator_identity of the evaluator.
+    """
+    def __init__(self, evaluator: GameEvaluator, counts: memoryview | array, mapped: mmap.mmap | None = None):
+        self.evaluator = evaluator
+        self.evaluator_id = evaluator_identity(evaluator)
+        self.__counts = counts
+        self.__mapped = mapped
+
+    def _counts_at(self, class_id: int, upcard: int) -> tuple[int, int, int, int]:
+        offset = (class_id * DECK_SIZE + upcard) * COUNTS_PER_UPCARD
+        counts = self.__counts
+        win_unqualified, win_qualified, lose = counts[offset], counts[offset + 1], counts[offset + 2]
+        return win_unqualified, win_qualified, COMPLETION_COUNT - win_unqualified - win_qualified - lose, lose
+
+    def counts(self, hand: list[Card], upcard: Card) -> tuple[int, int, int, int]:
+        """
+        Args:
+            hand (list[Card]): Three distinct cards of a single deck, in any order.
+            upcard (Card): The revealed dealer card, not one of the hand.
+        Returns:
+            tuple[int, int, int, int]: How many of the 1,128 dealer completions the hand beats
+                while the dealer does not qualify, beats while the dealer qualifies, ties, loses to.
+        """
+        class_id, permutation = canonicalize(hand)
+        return self._counts_at(class_id, permute_suits(CARD_INDEX[upcard], permutation))
+
+    def _ante_bonus_rate(self, hand: list[Card], ante_bonus_table: Mapping[int, int]) -> int:
+        evaluator = self.evaluator
+        cards = sorted(hand, key=lambda card: card.value, reverse=True)
+        return ante_bonus_table[evaluator.evaluate_hand_rank(*evaluator.get_virtual_hand(cards))]
+
+    def play_ev(self, hand: list[Card], upcard: Card, ante_bonus_table: Mapping[int, int]) -> Fraction:
+        """
+        Returns:
+            Fraction: Expected net win of playing, per unit of ante. Folding is worth -1.
+        """
+        units = _play_units(self.counts(hand, upcard), self._ante_bonus_rate(hand, ante_bonus_table))
+        return Fraction(units, COMPLETION_COUNT)
+
+    def should_play(self, hand: list[Card], upcard: Card, ante_bonus_table: Mapping[int, int]) -> bool:
+        """
+        Returns:
+            bool: True if playing is worth at least as much as folding.
+        """
+        units = _play_units(self.counts(hand, upcard), self._ante_bonus_rate(hand, ante_bonus_table))
+        return units >= -COMPLETION_COUNT
+
+    def decision_table(self, ante_bonus_table: Mapping[int, int]) -> bytearray:
+        """
+        The optimal decision of every (class, upcard), for decisions without any arithmetic.
+        Returns:
+            bytearray: 1 = play, 0 = fold, indexed by class_id * DECK_SIZE + the upcard
+                renamed like the hand (see canonicalize).
+        """
+        tables = get_canonical_tables()
+        decisions = bytearray(tables.class_count * DECK_SIZE)
+        for class_id, representative in enumerate(tables.representatives):
+            rate = self._ante_bonus_rate([DECK_CARDS[index] for index in representative], ante_bonus_table)
+            for upcard in range(DECK_SIZE):
+                if upcard not in representative:
+                    decisions[class_id * DECK_SIZE + upcard] = (
+                        _play_units(self._counts_at(class_id, upcard), rate) >= -COMPLETION_COUNT
+                    )
+        return decisions
+
+    def house_edge(self, ante_bonus_table: Mapping[int, int]) -> Fraction:
+        """
+        The exact house edge of the ante / play wager when the upcard is revealed
+        and every decision is optimal: minus the expected net win per unit of ante,
+        over every player hand and upcard of a single deck.
+        """
+        tables = get_canonical_tables()
+        total = 0
+        for class_id, representative in enumerate(tables.representatives):
+            rate = self._ante_bonus_rate([DECK_CARDS[index] for index in representative], ante_bonus_table)
+            best = 0
+            for upcard in range(DECK_SIZE):
+                if upcard not in representative:
+                    best += max(_play_units(self._counts_at(class_id, upcard), rate), -COMPLETION_COUNT)
+            total += tables.weights[class_id] * best
+        return -Fraction(total, HAND_COUNT * (DECK_SIZE - 3) * COMPLETION_COUNT)
+
+    def close(self) -> None:
+        if self.__mapped is not None:
+            self.__counts.release()
+            self.__mapped.close()
+
+
+def get_table_path(evaluator: GameEvaluator, cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f'upcard_table_{evaluator_identity(evaluator)}.bin'
+
+
+def _write_table_file(table_path: Path, counts: array) -> bool:
+    """
+    Atomically write the table file, returns False if the cache dir is not writable.
+    """
+    tmp_path = table_path.with_name(f'{table_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, mode='wb') as table_file:
+            table_file.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_FORMAT_VERSION, get_canonical_tables().class_count))
+            table_file.write(counts.tobytes())
+        os.replace(tmp_path, table_path)
+        return True
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def _map_table_file(table_path: Path) -> tuple[mmap.mmap, memoryview] | None:
+    """
+    Map a table file into memory, None if it is missing or not a valid table.
+    """
+    class_count = get_canonical_tables().class_count
+    expected_size = TABLE_HEADER.size + 2 * class_count * DECK_SIZE * COUNTS_PER_UPCARD
+    try:
+        with open(table_path, mode='rb') as table_file:
+            if os.fstat(table_file.fileno()).st_size != expected_size:
+                return None
+            mapped = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    if TABLE_HEADER.unpack_from(mapped) != (TABLE_MAGIC, TABLE_FORMAT_VERSION, class_count):
+        mapped.close()
+        return None
+    return mapped, memoryview(mapped)[TABLE_HEADER.size:].cast('H')
+
+
+def load_upcard_ev_table(evaluator: GameEvaluator, cache_dir: Path = CACHE_DIR) -> UpcardEvTable:
+    """
+    Map the evaluator's table file, building and writing it first if needed.
+    """
+    table_path = get_table_path(evaluator, cache_dir)
+
+    if (loaded := _map_table_file(table_path)) is not None:
+        return UpcardEvTable(evaluator, loaded[1], loaded[0])
+
+    counts = build_upcard_counts(evaluator)
+    if _write_table_file(table_path, counts) and (loaded := _map_table_file(table_path)) is not None:
+        return UpcardEvTable(evaluator, loaded[1], loaded[0])
+    # Read-only install, keep the table in memory for this process
+    return UpcardEvTable(evaluator, counts)
+
+
+# Process wide tables, by evaluator_identity
+_tables: dict[str, UpcardEvTable] = {}
+_tables_lock = threading.Lock()
+
+def get_upcard_ev_table(evaluator: GameEvaluator) -> UpcardEvTable:
+    evaluator_id = evaluator_identity(evaluator)
+    with _tables_lock:
+        if evaluator_id not in _tables:
+            _tables[evaluator_id] = load_upcard_ev_table(evaluator)
+        return _tables[evaluator_id]
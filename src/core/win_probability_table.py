@@ -0,0 +1,254 @@
+"""
+Exact chances of a player hand against a random dealer hand.
+
+For each of the 22,100 player hands, the table counts how many of the 18,424 dealer hands
+drawn from the remaining 49 cards the hand beats, ties or loses to. Dealer qualification
+counts too: against a dealer who does not qualify, the player wins. The counts depend only
+on the evaluator, so each evaluator gets its own table. The table is built once, with
+suit-isomorphic classes, then stored under the cache dir as a small binary file
+(3 uint16 counts per hand) and mapped into memory on every later start.
+
+The counts assume a single 52-card deck, like GameEngine's default Deck.
+"""
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from functools import cache
+from itertools import combinations
+from pathlib import Path
+from types import ModuleType
+
+from src.core.interfaces.evaluator_protocols import GameEvaluator
+from src.models.card import Card
+from src.models.card_index import CARD_INDEX, DECK_CARDS, DECK_SIZE
+from src.models.hand_canonicalization import HAND_COUNT, get_canonical_tables, hand_index
+from src.services.utils.get_file_path import CACHE_DIR
+
+# Dealer hands left once the player holds 3 cards: C(49, 3)
+DEALER_HAND_COUNT = 18_424
+
+# magic, format version, hand count
+TABLE_HEADER = struct.Struct('<4sII')
+TABLE_MAGIC = b'TCWP'
+TABLE_FORMAT_VERSION = 1
+
+# Only the project's own modules go into an evaluator's identity
+SOURCE_PACKAGE = __name__.split('.')[0]
+
+# Counts per hand, in this order
+WIN, TIE, LOSE = 0, 1, 2
+
+
+def evaluator_identity(evaluator: GameEvaluator) -> str:
+    """
+    A file name friendly id of an evaluator: its class name, and a hash of the source
+    of everything its counts depend on, so editing any of it invalidates the table.
+    """
+    return _type_identity(type(evaluator))
+
+def _source_modules(evaluator_type: type) -> list[ModuleType]:
+    """
+    The modules of the evaluator's classes (its whole MRO) and of this builder, then every
+    module of the package they take names from, e.g. the evaluator a perfect-hash or
+    mapped table is built from.
+    """
+    roots = [inspect.getmodule(cls) for cls in evaluator_type.__mro__] + [sys.modules[__name__]]
+    found: dict[str, ModuleType] = {}
+    pending = [module for module in roots if module is not None]
+    while pending:
+        module = pending.pop()
+        if module.__name__ in found or module.__name__.split('.')[0] != SOURCE_PACKAGE:
+            continue
+        found[module.__name__] = module
+        for value in vars(module).values():
+            used = value if isinstance(value, ModuleType) else inspect.getmodule(value)
+            if used is not None:
+                pending.append(used)
+    return [found[name] for name in sorted(found)]
+
+@cache
+def _type_identity(evaluator_type: type) -> str:
+    digest = hashlib.sha256()
+    for module in _source_modules(evaluator_type):
+        digest.update(inspect.getsource(module).encode('UTF-8'))
+    return f'{evaluator_type.__name__}-{digest.hexdigest()[:16]}'
+
+
+def _evaluate(evaluator: GameEvaluator, cards: list[Card]) -> tuple:
+    # (rank, virtual values), what hand_strength and is_dealer_qualified need
+    hand_values, is_flush = evaluator.get_virtual_hand(cards)
+    return evaluator.evaluate_hand_rank(hand_values, is_flush), hand_values
+
+
+def _sorted_cards(hand: tuple[int, int, int]) -> list[Card]:
+    return sorted((DECK_CARDS[index] for index in hand), key=lambda card: card.value, reverse=True)
+
+
+def build_win_probability_counts(evaluator: GameEvaluator) -> array:
+    """
+    Count the outcomes of every player hand against every dealer hand.
+    Returns:
+        array: 'H' array of HAND_COUNT * 3 counts, (win, tie, lose) by hand_index.
+    """
+    # Positions in all lists below are hand indices
+    hands: list[tuple[int, int, int]] = [(0, 0, 0)] * HAND_COUNT
+    for hand in combinations(range(DECK_SIZE), 3):
+        hands[hand_index(*hand)] = hand
+    evaluated = [_evaluate(evaluator, _sorted_cards(hand)) for hand in hands]
+    strength = [evaluator.hand_strength(rank, hand_values) for rank, hand_values in evaluated]
+    is_qualified = [
+        evaluator.is_dealer_qualified(rank, hand_values[0]) for rank, hand_values in evaluated
+    ]
+
+    # Qualified dealer hands by strength, then how many are stronger than each strength
+    strength_count = max(strength) + 1
+    qualified_by_strength = [0] * strength_count
+    for hand_id, qualified in enumerate(is_qualified):
+        if qualified:
+            qualified_by_strength[strength[hand_id]] += 1
+    stronger = [0] * strength_count
+    for s in range(strength_count - 2, -1, -1):
+        stronger[s] = stronger[s + 1] + qualified_by_strength[s + 1]
+
+    # Hands holding each card, to take out the dealer hands blocked by the player's cards
+    hands_with_card: list[list[int]] = [[] for _ in range(DECK_SIZE)]
+    for hand_id, hand in enumerate(hands):
+        for card in hand:
+            hands_with_card[card].append(hand_id)
+
+    # Every hand of a suit-isomorphic class has the same counts, compute one per class
+    tables = get_canonical_tables()
+    class_counts: list[tuple[int, int, int]] = []
+    for representative in tables.representatives:
+        blocked = set(hands_with_card[representative[0]])
+        blocked.update(hands_with_card[representative[1]])
+        blocked.update(hands_with_card[representative[2]])
+
+        player_strength = strength[hand_index(*representative)]
+        lose = stronger[player_strength]
+        tie = qualified_by_strength[player_strength]
+        for hand_id in blocked:
+            if is_qualified[hand_id]:
+                if strength[hand_id] > player_strength:
+                    lose -= 1
+                elif strength[hand_id] == player_strength:
+                    tie -= 1
+        class_counts.append((DEALER_HAND_COUNT - tie - lose, tie, lose))
+
+    counts = array('H')
+    for class_id in tables.class_of_hand:
+        counts.extend(class_counts[class_id])
+    return counts
+
+
+class WinProbabilityTable:
+    """
+    Read-only (win, tie, lose) counts of every player hand, backed by a memory map
+    of the table file, or by an in-memory array if the file could not be written.
+
+    Attributes:
+        evaluator_id (str): evaluator_identity of the evaluator the table belongs to.
+    """
+    def __init__(self, evaluator_id: str, counts: memoryview | array, mapped: mmap.mmap | None = None):
+        self.evaluator_id = evaluator_id
+        self.__counts = counts
+        self.__mapped = mapped
+
+    def counts(self, hand: list[Card]) -> tuple[int, int, int]:
+        """
+        Args:
+            hand (list[Card]): Three distinct cards of a single deck, in any order.
+        Returns:
+            tuple[int, int, int]: How many of the 18,424 dealer hands the hand beats, ties, loses to.
+        """
+        a, b, c = sorted(CARD_INDEX[card] for card in hand)
+        offset = 3 * hand_index(a, b, c)
+        counts = self.__counts
+        return counts[offset], counts[offset + 1], counts[offset + 2]
+
+    def probabilities(self, hand: list[Card]) -> tuple[float, float, float]:
+        """
+        Returns:
+            tuple[float, float, float]: Chances to win, tie and lose against a random dealer hand.
+        """
+        win, tie, lose = self.counts(hand)
+        return win / DEALER_HAND_COUNT, tie / DEALER_HAND_COUNT, lose / DEALER_HAND_COUNT
+
+    def close(self) -> None:
+        if self.__mapped is not None:
+            self.__counts.release()
+            self.__mapped.close()
+
+
+def get_table_path(evaluator: GameEvaluator, cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f'win_table_{evaluator_identity(evaluator)}.bin'
+
+
+def _write_table_file(table_path: Path, counts: array) -> bool:
+    """
+    Atomically write the table file, returns False if the cache dir is not writable.
+    """
+    tmp_path = table_path.with_name(f'{table_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, mode='wb') as table_file:
+            table_file.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_FORMAT_VERSION, HAND_COUNT))
+            table_file.write(counts.tobytes())
+        os.replace(tmp_path, table_path)
+        return True
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def _map_table_file(table_path: Path) -> tuple[mmap.mmap, memoryview] | None:
+    """
+    Map a table file into memory, None if it is missing or not a valid table.
+    """
+    expected_size = TABLE_HEADER.size + 2 * 3 * HAND_COUNT
+    try:
+        with open(table_path, mode='rb') as table_file:
+            if os.fstat(table_file.fileno()).st_size != expected_size:
+                return None
+            mapped = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    if TABLE_HEADER.unpack_from(mapped) != (TABLE_MAGIC, TABLE_FORMAT_VERSION, HAND_COUNT):
+        mapped.close()
+        return None
+    return mapped, memoryview(mapped)[TABLE_HEADER.size:].cast('H')
+
+
+def load_win_probability_table(evaluator: GameEvaluator, cache_dir: Path = CACHE_DIR) -> WinProbabilityTable:
+    """
+    Map the evaluator's table file, building and writing it first if needed.
+    """
+    evaluator_id = evaluator_identity(evaluator)
+    table_path = get_table_path(evaluator, cache_dir)
+
+    if (loaded := _map_table_file(table_path)) is not None:
+        return WinProbabilityTable(evaluator_id, loaded[1], loaded[0])
+
+    counts = build_win_probability_counts(evaluator)
+    if _write_table_file(table_path, counts) and (loaded := _map_table_file(table_path)) is not None:
+        return WinProbabilityTable(evaluator_id, loaded[1], loaded[0])
+    # Read-only install, keep the table in memory for this process
+    return WinProbabilityTable(evaluator_id, counts)
+
+
+# Process wide tables, by evaluator_identity
+_tables: dict[str, WinProbabilityTable] = {}
+_tables_lock = threading.Lock()
+
+def get_win_probability_table(evaluator: GameEvaluator) -> WinProbabilityTable:
+    evaluator_id = evaluator_identity(evaluator)
+    with _tables_lock:
+        if evaluator_id not in _tables:
+            _tables[evaluator_id] = load_win_probability_table(evaluator)
+        return _tables[evaluator_id]
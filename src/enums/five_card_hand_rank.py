@@ -0,0 +1,17 @@
+from enum import IntEnum
+
+class FiveCardHandRank(IntEnum):
+    """
+    This Enum class defines the ranking of five-card poker hands, used by the Six Card Bonus
+    (the best five of the player's and the dealer's cards).
+    """
+    HIGH_CARD = 0
+    PAIR = 1
+    TWO_PAIR = 2
+    THREE_OF_A_KIND = 3
+    STRAIGHT = 4
+    FLUSH = 5
+    FULL_HOUSE = 6
+    FOUR_OF_A_KIND = 7
+    STRAIGHT_FLUSH = 8
+    ROYAL_FLUSH = 9
\ No newline at end of file
@@ -0,0 +1,11 @@
+from enum import Enum, auto
+
+class HostAction(Enum):
+    """
+    An Enum class that defines the actions the RoundStateMachine hands over to its host,
+    they belong to the application, not to a round.
+    """
+    READ_RULES = auto()
+    SWITCH_LANGUAGE = auto()
+    SWITCH_RULES = auto()
+    EXIT = auto()
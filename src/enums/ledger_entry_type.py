@@ -0,0 +1,24 @@
+from enum import StrEnum, auto
+
+class LedgerEntryType(StrEnum):
+    """
+    An Enum class that defines the kinds of chip movements recorded by the Wallet.
+    Bets are debits, everything else is a credit, except adjustments which go both ways.
+    The values are stored as-is in the ledger.
+    """
+    ANTE_BET = auto()
+    PAIR_PLUS_BET = auto()
+    PROGRESSIVE_BET = auto()
+    SIX_CARD_BONUS_BET = auto()
+    PLAY_BET = auto()
+    ANTE_RETURN = auto()
+    PAIR_PLUS_RETURN = auto()
+    PLAY_RETURN = auto()
+    PROGRESSIVE_RETURN = auto()
+    SIX_CARD_BONUS_RETURN = auto()
+    ANTE_BONUS_PAYOUT = auto()
+    PAIR_PLUS_PAYOUT = auto()
+    PROGRESSIVE_PAYOUT = auto()
+    SIX_CARD_BONUS_PAYOUT = auto()
+    WINNINGS = auto()
+    ADJUSTMENT = auto() # e.g. the cheat code
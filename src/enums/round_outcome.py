@@ -0,0 +1,14 @@
+from enum import StrEnum, auto
+
+class RoundOutcome(StrEnum):
+    """
+    An Enum class that defines how a round ends for the player.
+    The values are the outcome strings of the settlement dict and of the SettleSink calls.
+    """
+    WIN = auto()
+    PUSH = auto()
+    LOSE = auto()
+    FOLD = auto() # never settled, see SettleSink.record_fold
+
+# The outcome strings in the order of every counter and stored code built on them
+OUTCOMES: tuple[str, ...] = tuple(outcome.value for outcome in RoundOutcome)
@@ -0,0 +1,23 @@
+from enum import Enum, auto
+
+class RoundState(Enum):
+    """
+    An Enum class that defines the states of the RoundStateMachine.
+    Menus and bets wait for user input, draws, the reveal, the fold and rolling text wait for a timer.
+    """
+    IDLE = auto() # not started yet
+    MAIN_MENU = auto()
+    ANTE_BET = auto()
+    PAIR_PLUS_MENU = auto()
+    PAIR_PLUS_BET = auto()
+    PROGRESSIVE_MENU = auto()
+    SIX_CARD_BONUS_MENU = auto()
+    DRAW_PROMPT = auto()
+    PLAYER_DRAW = auto()
+    DEALER_DRAW = auto()
+    PLAY_MENU = auto()
+    REVEAL_DEALER_HAND = auto()
+    FOLDING = auto()
+    ANOTHER_GAME_MENU = auto()
+    ROLLING_TEXT = auto() # a long text shown line by line, e.g. the rules
+    FINISHED = auto() # the player left or went broke
@@ -36,15 +36,27 @@ class UIKeys(StrEnum):
     PLACE_PAIR_PLUS_PROMPT = auto()
     HAS_PLACED_PAIR_PLUS_PROMPT = auto()
     NO_PAIR_PLUS_PROMPT = auto()
+    PROGRESSIVE_JACKPOT_MESSAGE = auto()
+    PROGRESSIVE_ROUND_PROMPT = auto()
+    HAS_PLACED_PROGRESSIVE_PROMPT = auto()
+    NO_PROGRESSIVE_PROMPT = auto()
+    SIX_CARD_BONUS_OFFER_MESSAGE = auto()
+    SIX_CARD_BONUS_ROUND_PROMPT = auto()
+    HAS_PLACED_SIX_CARD_BONUS_PROMPT = auto()
+    NO_SIX_CARD_BONUS_PROMPT = auto()
     PLACE_PLAY_BET_PROMPT = auto()
     DRAW_CARD_PROMPT = auto()
     PLAYER_DREW_CARD_MESSAGE = auto()
     DEALER_DREW_CARD_MESSAGE = auto()
+    DEALER_REVEALED_UPCARD_MESSAGE = auto()
     SHOW_PLAYER_HAND = auto()
     SHOW_DEALER_HAND = auto()
     WIN_ANTE_BONUS_PROMPT = auto()
     WIN_PAIR_PLUS_PROMPT = auto()
     HAD_PAIR_PLUS_BET_BUT_NO_PAIR_PLUS = auto()
+    WIN_PROGRESSIVE_PROMPT = auto()
+    WIN_SIX_CARD_BONUS_PROMPT = auto()
+    HAD_SIX_CARD_BONUS_BET_BUT_NO_BONUS = auto()
     FOLD = auto()
     LOSE = auto()
     DEALER_NOT_QUALIFIED = auto()
@@ -0,0 +1,9 @@
+class ConfigValidationError(Exception):
+    def __init__(self, problems: list[str]):
+        """
+        Raised when config or locale files do not match the expected schema.
+        All problems are aggregated, so they can be fixed in one go.
+        """
+        self.problems = problems
+        self.message = "Invalid config:\n" + "\n".join(f"  - {p}" for p in problems)
+        super().__init__(self.message)
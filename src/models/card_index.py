@@ -0,0 +1,14 @@
+"""
+Dense integer ids (0-51) for the cards of a deck, in the order Deck builds them:
+index = value_index * 4 + suit_index, so index // 4 + 2 is the card value.
+Used wherever hands and deals are stored or shipped as plain numbers.
+"""
+from src.models.card import Card
+from src.models.deck import Deck
+
+DECK_SIZE = 52
+
+# A fresh Deck is never shuffled, so its order is the canonical one
+DECK_CARDS: tuple[Card, ...] = tuple(Deck().cards)
+
+CARD_INDEX: dict[Card, int] = {card: index for index, card in enumerate(DECK_CARDS)}
@@ -0,0 +1,178 @@
+"""
+Every distinct single-deck deal, (player hand, dealer hand), exactly once and in a fixed order.
+
+There are C(52, 3) x C(49, 3) = 22,100 x 18,424 = 407,170,400 deals. Deal number i is
+    player hand: hand_index i // DEALER_HAND_COUNT (see hand_canonicalization.py)
+    dealer hand: colexicographic rank i % DEALER_HAND_COUNT among the 49 cards left,
+so all deals of a player hand are contiguous (one player hand, its remaining cards and
+the dealer combinations are reused for 18,424 deals in a row), and any range of deal
+numbers can be started from directly: split [0, DEAL_COUNT) by range across workers,
+and resume a range from the last deal number done.
+
+Deals come as index tuples (iter_deals) or as chunks in the deal stream format
+(see deal_stream.py: player, dealer, player, dealer, player, dealer), NumPy arrays
+if NumPy is installed, bytes otherwise.
+"""
+from functools import cache
+from itertools import combinations
+from typing import Iterator
+
+from src.models.card_index import DECK_SIZE
+from src.models.hand_canonicalization import HAND_COUNT, HandIndices, hand_index
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - depends on the install
+    np = None
+
+HAS_NUMPY: bool = np is not None
+
+# Dealer hands left once the player holds 3 cards: C(49, 3)
+DEALER_HAND_COUNT = 18_424
+
+DEAL_COUNT = HAND_COUNT * DEALER_HAND_COUNT
+
+Deal = tuple[HandIndices, HandIndices]
+
+
+@cache
+def _hands_by_index() -> tuple[HandIndices, ...]:
+    # Sorted card indices of every hand, by hand_index
+    hands: list[HandIndices] = [(0, 0, 0)] * HAND_COUNT
+    for hand in combinations(range(DECK_SIZE), 3):
+        hands[hand_index(*hand)] = hand
+    return tuple(hands)
+
+
+@cache
+def _dealer_positions() -> tuple[HandIndices, ...]:
+    # Positions (0-48) in the remaining cards of every dealer hand, by colex rank
+    positions: list[HandIndices] = [(0, 0, 0)] * DEALER_HAND_COUNT
+    for hand in combinations(range(DECK_SIZE - 3), 3):
+        positions[hand_index(*hand)] = hand
+    return tuple(positions)
+
+
+@cache
+def _numpy_dealer_positions() -> 'np.ndarray':
+    return np.array(_dealer_positions(), dtype=np.intp)
+
+
+def unrank_hand(index: int) -> HandIndices:
+    """
+    The inverse of hand_index.
+    Returns:
+        HandIndices: Sorted card indices.
+    """
+    return _hands_by_index()[index]
+
+
+def _remaining_cards(player: HandIndices) -> list[int]:
+    a, b, c = player
+    return [card for card in range(DECK_SIZE) if card != a and card != b and card != c]
+
+
+def deal_number(player: HandIndices, dealer: HandIndices) -> int:
+    """
+    Args:
+        player, dealer (HandIndices): Card indices, each hand sorted ascending, no card in both.
+    Returns:
+        int: The number of the deal in the enumeration, 0 to DEAL_COUNT - 1.
+    """
+    # A dealer card's position among the remaining cards: skip the player cards below it
+    a, b, c = (card - (card > player[0]) - (card > player[1]) - (card > player[2]) for card in dealer)
+    return hand_index(*player) * DEALER_HAND_COUNT + hand_index(a, b, c)
+
+
+def deal_at(number: int) -> Deal:
+    """
+    The inverse of deal_number.
+    Raises:
+        ValueError: If the number is out of range.
+    """
+    if not 0 <= number < DEAL_COUNT:
+        raise ValueError(f"Deal number {number} out of range [0, {DEAL_COUNT}).")
+    player_id, dealer_rank = divmod(number, DEALER_HAND_COUNT)
+    player = unrank_hand(player_id)
+    remaining = _remaining_cards(player)
+    a, b, c = _dealer_positions()[dealer_rank]
+    return player, (remaining[a], remaining[b], remaining[c])
+
+
+def _check_range(start: int, stop: int | None) -> int:
+    stop = DEAL_COUNT if stop is None else stop
+    if not 0 <= start <= stop <= DEAL_COUNT:
+        raise ValueError(f"Deal range [{start}, {stop}) is not within [0, {DEAL_COUNT}].")
+    return stop
+
+
+def _segments(start: int, stop: int) -> Iterator[tuple[int, int, int]]:
+    # (player hand id, first dealer rank, last dealer rank + 1) of every player hand in the range
+    player_id, dealer_rank = divmod(start, DEALER_HAND_COUNT)
+    number = start
+    while number < stop:
+        last_rank = min(DEALER_HAND_COUNT, dealer_rank + stop - number)
+        yield player_id, dealer_rank, last_rank
+        number += last_rank - dealer_rank
+        player_id, dealer_rank = player_id + 1, 0
+
+
+def iter_deals(start: int = 0, stop: int | None = None) -> Iterator[Deal]:
+    """
+    Yield the deals numbered start to stop - 1, in order.
+    Raises:
+        ValueError: If the range is not within [0, DEAL_COUNT].
+    """
+    stop = _check_range(start, stop)
+    hands = _hands_by_index()
+    positions = _dealer_positions()
+    for player_id, first_rank, last_rank in _segments(start, stop):
+        player = hands[player_id]
+        remaining = _remaining_cards(player)
+        for rank in range(first_rank, last_rank):
+            a, b, c = positions[rank]
+            yield player, (remaining[a], remaining[b], remaining[c])
+
+
+def iter_deal_chunks(
+    start: int = 0,
+    stop: int | None = None,
+    chunk_rounds: int = DEALER_HAND_COUNT,
+    is_bytes: bool = False
+    ):
+    """
+    Yield the deals numbered start to stop - 1 in the deal stream format,
+    at most chunk_rounds deals per chunk, never more than one player hand per chunk.
+    Args:
+        is_bytes (bool): Yield bytes even if NumPy is installed, e.g. for a ReplayDeck.
+    Yields:
+        np.ndarray | bytes: (n, DEAL_SIZE) uint8 arrays, or n * DEAL_SIZE bytes.
+    Raises:
+        ValueError: If the range is not within [0, DEAL_COUNT] or chunk_rounds is not positive.
+    """
+    stop = _check_range(start, stop)
+    if chunk_rounds <= 0:
+        raise ValueError("chunk_rounds must be positive.")
+    hands = _hands_by_index()
+
+    for player_id, first_rank, last_rank in _segments(start, stop):
+        player = hands[player_id]
+        remaining = _remaining_cards(player)
+        for chunk_first in range(first_rank, last_rank, chunk_rounds):
+            chunk_last = min(last_rank, chunk_first + chunk_rounds)
+
+            if HAS_NUMPY:
+                dealers = np.array(remaining, dtype=np.uint8)[_numpy_dealer_positions()[chunk_first:chunk_last]]
+                chunk = np.empty((chunk_last - chunk_first, 6), dtype=np.uint8)
+                chunk[:, 0::2] = player
+                chunk[:, 1::2] = dealers
+                yield chunk.tobytes() if is_bytes else chunk
+                continue
+
+            p0, p1, p2 = player
+            positions = _dealer_positions()
+            chunk = bytearray()
+            for rank in range(chunk_first, chunk_last):
+                a, b, c = positions[rank]
+                chunk += bytes((p0, remaining[a], p1, remaining[b], p2, remaining[c]))
+            yield bytes(chunk)
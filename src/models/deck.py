@@ -5,9 +5,20 @@ import random
 class Deck:
     """
     Container class of cards
+    
+    Shuffling is lazy (Fisher-Yates one step at a time): shuffle() only resets the cursor,
+    and each draw swaps a random card of the undealt part to the cursor.
+    So a round costs O(cards dealt) instead of O(deck size), with the same distribution
+    as shuffling the whole deck up front.
+    
+    Attributes:
+        top (int): Cursor, cards before it are dealt.
+        rng (random.Random): Own random generator, seedable for reproducible deals.
+        cards (list[Card]): The cards, in no particular order.
     """
-    def __init__(self):
+    def __init__(self, seed: int | None = None):
         self.top = 0
+        self.rng = random.Random(seed)
         self.cards: list[Card] = []
         for pips in range(13):
             for suit in range(4):
@@ -18,7 +29,10 @@ class Deck:
         return f'Deck(There are: {len(self.cards)} cards)\ncards: {self.cards}'
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        """
+        Put every card back to the undealt part, see the class docstring.
+        """
+        self.top = 0
         
     def remove_from_deck(self) -> Card:
         """
@@ -27,9 +41,12 @@ class Deck:
             Card: A card object that was removed(semantically, not actually removed) from the deck.
         """
         
-        card = self.cards[self.top]
-        self.top += 1
-        return card
+        cards = self.cards
+        top = self.top
+        pick = self.rng.randrange(top, len(cards))
+        cards[top], cards[pick] = cards[pick], cards[top]
+        self.top = top + 1
+        return cards[top]
 
     def janitor(self) -> None:
         """
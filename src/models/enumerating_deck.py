@@ -0,0 +1,51 @@
+from src.models.deal_enumeration import DEAL_COUNT, iter_deal_chunks
+from src.models.replay_deck import ReplayDeck
+from src.simulation.deal_stream import DEAL_SIZE
+
+class EnumeratingDeck(ReplayDeck):
+    """
+    Deals every distinct deal numbered start to stop - 1, in enumeration order
+    (see deal_enumeration.py), once each, instead of random cards.
+    The deals are generated a chunk at a time, the full enumeration never sits in memory.
+
+    Attributes:
+        start (int): Number of the first deal.
+        stop (int): Number of the last deal + 1.
+        next_deal_number (int): Number of the next deal, where to resume after an interruption.
+    """
+    def __init__(self, start: int = 0, stop: int = DEAL_COUNT, chunk_rounds: int = 4096):
+        """
+        Raises:
+            ValueError: If the range is not within [0, DEAL_COUNT] or chunk_rounds is not positive.
+        """
+        # The chunks are generated lazily, check now rather than at the first card
+        if not 0 <= start <= stop <= DEAL_COUNT:
+            raise ValueError(f"Deal range [{start}, {stop}) is not within [0, {DEAL_COUNT}].")
+        if chunk_rounds <= 0:
+            raise ValueError("chunk_rounds must be positive.")
+        super().__init__(b'')
+        self.start = start
+        self.stop = stop
+        self.__chunks = iter_deal_chunks(start, stop, chunk_rounds, is_bytes=True)
+        self.__dealt_before_chunk = 0
+
+    def __repr__(self) -> str:
+        return f'EnumeratingDeck({self.stop - self.next_deal_number} deals left)'
+
+    @property
+    def next_deal_number(self) -> int:
+        return self.start + (self.__dealt_before_chunk + self.position) // DEAL_SIZE
+
+    def remove_from_deck(self):
+        """
+        Raises:
+            IndexError: If every deal of the range is dealt.
+        """
+        if self.position == len(self.stream):
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                raise IndexError(f"Every deal up to {self.stop} is dealt.")
+            self.__dealt_before_chunk += self.position
+            self.stream = chunk
+            self.position = 0
+        return super().remove_from_deck()
@@ -0,0 +1,147 @@
+"""
+Suit-isomorphic canonicalization of three-card hands.
+
+Poker hand values never depend on which suit is which, only on which cards share a suit,
+so renaming the suits (24 permutations) maps a hand onto an equivalent one.
+The 22,100 three-card hands of a 52-card deck fall into 1,755 such classes:
+    distinct values: 286 value sets x 5 suit patterns (suited, rainbow, 3 two-suited)
+    pairs:           156 (pair, kicker) x 2 suit patterns (kicker shares a suit or not)
+    trips:           13
+Anything keyed on hands (exact analyses, result caches, lookup tables) can be keyed on
+the class instead, weighting every class by the number of raw hands it stands for.
+
+Hands are given as card indices (see card_index.py) or Card objects, in any order.
+The tables are built on first use (about half a second), every lookup after that is O(1).
+"""
+from array import array
+from dataclasses import dataclass
+from functools import cache
+from itertools import combinations, permutations
+
+from src.models.card import Card
+from src.models.card_index import CARD_INDEX, DECK_SIZE
+
+HAND_COUNT = 22_100 # C(52, 3)
+
+# All renamings of the suits, SUIT_PERMUTATIONS[p][suit_index] is the new suit index
+SUIT_PERMUTATIONS: tuple[tuple[int, int, int, int], ...] = tuple(permutations(range(4)))
+
+HandIndices = tuple[int, int, int]
+
+
+def hand_index(a: int, b: int, c: int) -> int:
+    """
+    Dense id (0 to HAND_COUNT - 1) of a hand, the colexicographic rank of its card indices.
+    Args:
+        a, b, c (int): Card indices, sorted ascending: a < b < c.
+    """
+    return a + b * (b - 1) // 2 + c * (c - 1) * (c - 2) // 6
+
+
+def permute_suits(card: int, permutation: int) -> int:
+    """
+    Rename the suit of a card index with SUIT_PERMUTATIONS[permutation].
+    """
+    return (card & ~3) | SUIT_PERMUTATIONS[permutation][card & 3]
+
+
+@dataclass(frozen=True)
+class CanonicalTables:
+    """
+    Attributes:
+        class_of_hand (array): Class id of every hand, by hand_index.
+        permutation_of_hand (array): For every hand (by hand_index), the index in
+            SUIT_PERMUTATIONS that maps the hand onto its class representative.
+        representatives (tuple[HandIndices, ...]): Sorted card indices of the canonical
+            hand of every class, by class id. Class ids follow the order of the representatives.
+        weights (tuple[int, ...]): Number of raw hands in every class, by class id.
+    """
+    class_of_hand: array
+    permutation_of_hand: array
+    representatives: tuple[HandIndices, ...]
+    weights: tuple[int, ...]
+
+    @property
+    def class_count(self) -> int:
+        return len(self.representatives)
+
+
+@cache
+def get_canonical_tables() -> CanonicalTables:
+    """
+    Build the canonicalization tables, once per process.
+    The representative of a class is its smallest sorted index triple under all suit renamings.
+    """
+    canonical_hands: list[HandIndices] = []
+    canonical_permutations: list[int] = []
+
+    for hand in combinations(range(DECK_SIZE), 3):
+        best_hand: HandIndices | None = None
+        best_permutation = 0
+        for permutation in range(len(SUIT_PERMUTATIONS)):
+            renamed = tuple(sorted(permute_suits(card, permutation) for card in hand))
+            if best_hand is None or renamed < best_hand:
+                best_hand = renamed
+                best_permutation = permutation
+        canonical_hands.append(best_hand)
+        canonical_permutations.append(best_permutation)
+
+    representatives = tuple(sorted(set(canonical_hands)))
+    class_ids = {representative: class_id for class_id, representative in enumerate(representatives)}
+
+    weights = [0] * len(representatives)
+    class_of_hand = array('H', bytes(2 * HAND_COUNT))
+    permutation_of_hand = array('B', bytes(HAND_COUNT))
+    # combinations() yields the hands in lexicographic order, index them by their colex rank
+    for hand, canonical_hand, permutation in zip(
+        combinations(range(DECK_SIZE), 3), canonical_hands, canonical_permutations
+    ):
+        class_id = class_ids[canonical_hand]
+        weights[class_id] += 1
+        index = hand_index(*hand)
+        class_of_hand[index] = class_id
+        permutation_of_hand[index] = permutation
+
+    return CanonicalTables(class_of_hand, permutation_of_hand, representatives, tuple(weights))
+
+
+def _sorted_indices(hand: list[Card] | HandIndices) -> HandIndices:
+    if isinstance(hand[0], Card):
+        a, b, c = (CARD_INDEX[card] for card in hand)
+    else:
+        a, b, c = hand
+    # Three compare-and-swaps instead of sorted()
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+    if a > b:
+        a, b = b, a
+    return a, b, c
+
+
+def canonical_class(hand: list[Card] | HandIndices) -> int:
+    """
+    Returns:
+        int: The class id of a hand, 0 to CanonicalTables.class_count - 1.
+    """
+    return get_canonical_tables().class_of_hand[hand_index(*_sorted_indices(hand))]
+
+
+def canonicalize(hand: list[Card] | HandIndices) -> tuple[int, int]:
+    """
+    Returns:
+        tuple[int, int]: The class id of a hand, and the index in SUIT_PERMUTATIONS
+            that renames its suits onto the class representative.
+    """
+    tables = get_canonical_tables()
+    index = hand_index(*_sorted_indices(hand))
+    return tables.class_of_hand[index], tables.permutation_of_hand[index]
+
+
+def class_weight(class_id: int) -> int:
+    """
+    Returns:
+        int: How many of the 22,100 raw hands belong to the class.
+    """
+    return get_canonical_tables().weights[class_id]
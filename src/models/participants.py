@@ -29,8 +29,23 @@ class Participants:
         
 
 class Dealer(Participants):
+    """
+    Attributes:
+        upcard (Card | None): The first card dealt to the dealer this round,
+            the one shown face up when the dealer upcard is revealed. None before the deal.
+    """
     def __init__(self):
         super().__init__()
+        self.upcard: Card | None = None
+    
+    def receive_card(self, card: Card) -> None:
+        if self.top == 0:
+            self.upcard = card
+        super().receive_card(card)
+    
+    def clear_hand(self):
+        super().clear_hand()
+        self.upcard = None
         
         
 @dataclass
@@ -40,6 +55,8 @@ class Player(Participants):
     ante_bet: int = 0
     pair_plus_bet: int = 0
     play_bet: int = 0
+    progressive_bet: int = 0
+    six_card_bonus_bet: int = 0
     
     def __post_init__(self): # Magic
         """
@@ -53,4 +70,6 @@ class Player(Participants):
         """
         self.ante_bet = 0
         self.pair_plus_bet = 0
-        self.play_bet = 0
\ No newline at end of file
+        self.play_bet = 0
+        self.progressive_bet = 0
+        self.six_card_bonus_bet = 0
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Sequence
+
+from src.models.card import Card
+from src.models.card_index import DECK_CARDS
+from src.models.deck import Deck
+
+class ReplayDeck(Deck):
+    """
+    Deals a pre-generated stream of card indices (see card_index.py) instead of random cards.
+    Several engines replaying the same stream see exactly the same deals,
+    whatever their players decide. Shuffling is a no-op, the stream already is shuffled.
+    
+    Attributes:
+        stream (Sequence[int]): Card indices in dealing order, e.g. a memoryview on shared memory.
+        position (int): Index of the next card in the stream.
+    """
+    def __init__(self, stream: Sequence[int]):
+        super().__init__()
+        self.stream = stream
+        self.position = 0
+
+    def __repr__(self) -> str:
+        return f'ReplayDeck({len(self.stream) - self.position} cards left)'
+
+    def shuffle(self):
+        pass
+
+    def remove_from_deck(self) -> Card:
+        card = DECK_CARDS[self.stream[self.position]]
+        self.position += 1
+        return card
+
+    def janitor(self) -> None:
+        pass
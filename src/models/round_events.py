@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.enums.host_action import HostAction
+from src.enums.ui_keys import UIKeys
+
+# === Output events, emitted by the RoundStateMachine ===
+
+@dataclass(frozen=True)
+class ShowMessage:
+    """
+    Show a message to the player, see GameView.show_message.
+    """
+    key: UIKeys
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ShowText:
+    """
+    Show raw text as it is, e.g. one line of the rules, see GameView.show_text.
+    """
+    text: str
+
+
+@dataclass(frozen=True)
+class RequestInput:
+    """
+    Ask the player for input, answer with a UserInput event.
+    """
+    key: UIKeys
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ScheduleTimer:
+    """
+    Answer with TimerFired(timer_id) after the given seconds, or right away in tests and bots.
+    """
+    timer_id: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class RequestHostAction:
+    """
+    Run an application level action, e.g. reading the rules.
+    """
+    action: HostAction
+
+
+@dataclass(frozen=True)
+class RoundBoundary:
+    """
+    Every bet is settled and the next round has not started,
+    the host may reload configs or checkpoint the session now.
+    """
+
+
+# === Input events, consumed by the RoundStateMachine ===
+
+@dataclass(frozen=True)
+class UserInput:
+    text: str
+
+
+@dataclass(frozen=True)
+class TimerFired:
+    """
+    Attributes:
+        is_late (bool): The timer fired long after it was due, e.g. the process was suspended.
+    """
+    timer_id: int
+    is_late: bool = False
+
+
+@dataclass(frozen=True)
+class TextLines:
+    """
+    Answer to RequestHostAction(READ_RULES): a long text to roll out, one line per timer.
+    The lines keep their line endings. No lines, e.g. a locale without rules, rolls out nothing.
+    """
+    lines: tuple[str, ...]
+    seconds_per_line: float
+
+
+RoundOutputEvent = ShowMessage | ShowText | RequestInput | ScheduleTimer | RequestHostAction | RoundBoundary
+RoundInputEvent = UserInput | TimerFired | TextLines
@@ -0,0 +1,50 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.evaluators.evaluator_registry import GAME_RULES, create_evaluator
+from src.core.interfaces.evaluator_protocols import GameEvaluator
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    Everything a table plays by under one game rule. Never mutated once built,
+    so any number of sessions and threads can read it without locking;
+    a new rule set replaces the old one as a whole.
+
+    Attributes:
+        game_rule (str): 'standard' or 'california'.
+        evaluator (GameEvaluator): Stateless, shared by every session of the game rule.
+        ante_bonus (Mapping[int, int]): Ante bonus payout rates by hand rank.
+        pair_plus (Mapping[int, int]): Pair plus payout rates by hand rank.
+        is_table_limit_enabled (bool): Flag to enable or disable table limit enforcement.
+        limits (Mapping[str, int]): Table limits.
+    """
+    game_rule: str
+    evaluator: GameEvaluator
+    ante_bonus: Mapping[int, int]
+    pair_plus: Mapping[int, int]
+    is_table_limit_enabled: bool
+    limits: Mapping[str, int]
+
+    @classmethod
+    def from_config(cls, game_rule: str, ge_config: Mapping[str, Any]) -> 'RuleSet':
+        """
+        Args:
+            game_rule (str): 'standard' or 'california'.
+            ge_config (Mapping[str, Any]): ConfigService.get_game_engine_config(),
+                already frozen, so its tables are shared as they are.
+        """
+        return cls(
+            game_rule,
+            create_evaluator(game_rule, ge_config['common']['evaluator_backend']),
+            ge_config[game_rule]['ante_bonus'],
+            ge_config[game_rule]['pair_plus'],
+            ge_config['common']['is_table_limit_enabled'],
+            ge_config['common']['limits']
+        )
+
+    @classmethod
+    def all_from_config(cls, ge_config: Mapping[str, Any]) -> dict[str, 'RuleSet']:
+        return {game_rule: cls.from_config(game_rule, ge_config) for game_rule in GAME_RULES}
@@ -0,0 +1,124 @@
+import struct
+from dataclasses import dataclass
+
+from src.models.card_index import CARD_INDEX, DECK_CARDS
+from src.models.deck import Deck
+
+# see SessionState.to_bytes
+SESSION_HEADER = struct.Struct('<4sHBBqHH')
+SESSION_MAGIC = b'TCSS'
+SESSION_FORMAT_VERSION = 1
+
+# random.Random (Mersenne Twister) state: 624 words and the position
+MT_STATE = struct.Struct('<625I')
+GAUSS_NEXT = struct.Struct('<?d')
+
+GAME_RULE_IDS: dict[str, int] = {'standard': 0, 'california': 1}
+GAME_RULE_NAMES: dict[int, str] = {rule_id: rule for rule, rule_id in GAME_RULE_IDS.items()}
+
+
+@dataclass(frozen=True)
+class SessionState:
+    """
+    Everything needed to bring a table back after a restart, captured at a round boundary
+    (all bets are settled then, so only the balance matters).
+
+    Attributes:
+        balance (int): The player's balance.
+        game_rule (str): 'standard' or 'california'.
+        lang_code (str): The language of the session.
+        deck_cards (bytes): Card indices (see card_index.py) in the current order of the deck,
+            a Shoe holds deck_count times 52.
+        deck_top (int): The deck cursor, cards before it are dealt.
+        rng_state (tuple): Deck.rng.getstate().
+    """
+    balance: int
+    game_rule: str
+    lang_code: str
+    deck_cards: bytes
+    deck_top: int
+    rng_state: tuple
+
+    @classmethod
+    def capture(cls, balance: int, game_rule: str, lang_code: str, deck: Deck) -> 'SessionState':
+        return cls(
+            balance,
+            game_rule,
+            lang_code,
+            bytes(CARD_INDEX[card] for card in deck.cards),
+            deck.top,
+            deck.rng.getstate()
+        )
+
+    def restore_deck(self, deck: Deck) -> bool:
+        """
+        Put the deck back in the captured order, cursor and random state.
+        Returns:
+            bool: False if the deck does not hold the same number of cards (e.g. the shoe
+                size changed in the config since), the deck is left untouched then.
+        """
+        if len(deck.cards) != len(self.deck_cards):
+            return False
+        deck.cards = [DECK_CARDS[index] for index in self.deck_cards]
+        deck.top = self.deck_top
+        deck.rng.setstate(self.rng_state)
+        return True
+
+    def to_bytes(self) -> bytes:
+        """
+        Layout, little endian:
+            header (SESSION_HEADER): magic, format version, game rule id, length of lang_code,
+                balance, deck_top, number of deck cards
+            lang_code (ASCII), deck_cards (one byte per card)
+            Mersenne Twister state (MT_STATE), gauss_next (GAUSS_NEXT)
+        About 2.6 KB for a single deck.
+        """
+        lang = self.lang_code.encode('ascii')
+        version, mt_words, gauss_next = self.rng_state
+        return b''.join((
+            SESSION_HEADER.pack(
+                SESSION_MAGIC,
+                SESSION_FORMAT_VERSION,
+                GAME_RULE_IDS[self.game_rule],
+                len(lang),
+                self.balance,
+                self.deck_top,
+                len(self.deck_cards)
+            ),
+            lang,
+            self.deck_cards,
+            MT_STATE.pack(*mt_words),
+            GAUSS_NEXT.pack(gauss_next is not None, gauss_next or 0.0),
+        ))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'SessionState':
+        """
+        Raises:
+            ValueError: If raw is not a session snapshot of this format version.
+        """
+        try:
+            magic, version, rule_id, lang_length, balance, deck_top, card_count = SESSION_HEADER.unpack_from(raw)
+            if magic != SESSION_MAGIC or version != SESSION_FORMAT_VERSION:
+                raise ValueError("not a session snapshot of this format version")
+
+            offset = SESSION_HEADER.size
+            lang_code = raw[offset:offset + lang_length].decode('ascii')
+            offset += lang_length
+            deck_cards = bytes(raw[offset:offset + card_count])
+            offset += card_count
+            mt_words = MT_STATE.unpack_from(raw, offset)
+            has_gauss_next, gauss_next = GAUSS_NEXT.unpack_from(raw, offset + MT_STATE.size)
+
+            if offset + MT_STATE.size + GAUSS_NEXT.size != len(raw):
+                raise ValueError("unexpected snapshot size")
+            return cls(
+                balance,
+                GAME_RULE_NAMES[rule_id],
+                lang_code,
+                deck_cards,
+                deck_top,
+                (3, mt_words, gauss_next if has_gauss_next else None)
+            )
+        except (struct.error, KeyError, UnicodeDecodeError) as e:
+            raise ValueError(f"corrupt session snapshot: {e}") from e
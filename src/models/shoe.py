@@ -0,0 +1,69 @@
+from src.models.deck import Deck
+
+class Shoe(Deck):
+    """
+    A dealing shoe holding several decks, as used by most casino tables.
+    
+    Dealt cards stay out of the shoe until the cut card comes out, then the whole shoe
+    is reshuffled before the next round. A continuous shuffling machine (CSM) gets the
+    cards back after every round instead, so every round is dealt from the full shoe.
+    Shuffling is lazy like Deck, a round costs O(cards dealt) regardless of the shoe size.
+    
+    Attributes:
+        deck_count (int): Number of 52-card decks in the shoe.
+        penetration (float): Fraction of the shoe dealt before the cut card comes out.
+        is_continuous_shuffler (bool): Whether the shoe is a continuous shuffling machine.
+        cut_card_position (int): Cursor position of the cut card.
+    """
+    
+    # Three Card Poker deals 3 cards to the player and 3 to the dealer,
+    # the cut card is placed such that a started round can always be completed
+    ROUND_RESERVE = 6
+    
+    def __init__(
+        self,
+        deck_count: int = 1,
+        penetration: float = 0.75,
+        is_continuous_shuffler: bool = False,
+        seed: int | None = None
+        ):
+        
+        if deck_count < 1:
+            raise ValueError("deck_count must be at least 1.")
+        if not (0 < penetration <= 1):
+            raise ValueError("penetration must be in (0, 1].")
+        
+        super().__init__(seed)
+        self.cards = self.cards * deck_count
+        self.deck_count = deck_count
+        self.penetration = penetration
+        self.is_continuous_shuffler = is_continuous_shuffler
+        self.cut_card_position = min(
+            int(len(self.cards) * penetration),
+            len(self.cards) - self.ROUND_RESERVE
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'Shoe({self.deck_count} decks, {len(self.cards) - self.top} cards left, '
+            f'cut card at {self.cut_card_position}, CSM: {self.is_continuous_shuffler})'
+        )
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self.is_continuous_shuffler or self.top >= self.cut_card_position
+
+    def shuffle(self):
+        """
+        Called before every round, but only reshuffles once the cut card came out.
+        """
+        if self.needs_shuffle:
+            super().shuffle()
+
+    def janitor(self) -> None:
+        """
+        Discards stay out of the shoe until the cut card comes out,
+        a continuous shuffling machine gets them back right away.
+        """
+        if self.is_continuous_shuffler:
+            super().janitor()
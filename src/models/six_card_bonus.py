@@ -0,0 +1,33 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.evaluators.six_card_bonus_evaluator import SixCardBonusEvaluator
+
+
+@dataclass(frozen=True)
+class SixCardBonus:
+    """
+    The rules of the Six Card Bonus side bet, the same under every game rule.
+
+    Attributes:
+        bet (int): The fixed stake of the bet.
+        payout_rate_table (Mapping[int, int]): Payout rates by FiveCardHandRank value.
+        evaluator (SixCardBonusEvaluator): Stateless, may be shared by every table.
+    """
+    bet: int
+    payout_rate_table: Mapping[int, int]
+    evaluator: SixCardBonusEvaluator
+
+    @classmethod
+    def from_config(cls, ge_config: Mapping[str, Any]) -> 'SixCardBonus | None':
+        """
+        Args:
+            ge_config (Mapping[str, Any]): ConfigService.get_game_engine_config().
+        Returns:
+            SixCardBonus | None: None if the bet is disabled.
+        """
+        config = ge_config['common']['six_card_bonus']
+        if not config['is_enabled']:
+            return None
+        return cls(config['bet'], config['payout_rate_table'], SixCardBonusEvaluator())
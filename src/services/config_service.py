@@ -1,13 +1,15 @@
 from src.services.utils.get_file_path import CONFIG_PATHS
-from src.services.utils.config_loader import (
-    load_app_controller_config,
-    load_game_engine_config,
-    load_game_controller_config,
-)
+from src.services.utils.config_snapshot import get_config_snapshot
 
 class ConfigService:
+    """
+    Serves the configuration of the application.
+    All configs are loaded and validated once (see config_snapshot.py),
+    the getters only hand out immutable in-memory views.
+    """
     def __init__(self):
         self._validate_critical_files()
+        self.snapshot = get_config_snapshot()
 
     def _validate_critical_files(self):
         """Validate the existence of critical configuration files.
@@ -24,14 +26,26 @@ class ConfigService:
             # Aggregate all missing files and raise an error at once for easier debugging
             raise FileNotFoundError(f"Critical config files missing: {', '.join(missing)}")
 
+    def refresh(self) -> bool:
+        """
+        Adopt the latest published snapshot (see ConfigWatcher).
+        Returns:
+            bool: True if the configs changed since the last call.
+        """
+        latest = get_config_snapshot()
+        if latest is self.snapshot:
+            return False
+        self.snapshot = latest
+        return True
+
     def get_app_controller_config(self) -> dict:
         
-        return load_app_controller_config(CONFIG_PATHS['APP_CONTROLLER_CONFIG'])
+        return self.snapshot.app_controller
 
     def get_game_engine_config(self) -> dict:
         
-        return load_game_engine_config(CONFIG_PATHS['GAME_ENGINE_CONFIG'])
+        return self.snapshot.game_engine
 
     def get_game_controller_config(self) -> dict:
         
-        return load_game_controller_config(CONFIG_PATHS['GAME_CONTROLLER_CONFIG'])
\ No newline at end of file
+        return self.snapshot.game_controller
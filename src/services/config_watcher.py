@@ -0,0 +1,77 @@
+import threading
+
+from src.errors.config_validation_error import ConfigValidationError
+from src.services.utils.config_snapshot import (
+    SourceStats,
+    get_config_snapshot,
+    get_source_files,
+    load_config_snapshot,
+    publish_config_snapshot,
+    stat_source_files,
+)
+
+class ConfigWatcher:
+    """
+    Watches the config dir in a background thread by polling (mtime, size) of every source file.
+    On change, the files are parsed and validated in the watcher thread (off the hot path),
+    then the new snapshot is published.
+    A broken config is never published, the running tables keep the last good one.
+    
+    Tables pick the published snapshot up at their next round boundary
+    (see ConfigService.refresh), the watcher never calls into them.
+    
+    Attributes:
+        poll_interval_seconds (float): Seconds between two polls.
+        last_error (Exception | None): Why the last change could not be published, if it failed.
+    """
+    def __init__(self, poll_interval_seconds: float):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.last_error: Exception | None = None
+        self.__seen_stats: SourceStats = get_config_snapshot().source_stats
+        self.__stop_event = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def poll_once(self) -> bool:
+        """
+        Check the config files once, and publish them if they changed.
+        Returns:
+            bool: True if a new snapshot was published.
+        """
+        try:
+            stats = stat_source_files(get_source_files())
+        except OSError as e: # a file is being replaced right now, try again next poll
+            self.last_error = e
+            return False
+
+        if stats == self.__seen_stats:
+            return False
+        # Remember the stats even if loading fails, so a broken file is reported only once
+        self.__seen_stats = stats
+
+        try:
+            snapshot = load_config_snapshot()
+        except (OSError, ConfigValidationError) as e:
+            self.last_error = e
+            return False
+
+        self.last_error = None
+        publish_config_snapshot(snapshot)
+        return True
+
+    def _run(self) -> None:
+        while not self.__stop_event.wait(self.poll_interval_seconds):
+            self.poll_once()
+
+    def start(self) -> None:
+        if self.__thread is not None:
+            return
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        if self.__thread is None:
+            return
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
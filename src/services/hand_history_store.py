@@ -0,0 +1,527 @@
+"""
+Columnar on-disk store of settled rounds, for filtered aggregation without full scans.
+
+Rounds are buffered in memory column by column and sealed every chunk_rows rounds into
+an immutable chunk file: every column is compressed on its own (zlib), and every value
+of the low-cardinality columns (INDEXED_COLUMNS) gets a bitmap of the rows holding it,
+compressed too. The header of a chunk carries its time range.
+
+A query only reads what it needs:
+    - chunks entirely outside the time range are skipped from their header,
+    - filters on indexed columns are ANDs / ORs of bitmaps, counts are popcounts,
+      no column is decompressed,
+    - a sum decompresses the summed column only, and picks the rows of the bitmap.
+
+Chunk layout: header (CHUNK_HEADER, little endian), then the compressed size of every blob
+('<I' each), then the blobs: the columns in HISTORY_COLUMNS order, then the bitmaps of every
+indexed column, value by value, each ceil(rows / 8) bytes, row i is bit i % 8 of byte i // 8.
+
+Rows not sealed yet are also appended to a journal (JOURNAL_ROW records), named after the chunk
+they will be sealed into, every journal_every_rows rows (every round by default). A writer
+killed before sealing leaves its journal behind, the next writer takes the rows over;
+a journal whose chunk exists was sealed already and is dropped.
+
+One writer per directory, enforced by an fcntl lock on WRITER_LOCK_NAME (not enforced without
+fcntl, e.g. on Windows). Readers (is_read_only) in other processes see every sealed chunk.
+"""
+import os
+import struct
+import time
+import zlib
+from array import array
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.interfaces.history_chunk_protocols import HistoryChunk
+from src.enums.hand_rank import HandRank
+from src.enums.round_outcome import OUTCOMES
+from src.services.utils.get_file_path import HAND_HISTORY_DIR
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover - depends on the install
+    np = None
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover - depends on the platform
+    fcntl = None
+
+# Column name -> array typecode. Timestamps are milliseconds since the epoch
+HISTORY_COLUMNS: dict[str, str] = {
+    'timestamp': 'q',
+    'player_hand_rank': 'B',
+    'is_dealer_qualified': 'B',
+    'outcome': 'B',
+    'had_pair_plus_bet': 'B',
+    'ante_bonus_payout': 'q',
+    'pair_plus_payout': 'q',
+    'winnings': 'q',
+    'net_win': 'q',
+}
+
+# Bitmap indexed column -> number of distinct values
+INDEXED_COLUMNS: dict[str, int] = {
+    'player_hand_rank': len(HandRank),
+    'is_dealer_qualified': 2,
+    'outcome': len(OUTCOMES),
+    'had_pair_plus_bet': 2,
+}
+
+SUM_COLUMNS: tuple[str, ...] = ('ante_bonus_payout', 'pair_plus_payout', 'winnings', 'net_win')
+
+OUTCOME_CODES: dict[str, int] = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+
+# magic, format version, rows, first and last timestamp
+CHUNK_HEADER = struct.Struct('<4sHIqq')
+CHUNK_MAGIC = b'TCHH'
+CHUNK_FORMAT_VERSION = 1
+
+# One row of a journal, the columns in HISTORY_COLUMNS order
+JOURNAL_ROW = struct.Struct('<' + ''.join(HISTORY_COLUMNS.values()))
+
+WRITER_LOCK_NAME = 'writer.lock'
+
+BLOB_COUNT = len(HISTORY_COLUMNS) + sum(INDEXED_COLUMNS.values())
+BLOB_SIZES = struct.Struct(f'<{BLOB_COUNT}I')
+
+# Blob number of every column, and of the first bitmap of every indexed column
+COLUMN_BLOBS: dict[str, int] = {name: i for i, name in enumerate(HISTORY_COLUMNS)}
+BITMAP_BLOBS: dict[str, int] = {
+    name: len(HISTORY_COLUMNS) + sum(list(INDEXED_COLUMNS.values())[:i])
+    for i, name in enumerate(INDEXED_COLUMNS)
+}
+
+# The row flags of every bitmap byte, for picking rows without NumPy
+BYTE_ROWS: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)
+)
+
+
+@dataclass(frozen=True)
+class HistoryAggregate:
+    """
+    Attributes:
+        rows (int): Rounds matching the query.
+        sums (dict[str, int]): Sum of every SUM_COLUMNS column over those rounds.
+    """
+    rows: int
+    sums: dict[str, int]
+
+
+def _bitmaps(values: array, cardinality: int) -> list[int]:
+    """
+    One bitmap per value, as ints: row i is bit i.
+    """
+    bitmaps = [bytearray((len(values) + 7) // 8) for _ in range(cardinality)]
+    for row, value in enumerate(values):
+        bitmaps[value][row >> 3] |= 1 << (row & 7)
+    return [int.from_bytes(bitmap, 'little') for bitmap in bitmaps]
+
+
+def _time_mask(timestamps: array, since_ms: int | None, until_ms: int | None) -> int:
+    bits = bytearray((len(timestamps) + 7) // 8)
+    for row, timestamp in enumerate(timestamps):
+        if (since_ms is None or timestamp >= since_ms) and (until_ms is None or timestamp < until_ms):
+            bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _masked_sum(column: array, mask: int) -> int:
+    """
+    Sum of the rows of a column whose bit is set in the mask.
+    """
+    mask_bytes = mask.to_bytes((len(column) + 7) // 8, 'little')
+    if np is not None:
+        rows = np.unpackbits(np.frombuffer(mask_bytes, dtype=np.uint8), bitorder='little')[:len(column)]
+        return int(np.frombuffer(column, dtype=np.int64)[rows.view(bool)].sum())
+    total = 0
+    for value, is_selected in zip(column, (flag for byte in mask_bytes for flag in BYTE_ROWS[byte])):
+        if is_selected:
+            total += value
+    return total
+
+
+class _SealedChunk:
+    """
+    A chunk file. Only its header and blob sizes are read up front,
+    every blob is read and decompressed when a query needs it.
+    """
+    def __init__(self, path: Path):
+        """
+        Raises:
+            ValueError: If the file is not a chunk of this format version.
+        """
+        self.path = path
+        with open(path, mode='rb') as chunk_file:
+            head = chunk_file.read(CHUNK_HEADER.size + BLOB_SIZES.size)
+        if len(head) != CHUNK_HEADER.size + BLOB_SIZES.size:
+            raise ValueError(f"{path.name}: truncated hand history chunk")
+        magic, version, self.rows, self.first_ms, self.last_ms = CHUNK_HEADER.unpack_from(head)
+        if (magic, version) != (CHUNK_MAGIC, CHUNK_FORMAT_VERSION):
+            raise ValueError(f"{path.name}: not a hand history chunk of format version {CHUNK_FORMAT_VERSION}")
+
+        self.__offsets: list[tuple[int, int]] = []
+        offset = len(head)
+        for size in BLOB_SIZES.unpack_from(head, CHUNK_HEADER.size):
+            self.__offsets.append((offset, size))
+            offset += size
+
+    def _blob(self, number: int) -> bytes:
+        offset, size = self.__offsets[number]
+        with open(self.path, mode='rb') as chunk_file:
+            chunk_file.seek(offset)
+            return zlib.decompress(chunk_file.read(size))
+
+    def column(self, name: str) -> array:
+        column = array(HISTORY_COLUMNS[name])
+        column.frombytes(self._blob(COLUMN_BLOBS[name]))
+        return column
+
+    def bitmap(self, name: str, value: int) -> int:
+        return int.from_bytes(self._blob(BITMAP_BLOBS[name] + value), 'little')
+
+
+class _BufferedChunk:
+    """
+    The rows not sealed yet, the bitmaps are built when a query asks for them.
+    """
+    def __init__(self, columns: dict[str, array]):
+        self.columns = columns
+        self.rows = len(columns['timestamp'])
+        self.first_ms = min(columns['timestamp'])
+        self.last_ms = max(columns['timestamp'])
+        self.__bitmaps: dict[str, list[int]] = {}
+
+    def column(self, name: str) -> array:
+        return self.columns[name]
+
+    def bitmap(self, name: str, value: int) -> int:
+        if name not in self.__bitmaps:
+            self.__bitmaps[name] = _bitmaps(self.columns[name], INDEXED_COLUMNS[name])
+        return self.__bitmaps[name][value]
+
+
+class HandHistoryStore:
+    """
+    A SettleSink recording every round into a directory of columnar chunks,
+    and the queries over them, e.g.
+        rounds where the dealer did not qualify and the player had a flush:
+            store.count(is_dealer_qualified=False, player_hand_rank=HandRank.FLUSH)
+        pair plus hits by rank over the last week:
+            store.group_counts(
+                'player_hand_rank',
+                since=time.time() - 7 * 24 * 3600,
+                had_pair_plus_bet=True,
+                player_hand_rank=[rank for rank in HandRank if rank >= HandRank.PAIR]
+            )
+    Filters are keyword arguments on INDEXED_COLUMNS, each a value or a collection of values
+    (any of them). Outcomes are the strings of OUTCOMES. since / until are seconds since
+    the epoch, like time.time(), since included, until excluded.
+
+    Folded rounds are recorded with is_dealer_qualified and had_pair_plus_bet False
+    and no payouts, the dealer hand of a fold is never evaluated.
+    Not thread-safe, like the GameEngine it records.
+
+    Attributes:
+        directory (Path): Where the chunk files are.
+        chunk_rows (int): Rounds per chunk.
+        journal_every_rows (int): Rounds kept in memory only before they reach the journal.
+        clock (Callable[[], float]): Timestamp of a round, seconds since the epoch.
+        is_read_only (bool): Queries only, no lock is taken and nothing is recorded.
+    """
+    def __init__(
+        self,
+        directory: Path = HAND_HISTORY_DIR,
+        chunk_rows: int = 65_536,
+        clock: Callable[[], float] = time.time,
+        journal_every_rows: int = 1,
+        is_read_only: bool = False
+        ):
+        """
+        Raises:
+            ValueError: If chunk_rows or journal_every_rows is not positive.
+            RuntimeError: If another process writes to the directory.
+        """
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive.")
+        if journal_every_rows <= 0:
+            raise ValueError("journal_every_rows must be positive.")
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.journal_every_rows = journal_every_rows
+        self.clock = clock
+        self.is_read_only = is_read_only
+        self.__chunks: dict[str, _SealedChunk] = {}
+        self.__lock_file = None
+        self.__journal_file = None
+        self.__journal_pending = bytearray()
+        self._new_buffer()
+        directory.mkdir(parents=True, exist_ok=True)
+        if not is_read_only:
+            self._lock_writer()
+            self._recover_journal()
+
+    def _new_buffer(self) -> None:
+        self.__buffer = {name: array(typecode) for name, typecode in HISTORY_COLUMNS.items()}
+        # Every column after the timestamp, in the order of a row
+        self.__row_columns = list(self.__buffer.values())[1:]
+
+    def _lock_writer(self) -> None:
+        self.__lock_file = open(self.directory / WRITER_LOCK_NAME, mode='a+b')
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self.__lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.__lock_file.close()
+            self.__lock_file = None
+            raise RuntimeError(f"{self.directory} is already written by another process.") from None
+
+    def _recover_journal(self) -> None:
+        """
+        Number the next chunk, and take over the rows a killed writer left in its journal.
+        """
+        sealed = [int(path.stem.removeprefix('chunk_')) for path in self.directory.glob('chunk_*.thh')]
+        self.__chunk_number = max(sealed, default=-1) + 1
+        for journal_path in self.directory.glob('chunk_*.thj'):
+            if journal_path != self._journal_path():
+                journal_path.unlink() # sealed before the journal was dropped
+                continue
+            data = journal_path.read_bytes()
+            whole = len(data) - len(data) % JOURNAL_ROW.size # a torn last row never made it
+            for row in JOURNAL_ROW.iter_unpack(data[:whole]):
+                for column, value in zip(self.__buffer.values(), row):
+                    column.append(value)
+            if whole != len(data):
+                os.truncate(journal_path, whole)
+
+    def _journal_path(self) -> Path:
+        # Zero padded sequence numbers, so the chunks sort in the order they were written
+        return self.directory / f'chunk_{self.__chunk_number:08d}.thj'
+
+    def _write_journal(self) -> None:
+        if not self.__journal_pending:
+            return
+        if self.__journal_file is None:
+            self.__journal_file = open(self._journal_path(), mode='ab', buffering=0)
+        self.__journal_file.write(self.__journal_pending)
+        self.__journal_pending.clear()
+
+    def _drop_journal(self) -> None:
+        self.__journal_pending.clear()
+        if self.__journal_file is not None:
+            self.__journal_file.close()
+            self.__journal_file = None
+        self._journal_path().unlink(missing_ok=True)
+
+    @property
+    def buffered_rows(self) -> int:
+        return len(self.__buffer['timestamp'])
+
+    def record_settlement(
+        self,
+        player_hand_rank_value: HandRank,
+        is_dealer_qualified: bool,
+        outcome: str,
+        ante_bonus_payout: int,
+        had_pair_plus_bet: bool,
+        pair_plus_payout: int,
+        winnings: int,
+        net_win: int
+        ) -> None:
+        self._append(
+            player_hand_rank_value,
+            is_dealer_qualified,
+            OUTCOME_CODES[outcome],
+            had_pair_plus_bet,
+            ante_bonus_payout,
+            pair_plus_payout,
+            winnings,
+            net_win
+        )
+
+    def record_fold(self, player_hand_rank_value: HandRank, net_win: int) -> None:
+        self._append(player_hand_rank_value, False, OUTCOME_CODES['fold'], False, 0, 0, 0, net_win)
+
+    def _append(self, *row: int) -> None:
+        """
+        Raises:
+            ValueError: If the store is read-only.
+        """
+        if self.is_read_only:
+            raise ValueError("Cannot record rounds into a read-only hand history.")
+        timestamps = self.__buffer['timestamp']
+        timestamp = int(self.clock() * 1000)
+        timestamps.append(timestamp)
+        for column, value in zip(self.__row_columns, row):
+            column.append(value)
+        if len(timestamps) >= self.chunk_rows:
+            self.flush()
+            return
+        self.__journal_pending += JOURNAL_ROW.pack(timestamp, *row)
+        if len(self.__journal_pending) >= self.journal_every_rows * JOURNAL_ROW.size:
+            self._write_journal()
+
+    def flush(self) -> None:
+        """
+        Seal the buffered rounds into a chunk file, even if there are fewer than chunk_rows.
+        """
+        buffer = self.__buffer
+        if not buffer['timestamp']:
+            return
+
+        blobs = [zlib.compress(column.tobytes()) for column in buffer.values()]
+        for name, cardinality in INDEXED_COLUMNS.items():
+            for bitmap in _bitmaps(buffer[name], cardinality):
+                blobs.append(zlib.compress(bitmap.to_bytes((len(buffer[name]) + 7) // 8, 'little')))
+
+        timestamps = buffer['timestamp']
+        header = CHUNK_HEADER.pack(
+            CHUNK_MAGIC,
+            CHUNK_FORMAT_VERSION,
+            len(timestamps),
+            min(timestamps),
+            max(timestamps)
+        )
+        self._write_chunk(header + BLOB_SIZES.pack(*map(len, blobs)) + b''.join(blobs))
+        self._new_buffer()
+
+    def _write_chunk(self, data: bytes) -> None:
+        # The chunk of the journal, once it exists the journal is dropped
+        chunk_path = self._journal_path().with_suffix('.thh')
+        tmp_path = chunk_path.with_name(f'{chunk_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, mode='wb') as chunk_file:
+            chunk_file.write(data)
+        os.replace(tmp_path, chunk_path)
+        self._drop_journal()
+        self.__chunk_number += 1
+
+    def close(self) -> None:
+        """
+        Seal the buffered rounds, and let another writer have the directory.
+        """
+        if self.is_read_only or self.__lock_file is None:
+            return
+        self.flush()
+        self.__lock_file.close() # releases the lock
+        self.__lock_file = None
+
+    def _chunks(self) -> list[HistoryChunk]:
+        """
+        Every sealed chunk, including the ones written since the last query, then the buffer.
+        """
+        for path in sorted(self.directory.glob('chunk_*.thh')):
+            if path.name not in self.__chunks:
+                self.__chunks[path.name] = _SealedChunk(path)
+        chunks: list[HistoryChunk] = [self.__chunks[name] for name in sorted(self.__chunks)]
+        if self.buffered_rows:
+            chunks.append(_BufferedChunk(self.__buffer))
+        return chunks
+
+    @staticmethod
+    def _encode_filters(filters: dict[str, object]) -> dict[str, list[int]]:
+        """
+        Raises:
+            ValueError: If a filter is not on an indexed column, or a value is not one of it.
+        """
+        encoded: dict[str, list[int]] = {}
+        for name, wanted in filters.items():
+            if name not in INDEXED_COLUMNS:
+                raise ValueError(f"Cannot filter on '{name}', choose from {', '.join(INDEXED_COLUMNS)}.")
+            values = wanted if isinstance(wanted, Collection) and not isinstance(wanted, str) else [wanted]
+            codes: list[int] = []
+            for value in values:
+                code = OUTCOME_CODES.get(value) if name == 'outcome' else int(value)
+                if code is None or not 0 <= code < INDEXED_COLUMNS[name]:
+                    raise ValueError(f"{value!r} is not a value of '{name}'.")
+                codes.append(code)
+            encoded[name] = codes
+        return encoded
+
+    def _selections(
+        self,
+        since: float | None,
+        until: float | None,
+        filters: dict[str, object]
+        ) -> list[tuple[HistoryChunk, int]]:
+        """
+        The chunks with matching rows, and the bitmap of those rows in each.
+        """
+        encoded = self._encode_filters(filters)
+        since_ms = None if since is None else int(since * 1000)
+        until_ms = None if until is None else int(until * 1000)
+
+        selections: list[tuple[HistoryChunk, int]] = []
+        for chunk in self._chunks():
+            if (since_ms is not None and chunk.last_ms < since_ms) or (until_ms is not None and chunk.first_ms >= until_ms):
+                continue
+
+            mask = (1 << chunk.rows) - 1
+            for name, codes in encoded.items():
+                matching = 0
+                for code in codes:
+                    matching |= chunk.bitmap(name, code)
+                mask &= matching
+                if not mask:
+                    break
+
+            is_inside = (since_ms is None or chunk.first_ms >= since_ms) and (until_ms is None or chunk.last_ms < until_ms)
+            if mask and not is_inside:
+                mask &= _time_mask(chunk.column('timestamp'), since_ms, until_ms)
+            if mask:
+                selections.append((chunk, mask))
+        return selections
+
+    def count(self, since: float | None = None, until: float | None = None, **filters: object) -> int:
+        """
+        Returns:
+            int: The number of rounds matching the filters.
+        Raises:
+            ValueError: See the class docstring for valid filters.
+        """
+        return sum(mask.bit_count() for _, mask in self._selections(since, until, filters))
+
+    def group_counts(
+        self,
+        group_by: str,
+        since: float | None = None,
+        until: float | None = None,
+        **filters: object
+        ) -> dict[HandRank | bool | str, int]:
+        """
+        Rounds matching the filters, by value of an indexed column.
+        Returns:
+            dict[HandRank | bool | str, int]: Every value of the column, zero counts included.
+        Raises:
+            ValueError: If group_by is not an indexed column, see the class docstring for filters.
+        """
+        if group_by not in INDEXED_COLUMNS:
+            raise ValueError(f"Cannot group by '{group_by}', choose from {', '.join(INDEXED_COLUMNS)}.")
+        keys: list[HandRank | bool | str] = {
+            'player_hand_rank': list(HandRank),
+            'outcome': list(OUTCOMES),
+        }.get(group_by, [False, True])
+
+        counts = [0] * INDEXED_COLUMNS[group_by]
+        for chunk, mask in self._selections(since, until, filters):
+            for code in range(len(counts)):
+                counts[code] += (mask & chunk.bitmap(group_by, code)).bit_count()
+        return dict(zip(keys, counts))
+
+    def aggregate(self, since: float | None = None, until: float | None = None, **filters: object) -> HistoryAggregate:
+        """
+        Count and sum the payouts of the rounds matching the filters.
+        Raises:
+            ValueError: See the class docstring for valid filters.
+        """
+        rows = 0
+        sums = dict.fromkeys(SUM_COLUMNS, 0)
+        for chunk, mask in self._selections(since, until, filters):
+            rows += mask.bit_count()
+            is_full = mask.bit_count() == chunk.rows
+            for name in SUM_COLUMNS:
+                column = chunk.column(name)
+                sums[name] += sum(column) if is_full else _masked_sum(column, mask)
+        return HistoryAggregate(rows, sums)
@@ -0,0 +1,251 @@
+"""
+The progressive jackpot pool, shared by every table of every process on the host.
+
+The pool lives in a small memory-mapped file: the jackpot, then SHARD_COUNT contribution
+shards, one cache line each. Every table feeds the pool through its own JackpotPool handle:
+contributions are summed in the handle and added to the handle's shard every flush_every
+rounds, under the lock of that shard only. Tables on different shards never wait for each
+other, and no table takes a lock every round.
+
+The jackpot shown is the jackpot plus every shard, read without any lock. A winning hand
+claims its percentage under the claim lock: the shards are merged into the jackpot, the
+payout is taken out, and a jackpot left below the seed amount is topped up to it, all at
+once, so two tables hitting at the same time are paid one after the other from the real pool.
+
+Locks are fcntl byte-range locks on the pool file, for other processes, plus a threading lock
+per range, for other threads of the same process (fcntl locks are per process).
+fcntl locks are also released when the process closes any fd of the file (an mmap holds one
+too), so the handles of a process share one fd and one mapping of the pool file,
+closed with the last handle.
+Without fcntl (Windows), the pool is only shared by the tables of one process.
+
+Layout (native int64): [magic, version, jackpot, reseeded total, ...] in the first cache line,
+then one cache line per shard, its contributions in the first cell.
+"""
+import itertools
+import mmap
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.services.utils.get_file_path import JACKPOT_POOL_PATH
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover - depends on the platform
+    fcntl = None
+
+CACHE_LINE = 64
+CELLS_PER_LINE = CACHE_LINE // 8
+SHARD_COUNT = 32
+
+POOL_MAGIC = int.from_bytes(b'TCJP', 'little')
+POOL_FORMAT_VERSION = 1
+POOL_FILE_SIZE = CACHE_LINE * (1 + SHARD_COUNT)
+
+# Cells of the header line
+MAGIC_CELL, VERSION_CELL, JACKPOT_CELL, RESEEDED_CELL = 0, 1, 2, 3
+
+# Handles of this process, spread over the shards in turn
+_handle_numbers = itertools.count()
+
+# Threading locks by (pool file, byte offset), shared by every handle of the process
+_range_locks: dict[tuple[str, int], threading.Lock] = {}
+_range_locks_lock = threading.Lock()
+
+
+
+class _SharedPoolFile:
+    """
+    The fd and the mapping of a pool file, shared by every handle of the process on it.
+    """
+    def __init__(self, path: Path):
+        self.file = open(path, mode='a+b')
+        self.mapped: mmap.mmap | None = None
+        self.handles = 0
+
+# Open pool files by path
+_shared_files: dict[str, _SharedPoolFile] = {}
+
+
+def _range_lock(path: Path, offset: int) -> threading.Lock:
+    with _range_locks_lock:
+        return _range_locks.setdefault((str(path), offset), threading.Lock())
+
+
+def _open_shared_file(path: Path) -> _SharedPoolFile:
+    with _range_locks_lock:
+        shared = _shared_files.get(str(path))
+        if shared is None:
+            shared = _shared_files[str(path)] = _SharedPoolFile(path)
+        shared.handles += 1
+        return shared
+
+
+def _close_shared_file(path: Path) -> None:
+    # Closing an fd drops the fcntl locks of the whole process, only the last handle does it
+    with _range_locks_lock:
+        shared = _shared_files[str(path)]
+        shared.handles -= 1
+        if shared.handles == 0:
+            del _shared_files[str(path)]
+            if shared.mapped is not None:
+                shared.mapped.close()
+            shared.file.close()
+
+
+class JackpotPool:
+    """
+    One table's handle on the host's progressive pool, and the rules of the progressive bet.
+    Not thread-safe, like the GameEngine that owns it: give every table its own handle.
+
+    Attributes:
+        bet (int): The fixed stake of the progressive bet.
+        contribution_percent (int): Part of every stake that goes into the jackpot.
+        seed_amount (int): What the jackpot restarts from, funded by the house.
+        jackpot_percent_table (Mapping[int, int]): Percentage of the jackpot won by hand rank,
+            hand ranks not in the table do not win.
+        flush_every (int): Rounds of contributions held in the handle before they reach the shard.
+        shard (int): The shard of this handle.
+    """
+    def __init__(
+        self,
+        bet: int,
+        contribution_percent: int,
+        seed_amount: int,
+        jackpot_percent_table: Mapping[int, int],
+        path: Path = JACKPOT_POOL_PATH,
+        flush_every: int = 32
+        ):
+        """
+        Raises:
+            ValueError: If the pool file exists but is not a pool of this format version.
+        """
+        self.bet = bet
+        self.contribution_percent = contribution_percent
+        self.seed_amount = seed_amount
+        self.jackpot_percent_table = jackpot_percent_table
+        self.path = path
+        self.flush_every = flush_every
+        self.shard = next(_handle_numbers) % SHARD_COUNT
+        self.__pending = 0
+        self.__pending_rounds = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.__shared = _open_shared_file(path)
+        self.__file = self.__shared.file
+        self.__is_closed = False
+        with self._locked(0):
+            if os.fstat(self.__file.fileno()).st_size == 0:
+                self.__file.write(bytes(POOL_FILE_SIZE))
+                self.__file.flush()
+                is_new = True
+            else:
+                is_new = False
+            if self.__shared.mapped is None:
+                self.__shared.mapped = mmap.mmap(self.__file.fileno(), POOL_FILE_SIZE)
+            self.__cells = memoryview(self.__shared.mapped).cast('q')
+            if is_new:
+                self.__cells[MAGIC_CELL] = POOL_MAGIC
+                self.__cells[VERSION_CELL] = POOL_FORMAT_VERSION
+                self.__cells[JACKPOT_CELL] = seed_amount
+                self.__cells[RESEEDED_CELL] = seed_amount
+        if (self.__cells[MAGIC_CELL], self.__cells[VERSION_CELL]) != (POOL_MAGIC, POOL_FORMAT_VERSION):
+            self.close()
+            raise ValueError(f"{path} is not a jackpot pool of format version {POOL_FORMAT_VERSION}.")
+
+    @contextmanager
+    def _locked(self, line: int) -> Iterator[None]:
+        """
+        Exclusive access to one cache line of the pool: 0 for the claim lock, 1 + n for shard n.
+        """
+        offset = line * CACHE_LINE
+        with _range_lock(self.path, offset):
+            if fcntl is None:
+                yield
+                return
+            fcntl.lockf(self.__file.fileno(), fcntl.LOCK_EX, CACHE_LINE, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.__file.fileno(), fcntl.LOCK_UN, CACHE_LINE, offset)
+
+    def _shard_cell(self, shard: int) -> int:
+        return (1 + shard) * CELLS_PER_LINE
+
+    @property
+    def jackpot(self) -> int:
+        """
+        The current jackpot, contributions not merged yet included. Lock-free, for display.
+        """
+        cells = self.__cells
+        return cells[JACKPOT_CELL] + sum(cells[self._shard_cell(n)] for n in range(SHARD_COUNT)) + self.__pending
+
+    @property
+    def reseeded_total(self) -> int:
+        """
+        Everything the house has put into the pool, the first seed included.
+        """
+        return self.__cells[RESEEDED_CELL]
+
+    def contribute(self, stake: int) -> None:
+        """
+        Feed the contribution_percent of a stake to the pool.
+        """
+        self.__pending += stake * self.contribution_percent // 100
+        self.__pending_rounds += 1
+        if self.__pending_rounds >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Add the contributions held in the handle to its shard.
+        """
+        if self.__pending_rounds == 0:
+            return
+        with self._locked(1 + self.shard):
+            self.__cells[self._shard_cell(self.shard)] += self.__pending
+        self.__pending = 0
+        self.__pending_rounds = 0
+
+    def payout_percent(self, hand_rank_value: int) -> int:
+        return self.jackpot_percent_table.get(hand_rank_value, 0)
+
+    def claim(self, hand_rank_value: int) -> int:
+        """
+        Pay a hand its percentage of the jackpot, atomically across every table of the host.
+        Returns:
+            int: The payout, 0 if the hand rank does not win.
+        """
+        percent = self.payout_percent(hand_rank_value)
+        if percent <= 0:
+            return 0
+        self.flush()
+
+        cells = self.__cells
+        with self._locked(0):
+            for shard in range(SHARD_COUNT):
+                with self._locked(1 + shard):
+                    cells[JACKPOT_CELL] += cells[self._shard_cell(shard)]
+                    cells[self._shard_cell(shard)] = 0
+
+            payout = cells[JACKPOT_CELL] * percent // 100
+            cells[JACKPOT_CELL] -= payout
+            if cells[JACKPOT_CELL] < self.seed_amount:
+                cells[RESEEDED_CELL] += self.seed_amount - cells[JACKPOT_CELL]
+                cells[JACKPOT_CELL] = self.seed_amount
+        return payout
+
+    def close(self) -> None:
+        """
+        Flush the contributions held in the handle, and release the pool file.
+        """
+        if self.__is_closed:
+            return
+        if hasattr(self, '_JackpotPool__cells'):
+            self.flush()
+            self.__cells.release()
+        self.__is_closed = True
+        _close_shared_file(self.path)
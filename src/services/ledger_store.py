@@ -0,0 +1,196 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.enums.ledger_entry_type import LedgerEntryType
+from src.services.utils.get_file_path import LEDGER_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_rounds (
+    round_id      INTEGER PRIMARY KEY,
+    session_id    TEXT    NOT NULL,
+    round_number  INTEGER NOT NULL,
+    net_amount    INTEGER NOT NULL,
+    balance_after INTEGER NOT NULL,
+    committed_at  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ledger_rounds_by_session ON ledger_rounds (session_id, round_number);
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    round_id   INTEGER NOT NULL REFERENCES ledger_rounds (round_id),
+    seq        INTEGER NOT NULL,
+    entry_type TEXT    NOT NULL,
+    amount     INTEGER NOT NULL,
+    PRIMARY KEY (round_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class LedgerRound:
+    """
+    The chip movements of one round of one session, committed as a single net update.
+    Attributes:
+        entries (tuple[tuple[LedgerEntryType, int], ...]): Every movement in order,
+            negative amounts are debits.
+    """
+    session_id: str
+    round_number: int
+    net_amount: int
+    balance_after: int
+    entries: tuple[tuple[LedgerEntryType, int], ...]
+
+
+class LedgerStore:
+    """
+    Append-only SQLite ledger with group commit.
+
+    Rounds are queued by append() and written by a background thread: everything queued
+    while the previous transaction was committing goes into the next transaction, so many
+    rounds (of many sessions) share one commit, and one fsync, instead of paying one each.
+    Every round lands atomically, its entries and its net update in the same transaction.
+
+    Attributes:
+        path (Path): The SQLite database file.
+        commit_interval_seconds (float): How long the writer gathers rounds before committing.
+        last_error (sqlite3.Error | None): Why the last transaction failed, if it failed.
+            The rounds of a failed transaction are queued again.
+    """
+    def __init__(self, path: Path = LEDGER_PATH, commit_interval_seconds: float = 0.05):
+        self.path = path
+        self.commit_interval_seconds = commit_interval_seconds
+        self.last_error: sqlite3.Error | None = None
+        self.__pending: list[LedgerRound] = []
+        self.__condition = threading.Condition()
+        self.__is_writing = False
+        self.__is_closed = False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect() # fail early on a broken database
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self.__thread = threading.Thread(target=self._write_loop, name='ledger-writer', daemon=True)
+        self.__thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # Durable at every commit, which is affordable because commits are grouped
+        connection.execute('PRAGMA synchronous=FULL')
+        return connection
+
+    def append(self, ledger_round: LedgerRound) -> None:
+        """
+        Queue a round, never blocks on disk I/O.
+        """
+        with self.__condition:
+            self.__pending.append(ledger_round)
+            self.__condition.notify_all()
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                with self.__condition:
+                    while not self.__pending and not self.__is_closed:
+                        self.__condition.wait()
+                    if not self.__pending:
+                        return
+                    # Let more rounds join this group
+                    deadline = time.monotonic() + self.commit_interval_seconds
+                    while not self.__is_closed and (remaining := deadline - time.monotonic()) > 0:
+                        self.__condition.wait(remaining)
+                    batch = self.__pending
+                    self.__pending = []
+                    self.__is_writing = True
+
+                try:
+                    self._write_batch(connection, batch)
+                except sqlite3.Error as e:
+                    self.last_error = e
+                    with self.__condition:
+                        if self.__is_closed: # nobody left to retry for
+                            return
+                        self.__pending[:0] = batch
+                    time.sleep(self.commit_interval_seconds)
+                finally:
+                    with self.__condition:
+                        self.__is_writing = False
+                        self.__condition.notify_all()
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: list[LedgerRound]) -> None:
+        committed_at = time.time()
+        with connection: # one transaction, one commit
+            for ledger_round in batch:
+                cursor = connection.execute(
+                    'INSERT INTO ledger_rounds (session_id, round_number, net_amount, balance_after, committed_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (
+                        ledger_round.session_id,
+                        ledger_round.round_number,
+                        ledger_round.net_amount,
+                        ledger_round.balance_after,
+                        committed_at,
+                    )
+                )
+                round_id = cursor.lastrowid
+                connection.executemany(
+                    'INSERT INTO ledger_entries (round_id, seq, entry_type, amount) VALUES (?, ?, ?, ?)',
+                    [
+                        (round_id, seq, str(entry_type), amount)
+                        for seq, (entry_type, amount) in enumerate(ledger_round.entries)
+                    ]
+                )
+
+    def get_last_round_number(self, session_id: str) -> int:
+        """
+        The number of the last committed round of a session, 0 if there is none,
+        so a restored session continues its numbering.
+        """
+        self.flush()
+        connection = sqlite3.connect(self.path)
+        try:
+            (last_round_number,) = connection.execute(
+                'SELECT COALESCE(MAX(round_number), 0) FROM ledger_rounds WHERE session_id = ?',
+                (session_id,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return last_round_number
+
+    def get_last_balance(self, session_id: str) -> int | None:
+        """
+        The balance after the last committed round of a session, None if there is none,
+        so a restored session can explain any difference with its checkpoint.
+        """
+        self.flush()
+        connection = sqlite3.connect(self.path)
+        try:
+            row = connection.execute(
+                'SELECT balance_after FROM ledger_rounds WHERE session_id = ? ORDER BY round_number DESC LIMIT 1',
+                (session_id,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row is not None else None
+
+    def flush(self) -> None:
+        """
+        Block until every queued round is committed.
+        """
+        with self.__condition:
+            while self.__pending or self.__is_writing:
+                self.__condition.wait()
+
+    def close(self) -> None:
+        """
+        Commit what is still queued, then stop the writer thread.
+        """
+        with self.__condition:
+            self.__is_closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
@@ -1,19 +1,22 @@
 import locale
-from src.services.utils.get_file_path import get_locale_dir
-from src.services.utils.config_loader import load_messages
+from typing import Mapping
+from src.services.utils.get_file_path import DEFAULT_LOCALE
+from src.services.utils.config_snapshot import get_config_snapshot
 
 class LocaleService:
     """
     Based on system locale settings, manages the current language for the application
     and provides access to localized message configurations and rules file paths.
+    Messages and rules of all locales are preloaded, so switching languages
+    or reading the rules never touches the disk.
     Attributes:
         default_lang (str): The default language code to fall back on.
         current_lang_code (str): The currently detected or set language code.
     Methods:
-        get_messages_config() -> dict:
-            Loads and returns the message configuration for the current language.
-        get_rules_file_path() -> str:
-            Returns the file path to the rules text file for the current language.
+        get_messages_config() -> Mapping[str, str]:
+            Returns the preloaded message configuration for the current language.
+        get_rules_lines() -> tuple[str, ...]:
+            Returns the preloaded lines of the rules for the current language.
         switch_language(lang_code: str) -> None:
             Switches the current language to the specified language code.
             
@@ -21,6 +24,7 @@ class LocaleService:
     def __init__(self, default_lang: str = "en_US"):
         self.default_lang = default_lang
         self.current_lang_code = self._detect_system_locale()
+        self.snapshot = get_config_snapshot()
 
     def _detect_system_locale(self) -> str:
         
@@ -48,13 +52,27 @@ class LocaleService:
         
         return self.default_lang
 
-    def get_messages_config(self) -> dict:
-        message_path = get_locale_dir(self.current_lang_code) / 'messages.json'
-        return load_messages(message_path)
+    def refresh(self) -> None:
+        """
+        Adopt the latest published snapshot (see ConfigWatcher).
+        """
+        self.snapshot = get_config_snapshot()
 
-    def get_rules_file_path(self) -> str:
-        rules_path = get_locale_dir(self.current_lang_code) / 'rules.txt'
-        return str(rules_path)
+    def get_messages_config(self) -> Mapping[str, str]:
+        messages = self.snapshot.messages
+        if self.current_lang_code in messages:
+            return messages[self.current_lang_code]
+        # Same fallback as get_locale_dir
+        return messages[DEFAULT_LOCALE]
+
+    def get_rules_lines(self) -> tuple[str, ...]:
+        """
+        Returns:
+            tuple[str, ...]: Empty if the locale ships no rules.txt.
+        """
+        # Same fallback as get_messages_config: unknown locales read the default one
+        lang_code = self.current_lang_code if self.current_lang_code in self.snapshot.messages else DEFAULT_LOCALE
+        return self.snapshot.rules.get(lang_code, ())
 
     def switch_language(self, lang_code: str):
         self.current_lang_code = lang_code
\ No newline at end of file
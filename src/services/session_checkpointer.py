@@ -0,0 +1,115 @@
+import os
+import threading
+from pathlib import Path
+
+from src.models.session_state import SessionState
+from src.services.utils.get_file_path import SESSIONS_DIR
+
+class SessionCheckpointer:
+    """
+    Writes session snapshots in a background thread, one small binary file per session.
+
+    Tables submit a snapshot at every round boundary and move on right away.
+    Submissions are coalesced: if a session is submitted again before the writer got to it,
+    only the latest snapshot is written. Every file is replaced atomically
+    (write a temp file, then rename), so a crash leaves either the old or the new snapshot.
+
+    Attributes:
+        directory (Path): Where the <session_id>.bin files live.
+        last_error (OSError | None): Why the last write failed, if it failed.
+    """
+    def __init__(self, directory: Path = SESSIONS_DIR):
+        self.directory = directory
+        self.last_error: OSError | None = None
+        self.__pending: dict[str, bytes] = {}
+        self.__condition = threading.Condition()
+        self.__is_writing = False
+        self.__is_closed = False
+        self.__thread = threading.Thread(target=self._write_loop, name='session-checkpointer', daemon=True)
+        self.__thread.start()
+
+    def get_path(self, session_id: str) -> Path:
+        return self.directory / f'{session_id}.bin'
+
+    def submit(self, session_id: str, state: SessionState) -> None:
+        """
+        Queue a snapshot of a session, never blocks on disk I/O.
+        """
+        raw = state.to_bytes()
+        with self.__condition:
+            self.__pending[session_id] = raw
+            self.__condition.notify_all()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__pending and not self.__is_closed:
+                    self.__condition.wait()
+                if not self.__pending:
+                    return
+                batch = self.__pending
+                self.__pending = {}
+                self.__is_writing = True
+
+            for session_id, raw in batch.items():
+                self._write_file(self.get_path(session_id), raw)
+
+            with self.__condition:
+                self.__is_writing = False
+                self.__condition.notify_all()
+
+    def _write_file(self, path: Path, raw: bytes) -> None:
+        tmp_path = path.with_name(f'{path.name}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, mode='wb') as session_file:
+                session_file.write(raw)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.last_error = e
+            tmp_path.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """
+        Block until every submitted snapshot is on disk.
+        """
+        with self.__condition:
+            while self.__pending or self.__is_writing:
+                self.__condition.wait()
+
+    def close(self) -> None:
+        """
+        Write what is still pending, then stop the writer thread.
+        """
+        with self.__condition:
+            self.__is_closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+
+    def load(self, session_id: str) -> SessionState | None:
+        """
+        Returns:
+            SessionState | None: The last snapshot of a session, None if there is none
+                or it can not be read.
+        """
+        try:
+            return SessionState.from_bytes(self.get_path(session_id).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def load_all(self) -> dict[str, SessionState]:
+        """
+        The last snapshot of every session in the directory, unreadable ones are skipped.
+        """
+        sessions: dict[str, SessionState] = {}
+        if not self.directory.is_dir():
+            return sessions
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.bin'):
+                continue
+            try:
+                with open(entry.path, mode='rb') as session_file:
+                    sessions[entry.name[:-len('.bin')]] = SessionState.from_bytes(session_file.read())
+            except (OSError, ValueError):
+                continue
+        return sessions
@@ -0,0 +1,177 @@
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from src.core.game_engine import GameEngine
+from src.models.deck import Deck
+from src.models.participants import Player, Dealer
+from src.models.rule_set import RuleSet
+from src.services.wallet import Wallet
+
+
+@dataclass(eq=False)
+class ManagedSession:
+    """
+    A GameEngine and the lock that guards it.
+    Attributes:
+        game_rule (str): The game rule the session plays by, its rule set is looked up
+            in the published rule sets.
+        rule_generation (int): The generation of the rule sets last staged into the engine.
+        is_removed (bool): Set by remove_session under the lock, for callers that looked
+            the session up before it was removed.
+    """
+    session_id: str
+    engine: GameEngine
+    game_rule: str
+    rule_generation: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    is_removed: bool = False
+
+
+class SessionManager:
+    """
+    Thread-safe front end for driving many GameEngines from a thread pool,
+    e.g. behind a synchronous (WSGI-style) server.
+
+    A GameEngine is not thread-safe, so every session has its own lock and is only
+    touched through acquire(): requests for different sessions run side by side,
+    requests for the same session take turns. No lock is shared between sessions.
+
+    Rule sets are immutable and published as a whole, (generation, rule sets) behind
+    a single reference, so readers never lock and always see a consistent pair.
+    A session picks up a new generation the next time it is acquired, through
+    GameEngine.stage_game_rules: a round in progress is settled with the rules it
+    started with, the new ones take effect at its round boundary. A reload can no longer
+    interleave with settle.
+
+    Attributes:
+        generation (int): Bumped by every publish_rule_sets.
+        rule_sets (Mapping[str, RuleSet]): The latest rule sets by game rule.
+    """
+    def __init__(self, rule_sets: Mapping[str, RuleSet]):
+        self.__published: tuple[int, Mapping[str, RuleSet]] = (0, MappingProxyType(dict(rule_sets)))
+        self.__sessions: dict[str, ManagedSession] = {}
+        # Writers only: creating or removing sessions, publishing rule sets
+        self.__registry_lock = threading.Lock()
+        self.__publish_lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self.__published[0]
+
+    @property
+    def rule_sets(self) -> Mapping[str, RuleSet]:
+        return self.__published[1]
+
+    @property
+    def session_ids(self) -> list[str]:
+        return list(self.__sessions)
+
+    def publish_rule_sets(self, rule_sets: Mapping[str, RuleSet]) -> int:
+        """
+        Swap in new rule sets, the game rules not given keep their current rule set.
+        Returns:
+            int: The new generation.
+        """
+        with self.__publish_lock:
+            generation, current = self.__published
+            # Copy on write: the old mapping may still be read by other threads
+            self.__published = (generation + 1, MappingProxyType({**current, **rule_sets}))
+            return generation + 1
+
+    def create_session(
+        self,
+        session_id: str,
+        balance: int,
+        game_rule: str = 'standard',
+        deck: Deck | None = None,
+        wallet: Wallet | None = None
+        ) -> None:
+        """
+        Raises:
+            ValueError: If the session already exists or the game rule has no rule set.
+        """
+        generation, rule_sets = self.__published
+        if game_rule not in rule_sets:
+            raise ValueError(f"No rule set for game rule '{game_rule}'.")
+        rule_set = rule_sets[game_rule]
+        engine = GameEngine(
+            Player(balance),
+            Dealer(),
+            rule_set.evaluator,
+            rule_set.ante_bonus,
+            rule_set.pair_plus,
+            rule_set.is_table_limit_enabled,
+            rule_set.limits,
+            deck,
+            wallet
+        )
+        with self.__registry_lock:
+            if session_id in self.__sessions:
+                raise ValueError(f"Session '{session_id}' already exists.")
+            self.__sessions[session_id] = ManagedSession(session_id, engine, game_rule, generation)
+
+    def remove_session(self, session_id: str) -> GameEngine:
+        """
+        Waits for the request in progress on the session, if any.
+        Returns:
+            GameEngine: The engine of the removed session.
+        Raises:
+            KeyError: If there is no such session.
+        """
+        with self.__registry_lock:
+            session = self.__sessions.pop(session_id)
+        with session.lock:
+            session.is_removed = True
+            return session.engine
+
+    @contextmanager
+    def acquire(self, session_id: str) -> Iterator[GameEngine]:
+        """
+        Exclusive access to the engine of a session, for the duration of the with block.
+        Raises:
+            KeyError: If there is no such session.
+        """
+        session = self.__sessions[session_id] # a plain dict read, atomic
+        with session.lock:
+            # Removed while this request waited for the lock
+            if session.is_removed:
+                raise KeyError(session_id)
+            self._sync_rules(session)
+            yield session.engine
+
+    def switch_game_rule(self, session_id: str, game_rule: str) -> None:
+        """
+        Play by another game rule from the next round boundary on.
+        Raises:
+            KeyError: If there is no such session.
+            ValueError: If the game rule has no rule set.
+        """
+        if game_rule not in self.rule_sets:
+            raise ValueError(f"No rule set for game rule '{game_rule}'.")
+        session = self.__sessions[session_id]
+        with session.lock:
+            if session.is_removed:
+                raise KeyError(session_id)
+            session.game_rule = game_rule
+            session.rule_generation = -1 # stale whatever the generation
+            self._sync_rules(session)
+
+    def _sync_rules(self, session: ManagedSession) -> None:
+        """
+        Stage the latest rule set into the engine, the caller holds the session lock.
+        """
+        generation, rule_sets = self.__published
+        if session.rule_generation == generation:
+            return
+        rule_set = rule_sets[session.game_rule]
+        session.engine.stage_game_rules(
+            new_ante_table=rule_set.ante_bonus,
+            new_pair_plus_table=rule_set.pair_plus,
+            new_is_table_limit_enabled=rule_set.is_table_limit_enabled,
+            new_limits_table=rule_set.limits,
+            new_evaluator=rule_set.evaluator
+        )
+        session.rule_generation = generation
@@ -14,16 +14,15 @@ def _read_config_file(file_path: str) -> dict:
         config_data = json.load(json_file)
     return config_data
 
-def load_game_engine_config(file_path: str) -> dict[str, int | bool | dict]:
-    """Load the game engine configuration from a JSON file.
+def parse_game_engine_config(data: dict) -> dict[str, int | bool | dict]:
+    """Turn the raw game engine JSON data into the layout used by the app.
 
     Args:
-        file_path (str): The path to the game engine configuration file.
+        data (dict): The raw game engine configuration data.
 
     Returns:
         dict[str, int | bool | dict]: The game engine configuration data.
     """
-    data = _read_config_file(file_path)
 
     # helper: does all dirty job (str key -> int key)
     def _parse_table(table_data):
@@ -34,6 +33,16 @@ def load_game_engine_config(file_path: str) -> dict[str, int | bool | dict]:
             'player_initial_balance': data['player_initial_balance'],
             'is_table_limit_enabled':data['is_table_limit_enabled'],
             'limits': data['limits'],
+            'shoe': data['shoe'],
+            'evaluator_backend': data['evaluator_backend'],
+            'progressive': {
+                **data['progressive'],
+                'jackpot_percent_table': _parse_table(data['progressive']['jackpot_percent_table'])
+            },
+            'six_card_bonus': {
+                **data['six_card_bonus'],
+                'payout_rate_table': _parse_table(data['six_card_bonus']['payout_rate_table'])
+            },
         },
 
         'standard': {
@@ -46,6 +55,17 @@ def load_game_engine_config(file_path: str) -> dict[str, int | bool | dict]:
         }
     }
 
+def load_game_engine_config(file_path: str) -> dict[str, int | bool | dict]:
+    """Load the game engine configuration from a JSON file.
+
+    Args:
+        file_path (str): The path to the game engine configuration file.
+
+    Returns:
+        dict[str, int | bool | dict]: The game engine configuration data.
+    """
+    return parse_game_engine_config(_read_config_file(file_path))
+
 def load_messages(file_path: str) -> dict[str, str]:
     return _read_config_file(file_path)
 
@@ -53,4 +73,4 @@ def load_game_controller_config(file_path: str) -> dict[str, int | float]:
     return _read_config_file(file_path)
 
 def load_app_controller_config(file_path: str) -> dict[str, float | dict]:
-    return _read_config_file(file_path)
\ No newline at end of file
+    return _read_config_file(file_path)
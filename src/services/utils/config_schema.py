@@ -0,0 +1,241 @@
+"""
+Schema checks for the raw (not yet parsed) config and locale files.
+Every check returns a list of human readable problems instead of raising,
+so that all problems of all files can be reported at once.
+"""
+from enum import IntEnum
+
+from src.enums.five_card_hand_rank import FiveCardHandRank
+from src.enums.hand_rank import HandRank
+from src.enums.ui_keys import UIKeys
+
+# Standard rules do not know the Mini Royal Flush
+STANDARD_HAND_RANKS: frozenset[int] = frozenset(
+    rank.value for rank in HandRank if rank != HandRank.MINI_ROYAL_FLUSH
+)
+CALIFORNIA_HAND_RANKS: frozenset[int] = frozenset(rank.value for rank in HandRank)
+FIVE_CARD_HAND_RANKS: frozenset[int] = frozenset(rank.value for rank in FiveCardHandRank)
+
+RATE_TABLES: dict[str, frozenset[int]] = {
+    'ante_bonus_payout_rate_table': STANDARD_HAND_RANKS,
+    'pair_plus_payout_rate_table': STANDARD_HAND_RANKS,
+    'cal_ante_bonus_payout_rate_table': CALIFORNIA_HAND_RANKS,
+    'cal_pair_plus_payout_rate_table': CALIFORNIA_HAND_RANKS,
+}
+
+# see src/core/evaluators/evaluator_registry.py
+EVALUATOR_BACKENDS: tuple[str, ...] = ('reference', 'perfect_hash', 'mapped_table')
+
+LIMIT_KEYS: tuple[str, ...] = (
+    'min_ante_bet',
+    'min_pair_plus_bet',
+    'max_ante_bet',
+    'max_pair_plus_bet',
+)
+
+
+def _is_non_negative_int(value) -> bool:
+    # bool is a subclass of int, but `true` is not a valid amount of chips
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def _is_non_negative_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _check_rate_table(
+    name: str,
+    table,
+    expected_ranks: frozenset[int],
+    rank_enum: type[IntEnum] = HandRank
+    ) -> list[str]:
+    if not isinstance(table, dict):
+        return [f"{name} must be an object"]
+
+    problems: list[str] = []
+    keys: set[int] = set()
+    for key, rate in table.items():
+        try:
+            keys.add(int(key))
+        except ValueError:
+            problems.append(f"{name}: key '{key}' is not a {rank_enum.__name__} value")
+            continue
+        if not _is_non_negative_int(rate):
+            problems.append(f"{name}: rate of '{key}' must be a non-negative integer")
+
+    if missing := sorted(expected_ranks - keys):
+        names = ', '.join(rank_enum(rank).name for rank in missing)
+        problems.append(f"{name}: missing hand ranks {names}")
+    if unknown := sorted(keys - expected_ranks):
+        problems.append(f"{name}: unknown hand ranks {unknown}")
+
+    return problems
+
+
+def _check_shoe(shoe) -> list[str]:
+    if not isinstance(shoe, dict):
+        return ["shoe must be an object"]
+
+    problems: list[str] = []
+    deck_count = shoe.get('deck_count')
+    if not _is_non_negative_int(deck_count) or deck_count == 0:
+        problems.append("shoe.deck_count must be a positive integer")
+
+    penetration = shoe.get('penetration')
+    if not _is_non_negative_number(penetration) or not (0 < penetration <= 1):
+        problems.append("shoe.penetration must be a number in (0, 1]")
+
+    if not isinstance(shoe.get('is_continuous_shuffler'), bool):
+        problems.append("shoe.is_continuous_shuffler must be a boolean")
+
+    return problems
+
+
+def _check_progressive(progressive) -> list[str]:
+    if not isinstance(progressive, dict):
+        return ["progressive must be an object"]
+
+    problems: list[str] = []
+    if not isinstance(progressive.get('is_enabled'), bool):
+        problems.append("progressive.is_enabled must be a boolean")
+
+    bet = progressive.get('bet')
+    if not _is_non_negative_int(bet) or bet == 0:
+        problems.append("progressive.bet must be a positive integer")
+
+    contribution_percent = progressive.get('contribution_percent')
+    if not _is_non_negative_int(contribution_percent) or contribution_percent > 100:
+        problems.append("progressive.contribution_percent must be an integer in [0, 100]")
+
+    if not _is_non_negative_int(progressive.get('seed_amount')):
+        problems.append("progressive.seed_amount must be a non-negative integer")
+
+    table = progressive.get('jackpot_percent_table')
+    if not isinstance(table, dict):
+        problems.append("progressive.jackpot_percent_table must be an object")
+        return problems
+    for key, percent in table.items():
+        try:
+            if int(key) not in CALIFORNIA_HAND_RANKS:
+                problems.append(f"progressive.jackpot_percent_table: unknown hand rank '{key}'")
+        except ValueError:
+            problems.append(f"progressive.jackpot_percent_table: key '{key}' is not a HandRank value")
+        if not _is_non_negative_int(percent) or percent > 100:
+            problems.append(f"progressive.jackpot_percent_table: percent of '{key}' must be an integer in [0, 100]")
+
+    return problems
+
+
+def _check_six_card_bonus(six_card_bonus) -> list[str]:
+    if not isinstance(six_card_bonus, dict):
+        return ["six_card_bonus must be an object"]
+
+    problems: list[str] = []
+    if not isinstance(six_card_bonus.get('is_enabled'), bool):
+        problems.append("six_card_bonus.is_enabled must be a boolean")
+
+    bet = six_card_bonus.get('bet')
+    if not _is_non_negative_int(bet) or bet == 0:
+        problems.append("six_card_bonus.bet must be a positive integer")
+
+    problems.extend(_check_rate_table(
+        'six_card_bonus.payout_rate_table',
+        six_card_bonus.get('payout_rate_table'),
+        FIVE_CARD_HAND_RANKS,
+        FiveCardHandRank
+    ))
+    return problems
+
+
+def validate_game_engine_config(data: dict) -> list[str]:
+    problems: list[str] = []
+
+    for name, expected_ranks in RATE_TABLES.items():
+        if name not in data:
+            problems.append(f"{name} is missing")
+            continue
+        problems.extend(_check_rate_table(name, data[name], expected_ranks))
+
+    if not _is_non_negative_int(data.get('player_initial_balance')):
+        problems.append("player_initial_balance must be a non-negative integer")
+
+    if not isinstance(data.get('is_table_limit_enabled'), bool):
+        problems.append("is_table_limit_enabled must be a boolean")
+
+    problems.extend(_check_shoe(data.get('shoe')))
+    problems.extend(_check_progressive(data.get('progressive')))
+    problems.extend(_check_six_card_bonus(data.get('six_card_bonus')))
+
+    if data.get('evaluator_backend') not in EVALUATOR_BACKENDS:
+        problems.append(f"evaluator_backend must be one of {', '.join(EVALUATOR_BACKENDS)}")
+
+    limits = data.get('limits')
+    if not isinstance(limits, dict):
+        problems.append("limits must be an object")
+        return problems
+
+    for key in LIMIT_KEYS:
+        if not _is_non_negative_int(limits.get(key)):
+            problems.append(f"limits.{key} must be a non-negative integer")
+
+    if not problems:
+        if limits['min_ante_bet'] > limits['max_ante_bet']:
+            problems.append("limits.min_ante_bet exceeds limits.max_ante_bet")
+        if limits['min_pair_plus_bet'] > limits['max_pair_plus_bet']:
+            problems.append("limits.min_pair_plus_bet exceeds limits.max_pair_plus_bet")
+
+    return problems
+
+
+def validate_game_controller_config(data: dict) -> list[str]:
+    problems: list[str] = []
+
+    tries = data.get('user_max_tries')
+    if not _is_non_negative_int(tries) or tries == 0:
+        problems.append("user_max_tries must be a positive integer")
+
+    for key in ('draw_card_delay_seconds', 'reveal_dealer_hand_delay_seconds', 'fold_delay_seconds'):
+        if not _is_non_negative_number(data.get(key)):
+            problems.append(f"{key} must be a non-negative number")
+
+    if not _is_non_negative_int(data.get('cheat_amount')):
+        problems.append("cheat_amount must be a non-negative integer")
+
+    if not isinstance(data.get('is_dealer_upcard_revealed'), bool):
+        problems.append("is_dealer_upcard_revealed must be a boolean")
+
+    return problems
+
+
+def validate_app_controller_config(data: dict) -> list[str]:
+    problems: list[str] = []
+
+    for key in ('text_rolling_delay_seconds', 'max_waited_seconds'):
+        if not _is_non_negative_number(data.get(key)):
+            problems.append(f"{key} must be a non-negative number")
+
+    for key in (
+        'is_config_hot_reload_enabled',
+        'is_session_checkpoint_enabled',
+        'is_ledger_enabled',
+        'is_hand_history_enabled',
+    ):
+        if not isinstance(data.get(key), bool):
+            problems.append(f"{key} must be a boolean")
+
+    interval = data.get('config_poll_interval_seconds')
+    if not _is_non_negative_number(interval) or interval == 0:
+        problems.append("config_poll_interval_seconds must be a positive number")
+
+    return problems
+
+
+def validate_messages(lang_code: str, data: dict) -> list[str]:
+    problems: list[str] = []
+
+    for key in UIKeys:
+        if key.value not in data:
+            problems.append(f"{lang_code}/messages.json: missing UI key '{key.value}'")
+        elif not isinstance(data[key.value], str):
+            problems.append(f"{lang_code}/messages.json: '{key.value}' must be a string")
+
+    return problems
@@ -0,0 +1,320 @@
+"""
+Loads every config and every locale file in one pass, validates them against
+the schema and keeps a binary snapshot of the decoded source data on disk.
+
+On the next start, the snapshot is reused as long as the source files are unchanged:
+    1. (mtime, size) of every source file matches -> reuse without reading any source
+    2. otherwise the changed files are hashed -> reuse if the contents are the same
+    3. otherwise everything is re-read and the snapshot is rewritten
+Either way the data goes through the schema and the parsers, so a stale or tampered
+snapshot is never served: it is rebuilt from the sources instead.
+
+The snapshot is a marshal dump of plain dicts, strings and numbers: loading it never runs code,
+and its structure is checked before use.
+
+The loaded data is served as immutable views, so it can be shared freely.
+"""
+import hashlib
+import json
+import marshal
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from src.errors.config_validation_error import ConfigValidationError
+from src.services.utils.config_loader import parse_game_engine_config
+from src.services.utils.config_schema import (
+    validate_app_controller_config,
+    validate_game_controller_config,
+    validate_game_engine_config,
+    validate_messages,
+)
+from src.services.utils.get_file_path import (
+    CONFIG_DIR,
+    CONFIG_PATHS,
+    CONFIG_SNAPSHOT_PATH,
+    LOCALES_BASE_DIR,
+    get_available_locales,
+)
+
+# Bump this whenever the layout of the snapshot changes
+SNAPSHOT_FORMAT_VERSION = 2
+
+# The decoded source files in a snapshot, and the type of each
+SNAPSHOT_DATA_TYPES: dict[str, type] = {
+    'app_controller': dict,
+    'game_engine': dict,
+    'game_controller': dict,
+    'messages': dict, # by language code, every one a dict
+    'rules': dict, # by language code, every one a str
+}
+
+# key: path relative to the config dir, value: (st_mtime_ns, st_size)
+SourceStats = dict[str, tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable, fully parsed and validated view of all config and locale files.
+    Attributes:
+        app_controller (Mapping): see app_controller_config.json
+        game_engine (Mapping): parsed game engine config, see config_loader.parse_game_engine_config
+        game_controller (Mapping): see game_controller_config.json
+        messages (Mapping[str, Mapping[str, str]]): messages of every locale, by language code
+        rules (Mapping[str, tuple[str, ...]]): rules of every locale that ships a rules.txt,
+            split into lines (line endings kept), ready to be rolled out
+        source_stats (SourceStats): (mtime, size) of the source files this snapshot was built from
+    """
+    app_controller: Mapping[str, Any]
+    game_engine: Mapping[str, Any]
+    game_controller: Mapping[str, Any]
+    messages: Mapping[str, Mapping[str, str]]
+    rules: Mapping[str, tuple[str, ...]]
+    source_stats: SourceStats
+
+
+def _freeze(obj: Any) -> Any:
+    """
+    Recursively wrap dicts into read-only mappings and lists into tuples.
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(value) for value in obj)
+    return obj
+
+
+def get_source_files() -> dict[str, Path]:
+    """
+    All files a snapshot is built from, keyed by their path relative to the config dir.
+    """
+    paths: list[Path] = list(CONFIG_PATHS.values())
+    for lang_code in get_available_locales():
+        paths.append(LOCALES_BASE_DIR / lang_code / 'messages.json')
+        rules_path = LOCALES_BASE_DIR / lang_code / 'rules.txt'
+        if rules_path.exists():
+            paths.append(rules_path)
+
+    return {path.relative_to(CONFIG_DIR).as_posix(): path for path in paths}
+
+
+def stat_source_files(sources: dict[str, Path]) -> SourceStats:
+    stats: SourceStats = {}
+    for key, path in sources.items():
+        st = path.stat()
+        stats[key] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def _hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _decode_json(key: str, raw: bytes, problems: list[str]) -> dict:
+    try:
+        return json.loads(raw.decode('UTF-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        problems.append(f"{key} is not valid JSON: {e}")
+        return {}
+
+
+def _read_sources(sources: dict[str, Path]) -> tuple[dict, dict[str, str], list[str]]:
+    """
+    Read and decode every source file.
+    Returns:
+        tuple[dict, dict[str, str], list[str]]: the decoded data (see SNAPSHOT_DATA_TYPES),
+            the content hash of every file and the files that could not be decoded
+    """
+    raw_files: dict[str, bytes] = {key: path.read_bytes() for key, path in sources.items()}
+    hashes: dict[str, str] = {key: _hash(raw) for key, raw in raw_files.items()}
+
+    problems: list[str] = []
+
+    def _relative(path: Path) -> str:
+        return path.relative_to(CONFIG_DIR).as_posix()
+
+    app_key = _relative(CONFIG_PATHS['APP_CONTROLLER_CONFIG'])
+    engine_key = _relative(CONFIG_PATHS['GAME_ENGINE_CONFIG'])
+    controller_key = _relative(CONFIG_PATHS['GAME_CONTROLLER_CONFIG'])
+
+    messages: dict[str, dict[str, str]] = {}
+    rules: dict[str, str] = {}
+    for key, raw in raw_files.items():
+        parts = key.split('/')
+        if parts[0] != 'locales':
+            continue
+        lang_code, file_name = parts[1], parts[2]
+
+        if file_name == 'messages.json':
+            messages[lang_code] = _decode_json(key, raw, problems)
+        elif file_name == 'rules.txt':
+            rules[lang_code] = raw.decode('UTF-8')
+
+    data = {
+        'app_controller': _decode_json(app_key, raw_files[app_key], problems),
+        'game_engine': _decode_json(engine_key, raw_files[engine_key], problems),
+        'game_controller': _decode_json(controller_key, raw_files[controller_key], problems),
+        'messages': messages,
+        'rules': rules,
+    }
+    return data, hashes, problems
+
+
+def _build_payload(data: dict, problems: list[str]) -> dict:
+    """
+    Validate the decoded source data and parse it.
+    Args:
+        data (dict): see SNAPSHOT_DATA_TYPES
+        problems (list[str]): problems found so far, e.g. files that could not be decoded
+    Raises:
+        ConfigValidationError: If any file does not match the schema.
+    """
+    problems = list(problems)
+    problems.extend(validate_app_controller_config(data['app_controller']))
+    problems.extend(validate_game_engine_config(data['game_engine']))
+    problems.extend(validate_game_controller_config(data['game_controller']))
+    for lang_code, messages in data['messages'].items():
+        problems.extend(validate_messages(lang_code, messages))
+
+    if problems:
+        raise ConfigValidationError(problems)
+
+    return {
+        'app_controller': data['app_controller'],
+        'game_engine': parse_game_engine_config(data['game_engine']),
+        'game_controller': data['game_controller'],
+        'messages': data['messages'],
+        'rules': data['rules'],
+    }
+
+
+def _is_snapshot_shaped(cached: Any) -> bool:
+    """
+    Whether a loaded snapshot has the layout of this format version, down to the types
+    the loader relies on. What the configs hold is left to the schema.
+    """
+    if not isinstance(cached, dict) or cached.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return False
+
+    stats, hashes, data = cached.get('source_stats'), cached.get('hashes'), cached.get('data')
+    if not (isinstance(stats, dict) and isinstance(hashes, dict) and isinstance(data, dict)):
+        return False
+    if stats.keys() != hashes.keys() or data.keys() != SNAPSHOT_DATA_TYPES.keys():
+        return False
+    for key, stat in stats.items():
+        if not (isinstance(key, str) and isinstance(stat, tuple) and len(stat) == 2):
+            return False
+        if not all(isinstance(value, int) for value in stat) or not isinstance(hashes[key], str):
+            return False
+    if not all(isinstance(data[key], data_type) for key, data_type in SNAPSHOT_DATA_TYPES.items()):
+        return False
+    return (
+        all(isinstance(messages, dict) for messages in data['messages'].values())
+        and all(isinstance(text, str) for text in data['rules'].values())
+    )
+
+
+def _read_snapshot_file(snapshot_path: Path) -> dict | None:
+    try:
+        with open(snapshot_path, mode='rb') as snapshot_file:
+            cached = marshal.load(snapshot_file)
+    except (OSError, EOFError, ValueError, TypeError): # missing, truncated or not marshal data
+        return None
+
+    return cached if _is_snapshot_shaped(cached) else None
+
+
+def _write_snapshot_file(snapshot_path: Path, cached: dict) -> None:
+    """
+    Atomically replace the snapshot file. The snapshot is only an optimization,
+    so a read-only install simply runs without it.
+    """
+    tmp_path = snapshot_path.with_name(f'{snapshot_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, mode='wb') as snapshot_file:
+            marshal.dump(cached, snapshot_file)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _is_cache_valid(cached: dict, sources: dict[str, Path], stats: SourceStats) -> bool:
+    if cached['source_stats'].keys() != stats.keys():
+        return False
+
+    for key, stat in stats.items():
+        if cached['source_stats'][key] == stat:
+            continue
+        # Touched but maybe not modified (e.g. git checkout), compare the contents
+        if cached['hashes'][key] != _hash(sources[key].read_bytes()):
+            return False
+    return True
+
+
+def load_config_snapshot(snapshot_path: Path = CONFIG_SNAPSHOT_PATH) -> ConfigSnapshot:
+    """
+    Load all configs and locales, from the binary snapshot if it is still valid.
+    Raises:
+        FileNotFoundError: If a source file disappeared while loading.
+        ConfigValidationError: If any file does not match the schema.
+    """
+    sources = get_source_files()
+    stats = stat_source_files(sources)
+    cached = _read_snapshot_file(snapshot_path)
+
+    if cached is not None and _is_cache_valid(cached, sources, stats):
+        try:
+            payload = _build_payload(cached['data'], [])
+        except ConfigValidationError:
+            pass # the sources were valid when it was written, so the snapshot was tampered with
+        else:
+            if cached['source_stats'] != stats:
+                cached['source_stats'] = stats
+                _write_snapshot_file(snapshot_path, cached)
+            return _snapshot_from_payload(payload, stats)
+
+    data, hashes, problems = _read_sources(sources)
+    payload = _build_payload(data, problems)
+    _write_snapshot_file(snapshot_path, {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_stats': stats,
+        'hashes': hashes,
+        'data': data,
+    })
+    return _snapshot_from_payload(payload, stats)
+
+
+def _snapshot_from_payload(payload: dict, stats: SourceStats) -> ConfigSnapshot:
+    return ConfigSnapshot(
+        app_controller=_freeze(payload['app_controller']),
+        game_engine=_freeze(payload['game_engine']),
+        game_controller=_freeze(payload['game_controller']),
+        messages=_freeze(payload['messages']),
+        rules=MappingProxyType({
+            lang_code: tuple(text.splitlines(keepends=True)) for lang_code, text in payload['rules'].items()
+        }),
+        source_stats=stats,
+    )
+
+
+# Process wide snapshot, shared by ConfigService and LocaleService
+_current_snapshot: ConfigSnapshot | None = None
+
+def get_config_snapshot() -> ConfigSnapshot:
+    global _current_snapshot
+    if _current_snapshot is None:
+        _current_snapshot = load_config_snapshot()
+    return _current_snapshot
+
+def publish_config_snapshot(snapshot: ConfigSnapshot) -> None:
+    """
+    Replace the process wide snapshot. A plain reference swap:
+    readers see either the old or the new snapshot, never a mix of both.
+    """
+    global _current_snapshot
+    _current_snapshot = snapshot
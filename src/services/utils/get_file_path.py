@@ -6,16 +6,38 @@ Module to provide file paths for configuration and locale files.
 
 BASE_DIR: str = Path(__file__).resolve().parent.parent.parent
 
+CONFIG_DIR: Path = BASE_DIR / 'config'
+
 CONFIG_PATHS: dict[str, Path] = {
-    'GAME_ENGINE_CONFIG' : BASE_DIR / 'config' / 'game_engine_config.json',
-    'GAME_CONTROLLER_CONFIG' : BASE_DIR / 'config' / 'game_controller_config.json',
-    'APP_CONTROLLER_CONFIG' : BASE_DIR / 'config' / 'app_controller_config.json'
+    'GAME_ENGINE_CONFIG' : CONFIG_DIR / 'game_engine_config.json',
+    'GAME_CONTROLLER_CONFIG' : CONFIG_DIR / 'game_controller_config.json',
+    'APP_CONTROLLER_CONFIG' : CONFIG_DIR / 'app_controller_config.json'
 }
 
 
-LOCALES_BASE_DIR: Path = BASE_DIR / 'config' / 'locales'
+LOCALES_BASE_DIR: Path = CONFIG_DIR / 'locales'
 DEFAULT_LOCALE = 'en_US'
 
+# Generated files (snapshots, precomputed tables), never committed
+CACHE_DIR: Path = BASE_DIR / '.cache'
+CONFIG_SNAPSHOT_PATH: Path = CACHE_DIR / 'config_snapshot.bin'
+
+# Session checkpoints, see session_checkpointer.py. Player data, never committed either
+SESSIONS_DIR: Path = BASE_DIR / '.sessions'
+LEDGER_PATH: Path = SESSIONS_DIR / 'ledger.sqlite3'
+HAND_HISTORY_DIR: Path = SESSIONS_DIR / 'hand_history'
+# Progressive jackpot pool, shared by every table of the host, see jackpot_pool.py
+JACKPOT_POOL_PATH: Path = SESSIONS_DIR / 'jackpot_pool.bin'
+
 def get_locale_dir(locale_code: str) -> Path:
     target = LOCALES_BASE_DIR / locale_code
-    return target if target.exists() else LOCALES_BASE_DIR / DEFAULT_LOCALE
\ No newline at end of file
+    return target if target.exists() else LOCALES_BASE_DIR / DEFAULT_LOCALE
+
+def get_available_locales() -> list[str]:
+    """
+    Every sub directory of the locales dir that ships a messages.json is a locale.
+    """
+    return sorted(
+        entry.name for entry in LOCALES_BASE_DIR.iterdir()
+        if (entry / 'messages.json').exists()
+    )
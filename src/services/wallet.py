@@ -0,0 +1,56 @@
+from src.enums.ledger_entry_type import LedgerEntryType
+from src.services.ledger_store import LedgerRound, LedgerStore
+
+class Wallet:
+    """
+    Audit trail of every chip movement of one session.
+
+    GameEngine reports every balance change as a typed entry. The entries of a round are
+    only buffered in memory; at the round boundary they are coalesced into a single
+    LedgerRound (entries + net amount + balance after) and handed to the LedgerStore,
+    which persists many rounds per commit. The balance itself stays on Player.
+
+    Attributes:
+        session_id (str): The session the entries belong to.
+        store (LedgerStore | None): Where rounds are persisted, None to only keep count.
+        round_number (int): Rounds committed so far.
+    """
+    def __init__(self, session_id: str, store: LedgerStore | None = None):
+        self.session_id = session_id
+        self.store = store
+        self.round_number = store.get_last_round_number(session_id) if store is not None else 0
+        self.__entries: list[tuple[LedgerEntryType, int]] = []
+
+    def record(self, entry_type: LedgerEntryType, amount: int) -> None:
+        """
+        Args:
+            entry_type (LedgerEntryType): What the chips moved for.
+            amount (int): Chips credited to the player, negative for debits.
+        """
+        if amount:
+            self.__entries.append((entry_type, amount))
+
+    @property
+    def pending_net_amount(self) -> int:
+        return sum(amount for _, amount in self.__entries)
+
+    def commit_round(self, balance_after: int) -> LedgerRound | None:
+        """
+        Close the current round and queue it for persistence.
+        Returns:
+            LedgerRound | None: The committed round, None if no chips moved.
+        """
+        if not self.__entries:
+            return None
+        self.round_number += 1
+        ledger_round = LedgerRound(
+            self.session_id,
+            self.round_number,
+            self.pending_net_amount,
+            balance_after,
+            tuple(self.__entries)
+        )
+        self.__entries.clear()
+        if self.store is not None:
+            self.store.append(ledger_round)
+        return ledger_round
@@ -0,0 +1,43 @@
+"""
+Pre-generated deal streams: every round is stored as DEAL_SIZE card indices
+(see card_index.py) in dealing order: player, dealer, player, dealer, player, dealer.
+Streams are plain bytes, so they can be put into shared memory and replayed
+by ReplayDeck in any number of processes.
+"""
+import random
+from multiprocessing.shared_memory import SharedMemory
+
+from src.models.card_index import DECK_SIZE
+
+# Cards dealt per round, 3 to the player and 3 to the dealer
+DEAL_SIZE = 6
+
+def generate_deals(seed: int, rounds: int) -> bytearray:
+    """
+    Generate `rounds` independent single-deck deals, reproducible from the seed.
+    """
+    rng = random.Random(seed)
+    sample = rng.sample
+    indices = range(DECK_SIZE)
+    
+    deals = bytearray(rounds * DEAL_SIZE)
+    for offset in range(0, len(deals), DEAL_SIZE):
+        deals[offset:offset + DEAL_SIZE] = bytes(sample(indices, DEAL_SIZE))
+    return deals
+
+def create_shared_deals(seed: int, rounds: int) -> SharedMemory:
+    """
+    Generate deals directly into a new shared memory block.
+    The caller owns the block: close() and unlink() it when every reader is done.
+    """
+    shm = SharedMemory(create=True, size=rounds * DEAL_SIZE)
+    shm.buf[:rounds * DEAL_SIZE] = generate_deals(seed, rounds)
+    return shm
+
+def attach_shared_deals(name: str) -> SharedMemory:
+    """
+    Attach to a block created by create_shared_deals, from a worker process.
+    Workers of a process pool share the resource tracker of their parent,
+    so attaching does not make the block outlive (or die with) the worker.
+    """
+    return SharedMemory(name=name)
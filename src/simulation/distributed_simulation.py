@@ -0,0 +1,419 @@
+"""
+Simulations spread across several machines.
+
+A coordinator splits a run into seeded work units (seed, rounds, game rule, strategy)
+and hands them out over plain TCP. Workers simulate a unit into a local aggregate slot
+(see shared_aggregates.py) and send back its raw int64 counters, a few hundred bytes.
+
+Units are leased: a unit whose worker disconnects, or does not answer within
+unit_timeout_seconds, goes back to the queue. Every unit is fully determined by its seed,
+so a unit computed twice gives the same counters, the first result wins and the merge
+(sums of integers, in unit order) is deterministic whatever the workers and retries.
+A worker that cannot simulate a unit at all (e.g. its game engine config differs) reports
+an error instead, which stops the whole run: handing the unit to the next worker would
+fail the same way.
+
+Wire format: every frame is a 4-byte big-endian length followed by the payload.
+Control messages are JSON, a result is a JSON header frame followed by a binary frame.
+
+Run locally with several worker processes standing in for nodes:
+    python -m src.simulation.distributed_simulation local --workers 4 --rounds 1000000
+or across machines:
+    python -m src.simulation.distributed_simulation coordinator --host 0.0.0.0 --port 5555 ...
+    python -m src.simulation.distributed_simulation worker --host <coordinator> --port 5555
+"""
+import argparse
+import itertools
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import asdict, dataclass
+from multiprocessing import Process
+
+from src.core.strategies.strategy_registry import STRATEGY_FACTORIES, create_strategy
+from src.simulation.shared_aggregates import (
+    COUNTER_BYTES,
+    AggregateLayout,
+    AggregateSlot,
+    AggregateTotals,
+    simulate_into_slot,
+    totals_from_counters,
+)
+from src.simulation.simulation_engine import (
+    EVALUATORS,
+    SIMULATION_BALANCE,
+    game_engine_config_fingerprint,
+)
+
+FRAME_HEADER = struct.Struct('!I')
+
+# How long an idle worker waits before asking again, while the last units are in flight
+IDLE_RETRY_SECONDS = 0.5
+
+# How long a run may take before the coordinator gives up on the missing units
+RUN_TIMEOUT_SECONDS = 24 * 3600.0
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    unit_id: int
+    seed: int
+    rounds: int
+    game_rule: str
+    strategy: str
+    bucket_width: int
+    bucket_count: int
+    config_fingerprint: str
+
+    @property
+    def layout(self) -> AggregateLayout:
+        return AggregateLayout(self.bucket_width, self.bucket_count)
+
+
+def make_work_units(
+    rounds: int,
+    game_rule: str,
+    strategy: str,
+    seed: int = 0,
+    unit_rounds: int = 100_000,
+    layout: AggregateLayout = AggregateLayout()
+    ) -> list[WorkUnit]:
+    fingerprint = game_engine_config_fingerprint()
+    return [
+        WorkUnit(
+            unit_id,
+            (seed << 32) + unit_id,
+            min(unit_rounds, rounds - start),
+            game_rule,
+            strategy,
+            layout.bucket_width,
+            layout.bucket_count,
+            fingerprint
+        )
+        for unit_id, start in enumerate(range(0, rounds, unit_rounds))
+    ]
+
+
+# Framing helpers
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        chunks += chunk
+    return bytes(chunks)
+
+def _send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    return _recv_exact(sock, size)
+
+def _send_message(sock: socket.socket, message: dict) -> None:
+    _send_frame(sock, json.dumps(message).encode('UTF-8'))
+
+def _recv_message(sock: socket.socket) -> dict:
+    return json.loads(_recv_frame(sock).decode('UTF-8'))
+
+
+class SimulationCoordinator:
+    """
+    Hands out work units over TCP and collects their aggregates.
+
+    Attributes:
+        units (list[WorkUnit]): All units of the run, indexed by unit_id.
+        unit_timeout_seconds (float): Lease time of a unit before it is handed out again.
+        retried_units (int): How many times a unit was handed out again.
+        error (str | None): The error reported by a worker, which stopped the run.
+    """
+    def __init__(
+        self,
+        units: list[WorkUnit],
+        host: str = '127.0.0.1',
+        port: int = 0,
+        unit_timeout_seconds: float = 600.0
+        ):
+        self.units = units
+        self.unit_timeout_seconds = unit_timeout_seconds
+        self.retried_units = 0
+        self.error: str | None = None
+
+        self.__lock = threading.Lock()
+        self.__done = threading.Event()
+        self.__pending: deque[int] = deque(unit.unit_id for unit in units)
+        # unit_id -> (lease token, deadline), the token tells an expired lease from its successor
+        self.__leases: dict[int, tuple[int, float]] = {}
+        self.__lease_tokens = itertools.count()
+        self.__results: dict[int, bytes] = {}
+        if not units:
+            self.__done.set()
+
+        coordinator = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._serve_worker(self.request)
+
+        self.__server = socketserver.ThreadingTCPServer((host, port), _Handler)
+        self.__server.daemon_threads = True
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.__server.server_address[:2]
+
+    def _lease_unit(self) -> tuple[WorkUnit, int] | None | bool:
+        """
+        Returns:
+            tuple[WorkUnit, int] | None | bool: A unit to work on and its lease token,
+                None to come back later, False if every unit is done or the run stopped.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            for unit_id, (_, deadline) in list(self.__leases.items()):
+                if deadline < now:
+                    del self.__leases[unit_id]
+                    self.__pending.append(unit_id)
+                    self.retried_units += 1
+
+            if self.__done.is_set():
+                return False
+            if not self.__pending:
+                return None
+
+            unit_id = self.__pending.popleft()
+            token = next(self.__lease_tokens)
+            self.__leases[unit_id] = (token, now + self.unit_timeout_seconds)
+            return self.units[unit_id], token
+
+    def _holds_lease(self, unit_id: int, token: int) -> bool:
+        lease = self.__leases.get(unit_id)
+        return lease is not None and lease[0] == token
+
+    def _release_unit(self, unit_id: int, token: int) -> None:
+        # The worker is gone before delivering, give the unit to someone else right away,
+        # unless its lease expired and the unit already went to someone else
+        with self.__lock:
+            if self._holds_lease(unit_id, token):
+                del self.__leases[unit_id]
+                self.__pending.appendleft(unit_id)
+                self.retried_units += 1
+
+    def _store_result(self, unit_id: int, token: int, counters: bytes) -> None:
+        expected_size = self.units[unit_id].layout.slot_size * COUNTER_BYTES
+        with self.__lock:
+            if len(counters) != expected_size:
+                if self._holds_lease(unit_id, token):
+                    del self.__leases[unit_id]
+                    self.__pending.append(unit_id)
+                    self.retried_units += 1
+                return
+            self.__leases.pop(unit_id, None)
+            # First result wins, a late duplicate of a retried unit is identical anyway
+            self.__results.setdefault(unit_id, counters)
+            if unit_id in self.__pending:
+                self.__pending.remove(unit_id)
+            if len(self.__results) == len(self.units):
+                self.__done.set()
+
+    def _stop_run(self, unit_id: int, error: str) -> None:
+        with self.__lock:
+            if self.error is None:
+                self.error = f"work unit {unit_id}: {error}"
+            self.__done.set()
+
+    def _serve_worker(self, sock: socket.socket) -> None:
+        unit: WorkUnit | None = None
+        token = -1
+        try:
+            while True:
+                request = _recv_message(sock)
+                # A result doubles as the request for the next unit
+                if request.get('type') == 'result' and unit is not None:
+                    self._store_result(unit.unit_id, token, _recv_frame(sock))
+                    unit = None
+                elif request.get('type') == 'error' and unit is not None:
+                    self._stop_run(unit.unit_id, request.get('message', 'unknown error'))
+                    unit = None
+
+                leased = self._lease_unit()
+                if leased is False:
+                    _send_message(sock, {'type': 'done'})
+                    return
+                if leased is None:
+                    _send_message(sock, {'type': 'wait', 'seconds': IDLE_RETRY_SECONDS})
+                    continue
+                unit, token = leased
+                _send_message(sock, {'type': 'unit', **asdict(unit)})
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            if unit is not None:
+                self._release_unit(unit.unit_id, token)
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name='simulation-coordinator', daemon=True
+        )
+        self.__thread.start()
+
+    def wait(self, timeout: float | None = None) -> AggregateTotals:
+        """
+        Block until every unit is done, then merge the results in unit order.
+        Raises:
+            TimeoutError: If the units are not done within `timeout` seconds.
+            RuntimeError: If a worker reported an error, which stopped the run.
+        """
+        if not self.__done.wait(timeout):
+            raise TimeoutError(f"{len(self.units) - len(self.__results)} work units still missing")
+        if self.error is not None:
+            raise RuntimeError(f"Simulation stopped by a worker error on {self.error}")
+
+        layout = self.units[0].layout if self.units else AggregateLayout()
+        merged = [0] * layout.slot_size
+        for unit_id in range(len(self.units)):
+            for i, value in enumerate(array('q', self.__results[unit_id])):
+                merged[i] += value
+        return totals_from_counters(merged, layout)
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+
+def simulate_unit(unit: WorkUnit) -> bytes:
+    """
+    Simulate a work unit, and return its raw counters.
+    Raises:
+        ValueError: If the local game engine config differs from the coordinator's.
+    """
+    if unit.config_fingerprint != game_engine_config_fingerprint():
+        raise ValueError("Game engine config differs from the coordinator's, refusing to simulate.")
+
+    layout = unit.layout
+    counters = array('q', bytes(layout.slot_size * COUNTER_BYTES))
+    slot = AggregateSlot(memoryview(counters), layout, SIMULATION_BALANCE)
+    simulate_into_slot(slot, unit.seed, unit.rounds, create_strategy(unit.strategy), unit.game_rule)
+    slot.counters.release()
+    return counters.tobytes()
+
+
+def run_worker(host: str, port: int) -> int:
+    """
+    Work on units of the coordinator at host:port until every unit is done.
+    A unit that cannot be simulated is reported to the coordinator, and ends the worker.
+    Returns:
+        int: The number of units this worker completed.
+    """
+    completed = 0
+    with socket.create_connection((host, port)) as sock:
+        _send_message(sock, {'type': 'request'})
+        while True:
+            message = _recv_message(sock)
+            match message['type']:
+                case 'done':
+                    return completed
+                case 'wait':
+                    time.sleep(message['seconds'])
+                    _send_message(sock, {'type': 'request'})
+                case 'unit':
+                    del message['type']
+                    try:
+                        counters = simulate_unit(WorkUnit(**message))
+                    except Exception as error: # any failure, or the coordinator would wait for the lease
+                        _send_message(sock, {'type': 'error', 'message': f'{type(error).__name__}: {error}'})
+                        return completed
+                    _send_message(sock, {'type': 'result'})
+                    _send_frame(sock, counters)
+                    completed += 1
+
+
+def run_local_cluster(
+    units: list[WorkUnit],
+    worker_count: int,
+    timeout: float = RUN_TIMEOUT_SECONDS
+    ) -> AggregateTotals:
+    """
+    Run a coordinator and `worker_count` local worker processes standing in for nodes.
+    Raises:
+        TimeoutError: If the units are not done within `timeout` seconds.
+        RuntimeError: If a worker reported an error, or every worker died before the end.
+    """
+    coordinator = SimulationCoordinator(units)
+    coordinator.start()
+    host, port = coordinator.address
+    workers = [Process(target=run_worker, args=(host, port)) for _ in range(worker_count)]
+    deadline = time.monotonic() + timeout
+    is_finished = False
+    try:
+        for worker in workers:
+            worker.start()
+        while True:
+            try:
+                totals = coordinator.wait(min(IDLE_RETRY_SECONDS, max(deadline - time.monotonic(), 0.0)))
+                is_finished = True
+                return totals
+            except TimeoutError:
+                if time.monotonic() >= deadline:
+                    raise
+                # No remote worker will ever pick the units up
+                if not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError("Every local worker exited before the units were done.") from None
+    finally:
+        for worker in workers:
+            if not is_finished and worker.is_alive():
+                worker.terminate()
+            worker.join()
+        coordinator.stop()
+
+
+def _print_totals(totals: AggregateTotals) -> None:
+    rounds = totals.sums['rounds']
+    print(f"{rounds} rounds, net win per round: {totals.sums['net_win'] / max(rounds, 1):+.4f}")
+    for rank, counts in totals.outcome_counts.items():
+        print(f"  {rank.name:<17} " + ' '.join(f'{k}={v}' for k, v in counts.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Distributed headless simulation.')
+    parser.add_argument('mode', choices=['local', 'coordinator', 'worker'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--workers', type=int, default=2, help='local mode only')
+    parser.add_argument('--rounds', type=int, default=1_000_000)
+    parser.add_argument('--unit-rounds', type=int, default=100_000)
+    parser.add_argument('--rule', choices=list(EVALUATORS), default='standard')
+    parser.add_argument('--strategy', choices=list(STRATEGY_FACTORIES), default='q64')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=RUN_TIMEOUT_SECONDS, help='seconds before giving up')
+    args = parser.parse_args()
+
+    if args.mode == 'worker':
+        print(f'{run_worker(args.host, args.port)} units completed')
+        return
+
+    units = make_work_units(args.rounds, args.rule, args.strategy, args.seed, args.unit_rounds)
+    if args.mode == 'local':
+        _print_totals(run_local_cluster(units, args.workers, args.timeout))
+        return
+
+    coordinator = SimulationCoordinator(units, args.host, args.port)
+    coordinator.start()
+    try:
+        _print_totals(coordinator.wait(args.timeout))
+        print(f'{coordinator.retried_units} units retried')
+    finally:
+        coordinator.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""
+Load generator and soak test of the interactive flow.
+
+Many scripted clients play through the real AppController: its round machine, prompts,
+retries and host actions, with a ScriptedView in place of stdin/stdout. All delays are
+overridden to zero unless asked otherwise, so the numbers measure the controller layer,
+not the UX pauses. Persistence (checkpoints, ledger) and the config watcher are disabled,
+they are process-wide and benchmarked on their own.
+
+Reported: rounds per second, round latency percentiles, traced memory growth, and leaks:
+controllers or engines still alive after their client exited, hand buffers that were
+replaced or left with cards once the round was over.
+Used as a regression gate, the exit status is 1 if a threshold or the baseline is missed.
+"""
+import argparse
+import gc
+import json
+import random
+import threading
+import time
+import tracemalloc
+import weakref
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import quantiles
+from typing import Any
+
+from src.core.app_controller import AppController
+from src.enums.ui_keys import UIKeys
+from src.views.scripted_view import ScriptedView
+
+ZERO_DELAYS: dict[str, dict[str, float]] = {
+    'app_controller': {
+        'text_rolling_delay_seconds': 0.0,
+    },
+    'game_controller': {
+        'draw_card_delay_seconds': 0.0,
+        'reveal_dealer_hand_delay_seconds': 0.0,
+        'fold_delay_seconds': 0.0,
+    },
+}
+
+NO_PERSISTENCE: dict[str, dict[str, bool]] = {
+    'app_controller': {
+        'is_config_hot_reload_enabled': False,
+        'is_session_checkpoint_enabled': False,
+        'is_ledger_enabled': False,
+        'is_hand_history_enabled': False,
+    },
+}
+
+class LatencyReservoir:
+    """
+    A uniform sample of the round latencies (reservoir sampling),
+    bounded so that hours of soak do not grow the memory it measures.
+    """
+    def __init__(self, size: int = 10_000, seed: int = 0):
+        self.size = size
+        self.count = 0
+        self.samples: list[float] = []
+        self.__rng = random.Random(seed)
+        self.__lock = threading.Lock()
+
+    def add(self, latency: float) -> None:
+        with self.__lock:
+            self.count += 1
+            if len(self.samples) < self.size:
+                self.samples.append(latency)
+                return
+            slot = self.__rng.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = latency
+
+    def percentiles_ms(self) -> tuple[float, float, float]:
+        """
+        Returns:
+            tuple[float, float, float]: p50, p90, p99 in milliseconds, zeros without samples.
+        """
+        with self.__lock:
+            samples = list(self.samples)
+        if len(samples) < 2:
+            return (0.0, 0.0, 0.0)
+        cuts = quantiles(samples, n=100, method='inclusive')
+        return (cuts[49] * 1000, cuts[89] * 1000, cuts[98] * 1000)
+
+
+class ScriptedClient:
+    """
+    Answers the prompts of one AppController like a player would: plays a number of rounds,
+    mostly the minimum bets, sometimes folds, switches game rules or mistypes,
+    then exits through the menu.
+    """
+    def __init__(self, rounds: int, latencies: LatencyReservoir, rng: random.Random):
+        self.rounds = rounds
+        self.rounds_played = 0
+        self.latencies = latencies
+        self.rng = rng
+        self.__round_started_at = 0.0
+
+    def __call__(self, key: UIKeys | str, kwargs: dict[str, Any]) -> str:
+        rng = self.rng
+        if rng.random() < 0.01 and key is not UIKeys.DRAW_CARD_PROMPT:
+            return 'oops' # every prompt has to survive a typo
+
+        match key:
+            case UIKeys.FIRST_ROUND_PROMPT:
+                if self.rounds_played >= self.rounds:
+                    return '3'
+                self.__round_started_at = time.perf_counter()
+                return '1'
+
+            case UIKeys.PLACE_ANTE_PROMPT | UIKeys.PLACE_PAIR_PLUS_PROMPT:
+                return str(kwargs['min'])
+
+            case UIKeys.PAIR_PLUS_ROUND_PROMPT | UIKeys.PROGRESSIVE_ROUND_PROMPT | UIKeys.SIX_CARD_BONUS_ROUND_PROMPT:
+                return rng.choice(('1', '2'))
+
+            case UIKeys.SECOND_ROUND_PROMPT:
+                return '1' if rng.random() < 0.7 else '2'
+
+            case UIKeys.ANOTHER_ROUND_PROMPT:
+                self.latencies.add(time.perf_counter() - self.__round_started_at)
+                self.rounds_played += 1
+                if self.rounds_played >= self.rounds:
+                    return '3'
+                return '2' if rng.random() < 0.05 else '1'
+
+            case UIKeys.CHOOSE_GAME_RULE:
+                return rng.choice(('1', '2'))
+
+            case _: # DRAW_CARD_PROMPT, PRESS_ENTER_TO_EXIT and the like
+                return ''
+
+
+@dataclass(frozen=True)
+class SoakReport:
+    clients: int
+    rounds: int
+    seconds: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    memory_start_kb: float
+    memory_end_kb: float
+    leaked_controllers: int
+    hand_buffer_violations: int
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.seconds
+
+    @property
+    def memory_growth_kb(self) -> float:
+        return self.memory_end_kb - self.memory_start_kb
+
+
+def _run_client(
+    rounds: int,
+    latencies: LatencyReservoir,
+    rng: random.Random,
+    config_overrides: dict[str, dict[str, Any]]
+    ) -> tuple[int, weakref.ref, bool]:
+    """
+    Returns:
+        tuple[int, weakref.ref, bool]: Rounds played, a weak reference to the controller,
+            whether both hand buffers are still the ones of the first round, emptied by the
+            last reset_game_state.
+    """
+    client = ScriptedClient(rounds, latencies, rng)
+    app = AppController(ScriptedView(client), config_overrides)
+    participants = (app.player, app.dealer)
+    hand_buffers = [participant.hand for participant in participants]
+    try:
+        app.run()
+    except SystemExit: # exit_game
+        pass
+    is_hand_buffer_intact = all(
+        participant.hand is hand_buffer and participant.top == 0
+        for participant, hand_buffer in zip(participants, hand_buffers)
+    )
+    return client.rounds_played, weakref.ref(app), is_hand_buffer_intact
+
+
+def run_soak(
+    client_count: int = 8,
+    duration_seconds: float = 10.0,
+    rounds_per_client: int = 50,
+    is_delay_kept: bool = False,
+    sample_interval_seconds: float = 1.0,
+    seed: int = 0
+    ) -> SoakReport:
+    """
+    Keep client_count clients playing until the duration is over, a client that exits
+    (rounds done or out of chips) is replaced by a new one.
+    The memory baseline is taken after the first sample interval, once every cache is warm.
+    """
+    config_overrides: dict[str, dict[str, Any]] = {
+        name: dict(overrides) for name, overrides in NO_PERSISTENCE.items()
+    }
+    if not is_delay_kept:
+        for name, overrides in ZERO_DELAYS.items():
+            config_overrides.setdefault(name, {}).update(overrides)
+
+    latencies = LatencyReservoir(seed=seed)
+    deadline = time.perf_counter() + duration_seconds
+    lock = threading.Lock()
+    finished_apps: list[weakref.ref] = []
+    totals = {'clients': 0, 'rounds': 0, 'hand_buffer_violations': 0}
+
+    def serve(client_index: int) -> None:
+        rng = random.Random(seed * 1_000_003 + client_index)
+        while time.perf_counter() < deadline:
+            rounds, app_ref, is_hand_buffer_intact = _run_client(
+                rounds_per_client, latencies, rng, config_overrides
+            )
+            with lock:
+                totals['clients'] += 1
+                totals['rounds'] += rounds
+                totals['hand_buffer_violations'] += not is_hand_buffer_intact
+                finished_apps.append(app_ref)
+
+    def count_leaks() -> int:
+        gc.collect()
+        with lock:
+            finished_apps[:] = [app_ref for app_ref in finished_apps if app_ref() is not None]
+            return len(finished_apps)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=serve, args=(i,)) for i in range(client_count)]
+    for thread in threads:
+        thread.start()
+
+    memory_start = None
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(sample_interval_seconds)
+        count_leaks() # only keeps the live references, no need to hold dead ones for hours
+        if memory_start is None:
+            memory_start = tracemalloc.get_traced_memory()[0]
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    leaked_controllers = count_leaks()
+    memory_end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return SoakReport(
+        totals['clients'],
+        totals['rounds'],
+        seconds,
+        *latencies.percentiles_ms(),
+        (memory_start if memory_start is not None else memory_end) / 1024,
+        memory_end / 1024,
+        leaked_controllers,
+        totals['hand_buffer_violations']
+    )
+
+
+def check_report(
+    report: SoakReport,
+    min_rounds_per_second: float | None = None,
+    max_p99_ms: float | None = None,
+    max_memory_growth_kb: float | None = None,
+    baseline: dict[str, float] | None = None,
+    tolerance: float = 0.2
+    ) -> list[str]:
+    """
+    Returns:
+        list[str]: Why the report fails the gate, empty if it passes.
+            Leaks always fail it.
+    """
+    failures: list[str] = []
+    if report.leaked_controllers:
+        failures.append(f'{report.leaked_controllers} controllers still alive after their client exited')
+    if report.hand_buffer_violations:
+        failures.append(f'{report.hand_buffer_violations} clients ended with a replaced or uncleared hand buffer')
+    if min_rounds_per_second is not None and report.rounds_per_second < min_rounds_per_second:
+        failures.append(f'{report.rounds_per_second:.0f} rounds/s below {min_rounds_per_second:.0f}')
+    if max_p99_ms is not None and report.p99_ms > max_p99_ms:
+        failures.append(f'p99 {report.p99_ms:.2f} ms above {max_p99_ms:.2f} ms')
+    if max_memory_growth_kb is not None and report.memory_growth_kb > max_memory_growth_kb:
+        failures.append(f'memory grew {report.memory_growth_kb:.0f} KB, above {max_memory_growth_kb:.0f} KB')
+    if baseline is not None:
+        if report.rounds_per_second < baseline['rounds_per_second'] * (1 - tolerance):
+            failures.append(
+                f'{report.rounds_per_second:.0f} rounds/s regressed from {baseline["rounds_per_second"]:.0f}'
+            )
+        if report.p99_ms > baseline['p99_ms'] * (1 + tolerance):
+            failures.append(f'p99 {report.p99_ms:.2f} ms regressed from {baseline["p99_ms"]:.2f} ms')
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Soak test of the interactive flow with scripted clients.')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--rounds-per-client', type=int, default=50)
+    parser.add_argument('--keep-delays', action='store_true', help='play with the configured delays')
+    parser.add_argument('--sample-seconds', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-rounds-per-second', type=float, default=None)
+    parser.add_argument('--max-p99-ms', type=float, default=None)
+    parser.add_argument('--max-memory-growth-kb', type=float, default=None)
+    parser.add_argument('--baseline', type=Path, default=None, help='JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--save-baseline', type=Path, default=None)
+    args = parser.parse_args()
+
+    report = run_soak(
+        args.clients,
+        args.seconds,
+        args.rounds_per_client,
+        args.keep_delays,
+        args.sample_seconds,
+        args.seed
+    )
+    print(
+        f'{report.clients} clients, {report.rounds} rounds in {report.seconds:.1f} s: '
+        f'{report.rounds_per_second:.0f} rounds/s'
+    )
+    print(f'  round latency p50 {report.p50_ms:.3f} ms, p90 {report.p90_ms:.3f} ms, p99 {report.p99_ms:.3f} ms')
+    print(
+        f'  traced memory {report.memory_start_kb:.0f} KB -> {report.memory_end_kb:.0f} KB '
+        f'({report.memory_growth_kb:+.0f} KB)'
+    )
+
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(
+            json.dumps({**asdict(report), 'rounds_per_second': report.rounds_per_second}, indent=4),
+            encoding='UTF-8'
+        )
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding='UTF-8'))
+
+    failures = check_report(
+        report,
+        args.min_rounds_per_second,
+        args.max_p99_ms,
+        args.max_memory_growth_kb,
+        baseline,
+        args.tolerance
+    )
+    for failure in failures:
+        print(f'FAIL {failure}')
+    if failures:
+        raise SystemExit(1)
+    print('PASS')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Contention benchmark of the SessionManager.
+
+A pool of threads serves rounds of randomly chosen sessions, like a synchronous server
+does with requests, while another thread keeps publishing rule sets. Every request holds
+its session lock for one round plus a simulated persistence latency (a ledger commit,
+a checkpoint), which releases the GIL like real I/O does.
+
+Per-session locking is compared with a single global lock around every request:
+with a global lock throughput stays flat whatever the thread count,
+with per-session locks it grows until the CPU bound part (the round itself, under the GIL)
+dominates.
+"""
+import argparse
+import random
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+from src.core.strategies.q64_strategy import Q64Strategy
+from src.core.strategy_driver import StrategyDriver
+from src.models.rule_set import RuleSet
+from src.services.config_service import ConfigService
+from src.services.session_manager import SessionManager
+from src.simulation.simulation_engine import SIMULATION_BALANCE
+
+
+@dataclass(frozen=True)
+class ContentionResult:
+    locking: str
+    thread_count: int
+    rounds: int
+    seconds: float
+    rule_swaps: int
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.seconds
+
+
+def run_contention(
+    locking: str,
+    thread_count: int,
+    session_count: int = 64,
+    duration_seconds: float = 2.0,
+    hold_seconds: float = 0.001,
+    swap_interval_seconds: float = 0.01,
+    seed: int = 0
+    ) -> ContentionResult:
+    """
+    Args:
+        locking (str): 'session' for the per-session locks of the SessionManager,
+            'global' to also take one lock shared by every request.
+        thread_count (int): Number of request threads.
+        session_count (int): Number of sessions the requests are spread over.
+        duration_seconds (float): How long the threads serve requests.
+        hold_seconds (float): Simulated persistence latency per request, under the session lock.
+        swap_interval_seconds (float): How often new rule sets are published.
+        seed (int): Seed of the session choice of each thread.
+    Raises:
+        RuntimeError: If a session's chips do not add up after the run,
+            which would mean two threads played the same session at once.
+    """
+    ge_config = ConfigService().get_game_engine_config()
+    rule_sets = RuleSet.all_from_config(ge_config)
+    manager = SessionManager(rule_sets)
+    drivers: dict[str, StrategyDriver] = {}
+    for n in range(session_count):
+        session_id = f'session-{n}'
+        manager.create_session(session_id, SIMULATION_BALANCE)
+        with manager.acquire(session_id) as engine:
+            drivers[session_id] = StrategyDriver(engine, Q64Strategy())
+    session_ids = list(drivers)
+
+    global_lock = threading.Lock() if locking == 'global' else nullcontext()
+    is_stopped = threading.Event()
+    rounds_by_thread = [0] * thread_count
+
+    def serve(thread_index: int) -> None:
+        rng = random.Random(seed * 1_000_003 + thread_index)
+        rounds = 0
+        while not is_stopped.is_set():
+            session_id = rng.choice(session_ids)
+            with global_lock, manager.acquire(session_id):
+                drivers[session_id].play_round()
+                time.sleep(hold_seconds)
+            rounds += 1
+        rounds_by_thread[thread_index] = rounds
+
+    def swap_rules() -> None:
+        # Same rules every time, but every session still has to stage each new generation
+        while not is_stopped.wait(swap_interval_seconds):
+            manager.publish_rule_sets(RuleSet.all_from_config(ge_config))
+
+    threads = [threading.Thread(target=serve, args=(i,)) for i in range(thread_count)]
+    swapper = threading.Thread(target=swap_rules)
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    swapper.start()
+    time.sleep(duration_seconds)
+    is_stopped.set()
+    for thread in threads:
+        thread.join()
+    swapper.join()
+    seconds = time.perf_counter() - start
+
+    for session_id, driver in drivers.items():
+        with manager.acquire(session_id) as engine:
+            if engine.player_balance - SIMULATION_BALANCE != driver.total_net_win:
+                raise RuntimeError(f"chips of {session_id} do not add up")
+
+    return ContentionResult(locking, thread_count, sum(rounds_by_thread), seconds, manager.generation)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Throughput of the SessionManager by thread count.')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--sessions', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--hold-ms', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{args.sessions} sessions, {args.hold_ms} ms held per round, rounds per second:')
+    print(f'  {"threads":>7} {"global lock":>12} {"per session":>12}')
+    for thread_count in args.threads:
+        global_result, session_result = (
+            run_contention(
+                locking,
+                thread_count,
+                args.sessions,
+                args.seconds,
+                args.hold_ms / 1000,
+                seed=args.seed
+            )
+            for locking in ('global', 'session')
+        )
+        print(
+            f'  {thread_count:>7} {global_result.rounds_per_second:>12.0f} '
+            f'{session_result.rounds_per_second:>12.0f}'
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import math
+
+from src.enums.hand_rank import HandRank
+from src.enums.round_outcome import OUTCOMES
+
+
+class SettleStatistics:
+    """
+    A SettleSink keeping running statistics of the net win per round in constant memory.
+    The mean and variance are updated with Welford's online algorithm, which stays
+    numerically stable over billions of rounds, and every counter is preallocated,
+    so recording a round allocates nothing.
+
+    Attributes:
+        count (int): Rounds recorded.
+        mean (float): Mean net win per round.
+        m2 (float): Sum of squared deviations from the mean, see variance.
+        outcome_counts (dict[str, int]): Rounds by outcome, see OUTCOMES.
+        rank_counts (list[int]): Rounds by the HandRank of the player's hand.
+        pair_plus_bets (int): Settled rounds with a pair plus bet.
+        pair_plus_hits (int): Settled rounds where the pair plus bet paid.
+    """
+    __slots__ = (
+        'count',
+        'mean',
+        'm2',
+        'outcome_counts',
+        'rank_counts',
+        'pair_plus_bets',
+        'pair_plus_hits',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.outcome_counts: dict[str, int] = dict.fromkeys(OUTCOMES, 0)
+        self.rank_counts: list[int] = [0] * len(HandRank)
+        self.pair_plus_bets = 0
+        self.pair_plus_hits = 0
+
+    def _add_net_win(self, net_win: int) -> None:
+        self.count += 1
+        delta = net_win - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (net_win - self.mean)
+
+    def record_settlement(
+        self,
+        player_hand_rank_value: HandRank,
+        is_dealer_qualified: bool,
+        outcome: str,
+        ante_bonus_payout: int,
+        had_pair_plus_bet: bool,
+        pair_plus_payout: int,
+        winnings: int,
+        net_win: int
+        ) -> None:
+        self._add_net_win(net_win)
+        self.outcome_counts[outcome] += 1
+        self.rank_counts[player_hand_rank_value] += 1
+        if had_pair_plus_bet:
+            self.pair_plus_bets += 1
+            if player_hand_rank_value >= HandRank.PAIR:
+                self.pair_plus_hits += 1
+
+    def record_fold(self, player_hand_rank_value: HandRank, net_win: int) -> None:
+        self._add_net_win(net_win)
+        self.outcome_counts['fold'] += 1
+        self.rank_counts[player_hand_rank_value] += 1
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance of the net win per round, 0 below two rounds.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def pair_plus_hit_rate(self) -> float:
+        return self.pair_plus_hits / self.pair_plus_bets if self.pair_plus_bets else 0.0
+
+    def merge(self, other: 'SettleStatistics') -> None:
+        """
+        Add the rounds of another accumulator, e.g. of another worker
+        (Chan et al. parallel update of mean and m2).
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        for outcome, outcome_count in other.outcome_counts.items():
+            self.outcome_counts[outcome] += outcome_count
+        for rank, rank_count in enumerate(other.rank_counts):
+            self.rank_counts[rank] += rank_count
+        self.pair_plus_bets += other.pair_plus_bets
+        self.pair_plus_hits += other.pair_plus_hits
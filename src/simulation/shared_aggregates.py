@@ -0,0 +1,255 @@
+"""
+Result aggregation for process pool simulations without pickling per-round results.
+
+The parent allocates one shared memory block with a fixed-layout slot of int64 counters
+per work unit. Workers write their counters (outcomes by HandRank, payout sums,
+balance histogram) straight into their own slot, so no two writers ever share a counter
+and no lock is needed. The parent merges the slots by summing them in place.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+from src.core.interfaces.strategy_protocols import Strategy
+from src.core.strategy_driver import StrategyDriver
+from src.enums.hand_rank import HandRank
+from src.enums.round_outcome import OUTCOMES
+from src.models.deck import Deck
+from src.simulation.simulation_engine import SIMULATION_BALANCE, new_simulation_engine
+
+OUTCOME_INDEX: dict[str, int] = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+
+SUM_FIELDS: tuple[str, ...] = (
+    'rounds',
+    'ante_bonus_payout',
+    'pair_plus_payout',
+    'winnings',
+    'net_win',
+)
+
+# Size of one counter, counters are signed 64-bit integers ('q')
+COUNTER_BYTES = 8
+
+
+@dataclass(frozen=True)
+class AggregateLayout:
+    """
+    Layout of one slot, in counters:
+        [outcome counts: len(HandRank) x len(OUTCOMES)][sums: SUM_FIELDS][balance histogram]
+    The balance histogram counts the balance after every round, relative to the
+    starting balance, in buckets of `bucket_width` chips centered on the starting balance.
+    The outermost buckets also count everything beyond them.
+    """
+    bucket_width: int = 1000
+    bucket_count: int = 64
+
+    @property
+    def sums_offset(self) -> int:
+        return len(HandRank) * len(OUTCOMES)
+
+    @property
+    def histogram_offset(self) -> int:
+        return self.sums_offset + len(SUM_FIELDS)
+
+    @property
+    def slot_size(self) -> int:
+        return self.histogram_offset + self.bucket_count
+
+
+@dataclass(frozen=True)
+class AggregateTotals:
+    outcome_counts: dict[HandRank, dict[str, int]]
+    sums: dict[str, int]
+    balance_histogram: list[int]
+
+
+class AggregateSlot:
+    """
+    The counters of one work unit, written by exactly one worker.
+    A SettleSink, so GameEngine.settle writes straight into the counters.
+
+    Attributes:
+        counters (memoryview): int64 view on the slot, inside the shared block.
+        balance_origin (int): Starting balance, the center of the balance histogram.
+        balance (int): Running balance, the starting balance plus every recorded net win.
+    """
+    def __init__(self, counters: memoryview, layout: AggregateLayout, balance_origin: int):
+        self.counters = counters
+        self.layout = layout
+        self.balance_origin = balance_origin
+        self.balance = balance_origin
+
+    def _record(self, player_hand_rank: HandRank, outcome: str, net_win: int) -> None:
+        counters = self.counters
+        layout = self.layout
+
+        counters[player_hand_rank * len(OUTCOMES) + OUTCOME_INDEX[outcome]] += 1
+
+        sums = layout.sums_offset
+        counters[sums] += 1
+        counters[sums + 4] += net_win
+
+        self.balance += net_win
+        bucket = (self.balance - self.balance_origin) // layout.bucket_width + layout.bucket_count // 2
+        bucket = min(max(bucket, 0), layout.bucket_count - 1)
+        counters[layout.histogram_offset + bucket] += 1
+
+    def record_settlement(
+        self,
+        player_hand_rank_value: HandRank,
+        is_dealer_qualified: bool,
+        outcome: str,
+        ante_bonus_payout: int,
+        had_pair_plus_bet: bool,
+        pair_plus_payout: int,
+        winnings: int,
+        net_win: int
+        ) -> None:
+        self._record(player_hand_rank_value, outcome, net_win)
+        sums = self.layout.sums_offset
+        counters = self.counters
+        counters[sums + 1] += ante_bonus_payout
+        counters[sums + 2] += pair_plus_payout
+        counters[sums + 3] += winnings
+
+    def record_fold(self, player_hand_rank_value: HandRank, net_win: int) -> None:
+        self._record(player_hand_rank_value, 'fold', net_win)
+
+
+def totals_from_counters(counters: list[int], layout: AggregateLayout) -> AggregateTotals:
+    """
+    Decode the counters of one (merged) slot.
+    """
+    sums_offset = layout.sums_offset
+    outcome_counts = {
+        rank: {
+            outcome: counters[rank * len(OUTCOMES) + i]
+            for i, outcome in enumerate(OUTCOMES)
+        }
+        for rank in HandRank
+    }
+    sums = {field: counters[sums_offset + i] for i, field in enumerate(SUM_FIELDS)}
+    return AggregateTotals(outcome_counts, sums, list(counters[layout.histogram_offset:]))
+
+
+class SharedAggregates:
+    """
+    A shared memory block of `slots` aggregate slots.
+    The creator owns the block and must close() and unlink() it, workers attach() and close() it.
+    """
+    def __init__(self, shm: SharedMemory, layout: AggregateLayout, slots: int):
+        self.shm = shm
+        self.layout = layout
+        self.slots = slots
+        self.__counters = shm.buf[:slots * layout.slot_size * COUNTER_BYTES].cast('q')
+
+    @classmethod
+    def create(cls, layout: AggregateLayout, slots: int) -> 'SharedAggregates':
+        # A new block is zero filled, every counter starts at 0
+        shm = SharedMemory(create=True, size=slots * layout.slot_size * COUNTER_BYTES)
+        return cls(shm, layout, slots)
+
+    @classmethod
+    def attach(cls, name: str, layout: AggregateLayout, slots: int) -> 'SharedAggregates':
+        return cls(SharedMemory(name=name), layout, slots)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def slot(self, index: int, balance_origin: int) -> AggregateSlot:
+        size = self.layout.slot_size
+        return AggregateSlot(self.__counters[index * size:(index + 1) * size], self.layout, balance_origin)
+
+    def merge(self) -> AggregateTotals:
+        size = self.layout.slot_size
+        merged = [0] * size
+        counters = self.__counters
+        for start in range(0, self.slots * size, size):
+            for i, value in enumerate(counters[start:start + size]):
+                merged[i] += value
+        return totals_from_counters(merged, self.layout)
+
+    def close(self) -> None:
+        self.__counters.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+
+def simulate_into_slot(
+    slot: AggregateSlot,
+    seed: int,
+    rounds: int,
+    strategy: Strategy,
+    game_rule: str
+    ) -> None:
+    """
+    Play `rounds` rounds of a strategy on a fresh engine, and count them into the slot.
+    The slot's balance origin must be SIMULATION_BALANCE.
+    """
+    game = new_simulation_engine(game_rule, Deck(seed))
+    StrategyDriver(game, strategy, slot).run(rounds)
+
+
+def _simulate_into_shared_slot(
+    shm_name: str,
+    layout: AggregateLayout,
+    slots: int,
+    slot_index: int,
+    seed: int,
+    rounds: int,
+    strategy: Strategy,
+    game_rule: str
+    ) -> None:
+    """
+    Play one work unit in a worker process, and write its results into its slot.
+    """
+    aggregates = SharedAggregates.attach(shm_name, layout, slots)
+    slot = aggregates.slot(slot_index, SIMULATION_BALANCE)
+    try:
+        simulate_into_slot(slot, seed, rounds, strategy, game_rule)
+    finally:
+        slot.counters.release()
+        aggregates.close()
+
+
+def run_aggregated_simulation(
+    strategy: Strategy,
+    rounds: int,
+    game_rule: str = 'standard',
+    seed: int = 0,
+    unit_rounds: int = 50_000,
+    max_workers: int | None = None,
+    layout: AggregateLayout = AggregateLayout()
+    ) -> AggregateTotals:
+    """
+    Simulate `rounds` rounds of a strategy across a process pool.
+    Every work unit gets its own seed and slot, so the result does not depend on scheduling.
+    The balance histogram is per work unit: every unit starts a new session.
+    """
+    unit_starts = range(0, rounds, unit_rounds)
+    aggregates = SharedAggregates.create(layout, len(unit_starts))
+    try:
+        with ProcessPoolExecutor(max_workers) as pool:
+            futures = [
+                pool.submit(
+                    _simulate_into_shared_slot,
+                    aggregates.name,
+                    layout,
+                    len(unit_starts),
+                    unit_index,
+                    (seed << 32) + unit_index,
+                    min(unit_rounds, rounds - start),
+                    strategy,
+                    game_rule
+                )
+                for unit_index, start in enumerate(unit_starts)
+            ]
+            for future in futures:
+                future.result() # re-raise worker errors
+        return aggregates.merge()
+    finally:
+        aggregates.close()
+        aggregates.unlink()
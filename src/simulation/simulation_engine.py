@@ -0,0 +1,49 @@
+"""
+Building blocks shared by the headless simulations.
+"""
+import hashlib
+import json
+from typing import Any
+from src.core.evaluators.evaluator_registry import EVALUATOR_BACKENDS, create_evaluator
+from src.core.game_engine import GameEngine
+from src.models.deck import Deck
+from src.models.participants import Player, Dealer
+from src.services.config_service import ConfigService
+
+# Reference evaluators by game rule, the game rules simulations accept
+EVALUATORS = EVALUATOR_BACKENDS['reference']
+
+# Large enough to never run out of chips, so every strategy plays every deal
+SIMULATION_BALANCE = 10 ** 15
+
+def new_simulation_engine(game_rule: str, deck: Deck, balance: int = SIMULATION_BALANCE) -> GameEngine:
+    """
+    A GameEngine for headless simulations, with the configured rules, table limits
+    and evaluator backend. Strategies place no side bets, so none is offered.
+    """
+    ge_config = ConfigService().get_game_engine_config()
+    return GameEngine(
+        Player(balance),
+        Dealer(),
+        create_evaluator(game_rule, ge_config['common']['evaluator_backend']),
+        ge_config[game_rule]['ante_bonus'],
+        ge_config[game_rule]['pair_plus'],
+        ge_config['common']['is_table_limit_enabled'],
+        ge_config['common']['limits'],
+        deck
+    )
+
+def _to_plain(obj: Any) -> Any:
+    if hasattr(obj, 'items'):
+        return {str(key): _to_plain(value) for key, value in obj.items()}
+    if isinstance(obj, tuple):
+        return [_to_plain(value) for value in obj]
+    return obj
+
+def game_engine_config_fingerprint() -> str:
+    """
+    Hash of the game engine config (pay tables, limits, shoe), to make sure that
+    simulations running on different machines play by exactly the same rules.
+    """
+    ge_config = _to_plain(ConfigService().get_game_engine_config())
+    return hashlib.sha256(json.dumps(ge_config, sort_keys=True).encode('UTF-8')).hexdigest()
@@ -0,0 +1,52 @@
+"""
+Hit frequencies and return of the configured Six Card Bonus pay table, over random deals
+ranked a batch at a time (see SixCardBonusEvaluator.evaluate_batch).
+The bonus is settled on every deal, played or folded (see GameEngine.settle_fold),
+so the play strategy does not change its return.
+
+    python -m src.simulation.six_card_bonus_odds --rounds 10000000
+"""
+import argparse
+from collections import Counter
+
+from src.core.evaluators.six_card_bonus_evaluator import SixCardBonusEvaluator
+from src.enums.five_card_hand_rank import FiveCardHandRank
+from src.services.config_service import ConfigService
+from src.simulation.deal_stream import generate_deals
+
+# Rounds generated and ranked at once
+BATCH_ROUNDS = 100_000
+
+
+def count_ranks(rounds: int, seed: int) -> Counter:
+    """
+    Returns:
+        Counter: Rounds by FiveCardHandRank value of the best five of their six cards.
+    """
+    evaluator = SixCardBonusEvaluator()
+    counts: Counter = Counter()
+    for batch, start in enumerate(range(0, rounds, BATCH_ROUNDS)):
+        deals = generate_deals(seed + batch, min(BATCH_ROUNDS, rounds - start))
+        counts.update(evaluator.evaluate_batch(deals).tolist())
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Hit frequencies and return of the Six Card Bonus.')
+    parser.add_argument('--rounds', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    payout_rate_table = ConfigService().get_game_engine_config()['common']['six_card_bonus']['payout_rate_table']
+    counts = count_ranks(args.rounds, args.seed)
+
+    # A winning bet is returned with its payout, a losing one is lost
+    total_return = 0
+    for rank in reversed(FiveCardHandRank):
+        rate = payout_rate_table[rank]
+        total_return += counts[rank] * (rate if rate > 0 else -1)
+        print(f'{rank.name:<16} {counts[rank] / args.rounds:>10.6%}  pays {rate}')
+    print(f'return per unit bet over {args.rounds} rounds: {total_return / args.rounds:+.4%}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Strategy tournaments with common random numbers (CRN).
+
+Every strategy plays exactly the same pre-generated deals, so most of the luck cancels out
+when two strategies are compared round by round (paired differences). That needs far fewer
+rounds to rank strategies than comparing independently simulated EVs.
+
+Deals are generated once per batch into shared memory (see deal_stream.py),
+and every shard of a batch is played by all strategies in a worker process.
+Workers only send back a handful of integer sums, merging them is exact and deterministic.
+"""
+import argparse
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from multiprocessing.shared_memory import SharedMemory
+from statistics import NormalDist
+
+from src.core.interfaces.strategy_protocols import Strategy
+from src.core.strategies.always_play_strategy import AlwaysPlayStrategy
+from src.core.strategies.bet_progression_strategy import BetProgressionStrategy
+from src.core.strategies.optimal_lookup_strategy import OptimalLookupStrategy
+from src.core.strategies.q64_strategy import Q64Strategy
+from src.core.strategy_driver import StrategyDriver
+from src.models.replay_deck import ReplayDeck
+from src.simulation.deal_stream import DEAL_SIZE, attach_shared_deals, create_shared_deals
+from src.simulation.simulation_engine import EVALUATORS, new_simulation_engine
+
+
+@dataclass(frozen=True)
+class StrategyEstimate:
+    """
+    Net win per round (in chips) of one strategy, mean +- half_width.
+    """
+    name: str
+    mean: float
+    half_width: float
+
+
+@dataclass(frozen=True)
+class PairedDifference:
+    """
+    Net win per round of strategy a minus strategy b, on the same deals.
+    """
+    name_a: str
+    name_b: str
+    mean: float
+    half_width: float
+
+    @property
+    def is_significant(self) -> bool:
+        return abs(self.mean) > self.half_width
+
+
+@dataclass(frozen=True)
+class TournamentResult:
+    rounds: int
+    confidence: float
+    estimates: list[StrategyEstimate]
+    differences: list[PairedDifference]
+
+
+def _play_shard(
+    shm_name: str,
+    start_round: int,
+    stop_round: int,
+    strategies: list[Strategy],
+    game_rule: str
+    ) -> list[int]:
+    """
+    Play rounds [start_round, stop_round) of a shared deal batch with every strategy.
+    Runs in a worker process, the strategies are fresh copies for this shard.
+    Returns:
+        list[int]: (sum, sum of squares) of the net wins of every strategy,
+            then of the paired differences of every pair of strategies.
+    """
+    shm = attach_shared_deals(shm_name)
+    stream = shm.buf[start_round * DEAL_SIZE:stop_round * DEAL_SIZE]
+    try:
+        net_wins: list[list[int]] = []
+        for strategy in strategies:
+            driver = StrategyDriver(new_simulation_engine(game_rule, ReplayDeck(stream)), strategy)
+            play_round = driver.play_round
+            net_wins.append([play_round() for _ in range(stop_round - start_round)])
+    finally:
+        stream.release()
+        shm.close()
+
+    totals: list[int] = []
+    for net in net_wins:
+        totals += [sum(net), sum(x * x for x in net)]
+    for net_a, net_b in combinations(net_wins, 2):
+        diffs = [a - b for a, b in zip(net_a, net_b)]
+        totals += [sum(diffs), sum(d * d for d in diffs)]
+    return totals
+
+
+def _mean_and_half_width(total: int, total_squares: int, n: int, z: float) -> tuple[float, float]:
+    mean = total / n
+    if n < 2:
+        return mean, math.inf
+    variance = max(total_squares - total * total / n, 0) / (n - 1)
+    return mean, z * math.sqrt(variance / n)
+
+
+def run_tournament(
+    strategies: dict[str, Strategy],
+    rounds: int,
+    game_rule: str = 'standard',
+    seed: int = 0,
+    batch_rounds: int = 200_000,
+    shard_rounds: int = 25_000,
+    max_workers: int | None = None,
+    confidence: float = 0.95
+    ) -> TournamentResult:
+    """
+    Play every strategy on the same `rounds` deals, sharded across a process pool.
+    The result only depends on the arguments, not on the number of workers.
+
+    Args:
+        strategies (dict[str, Strategy]): The contestants, by display name.
+            Stateful strategies start over in every shard.
+        rounds (int): Number of deals every strategy plays.
+        game_rule (str): 'standard' or 'california'.
+        seed (int): Seed of the deal streams.
+        batch_rounds (int): Deals per shared memory batch.
+        shard_rounds (int): Deals per work unit of a worker.
+        max_workers (int | None): Size of the process pool, None for one per CPU.
+        confidence (float): Confidence level of the intervals.
+    """
+    names = list(strategies.keys())
+    contestants = list(strategies.values())
+    pairs = list(combinations(range(len(names)), 2))
+    totals = [0] * (2 * (len(names) + len(pairs)))
+
+    def _collect(shm: SharedMemory, futures: list[Future]) -> None:
+        try:
+            for future in futures:
+                for i, value in enumerate(future.result()):
+                    totals[i] += value
+        finally:
+            shm.close()
+            shm.unlink()
+
+    with ProcessPoolExecutor(max_workers) as pool:
+        pending: tuple[SharedMemory, list[Future]] | None = None
+
+        for batch_index, batch_start in enumerate(range(0, rounds, batch_rounds)):
+            batch_size = min(batch_rounds, rounds - batch_start)
+            # Generate the next batch while the workers still play the previous one
+            shm = create_shared_deals((seed << 32) + batch_index, batch_size)
+            futures = [
+                pool.submit(
+                    _play_shard,
+                    shm.name,
+                    start,
+                    min(start + shard_rounds, batch_size),
+                    contestants,
+                    game_rule
+                )
+                for start in range(0, batch_size, shard_rounds)
+            ]
+            if pending is not None:
+                _collect(*pending)
+            pending = (shm, futures)
+
+        if pending is not None:
+            _collect(*pending)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    estimates = [
+        StrategyEstimate(name, *_mean_and_half_width(totals[2 * i], totals[2 * i + 1], rounds, z))
+        for i, name in enumerate(names)
+    ]
+    offset = 2 * len(names)
+    differences = [
+        PairedDifference(
+            names[a],
+            names[b],
+            *_mean_and_half_width(totals[offset + 2 * k], totals[offset + 2 * k + 1], rounds, z)
+        )
+        for k, (a, b) in enumerate(pairs)
+    ]
+    return TournamentResult(rounds, confidence, estimates, differences)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Rank the built-in strategies on common deals.')
+    parser.add_argument('--rounds', type=int, default=1_000_000)
+    parser.add_argument('--rule', choices=list(EVALUATORS), default='standard')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    strategies: dict[str, Strategy] = {
+        'always play': AlwaysPlayStrategy(),
+        'Q-6-4': Q64Strategy(),
+        'optimal lookup': OptimalLookupStrategy(),
+        'bet progression': BetProgressionStrategy(),
+    }
+    result = run_tournament(strategies, args.rounds, args.rule, args.seed, max_workers=args.workers)
+
+    print(f'{result.rounds} rounds, {result.confidence:.0%} confidence, chips per round:')
+    for estimate in result.estimates:
+        print(f'  {estimate.name:<20} {estimate.mean:+10.3f} +- {estimate.half_width:.3f}')
+    for diff in result.differences:
+        marker = '*' if diff.is_significant else ' '
+        print(
+            f'{marker} {diff.name_a} - {diff.name_b}: '
+            f'{diff.mean:+.3f} +- {diff.half_width:.3f}'
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Exact house edge of the dealer upcard variant (see upcard_ev_table.py), with optimal play,
+next to a simulation of the UpcardLookupStrategy as a cross-check.
+
+    python -m src.simulation.upcard_house_edge --rule standard --rounds 1000000
+"""
+import argparse
+
+from src.core.evaluators.evaluator_registry import create_evaluator
+from src.core.strategies.upcard_lookup_strategy import UpcardLookupStrategy
+from src.core.strategy_driver import StrategyDriver
+from src.core.upcard_ev_table import get_upcard_ev_table
+from src.models.deck import Deck
+from src.services.config_service import ConfigService
+from src.simulation.settle_statistics import SettleStatistics
+from src.simulation.simulation_engine import EVALUATORS, new_simulation_engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='House edge of the dealer upcard variant.')
+    parser.add_argument('--rule', choices=list(EVALUATORS), default='standard')
+    parser.add_argument('--rounds', type=int, default=0, help='rounds to simulate, 0 for none')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    ge_config = ConfigService().get_game_engine_config()
+    ante_bonus_table = ge_config[args.rule]['ante_bonus']
+    evaluator = create_evaluator(args.rule, 'reference')
+
+    house_edge = get_upcard_ev_table(evaluator).house_edge(ante_bonus_table)
+    print(f'{args.rule}: exact house edge per ante {float(house_edge):+.6%} ({house_edge})')
+
+    if args.rounds > 0:
+        game = new_simulation_engine(args.rule, Deck(args.seed))
+        statistics = SettleStatistics()
+        strategy = UpcardLookupStrategy(evaluator, ante_bonus_table)
+        StrategyDriver(game, strategy, statistics, is_dealer_upcard_revealed=True).run(args.rounds)
+        # Flat bets of the table minimum, so the ante is the same every round
+        ante = game.MIN_ANTE_BET
+        print(
+            f'simulated over {statistics.count} rounds: {-statistics.mean / ante:+.6%} '
+            f'+/- {2 * statistics.stddev / ante / statistics.count ** 0.5:.6%} (2 sigma)'
+        )
+
+if __name__ == '__main__':
+    main()
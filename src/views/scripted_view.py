@@ -0,0 +1,58 @@
+from collections import deque
+from string import Template
+from time import sleep
+from typing import Any, Callable
+
+from src.enums.ui_keys import UIKeys
+from src.views.cli_view import CliView
+
+class ScriptedView(CliView):
+    """
+    A view without a terminal, for load tests and bots: prompts are answered by a script,
+    messages are rendered like the CLI does but only the last ones are kept.
+    
+    Attributes:
+        answer (Callable[[UIKeys | str, dict[str, Any]], str]): Answers a prompt,
+            given its key and substitution arguments. Raising EOFError ends the session
+            like closing stdin does.
+        transcript (deque[str]): The last rendered messages, prompts and answers.
+        message_count (int): Messages and texts shown so far.
+        input_count (int): Prompts answered so far.
+        waited_seconds (float): Sum of the waits asked for, only slept if positive.
+    """
+    
+    def __init__(
+        self,
+        answer: Callable[[UIKeys | str, dict[str, Any]], str],
+        message_config: dict[str, str] = None,
+        transcript_size: int = 64
+        ):
+        super().__init__(message_config=message_config)
+        self.answer = answer
+        self.transcript: deque[str] = deque(maxlen=transcript_size)
+        self.message_count = 0
+        self.input_count = 0
+        self.waited_seconds = 0.0
+    
+    def _render(self, key: UIKeys | str, kwargs: dict[str, Any]) -> str:
+        return Template(self.get_text(key)).safe_substitute(**kwargs)
+    
+    def show_message(self, key: UIKeys | str, **kwargs) -> None:
+        self.transcript.append(self._render(key, kwargs))
+        self.message_count += 1
+    
+    def show_text(self, text: str, str_end: str='\n') -> None:
+        self.transcript.append(text + str_end)
+        self.message_count += 1
+    
+    def get_input(self, key: UIKeys | str, **kwargs) -> str:
+        self.transcript.append(self._render(key, kwargs))
+        user_input = self.answer(key, kwargs)
+        self.transcript.append(user_input)
+        self.input_count += 1
+        return user_input
+    
+    def wait(self, seconds: float) -> None:
+        self.waited_seconds += seconds
+        if seconds > 0:
+            sleep(seconds)